@@ -0,0 +1,62 @@
+import logging
+from typing import Optional, Tuple
+
+# Windows reports minimized windows at (-32000, -32000)
+_MINIMIZED_COORD = -32000
+# Set once pygetwindow failed to import, so unsupported platforms skip the attempt
+_unsupported = False
+
+
+def get_active_window() -> Optional[dict]:
+    """
+    Title and bounds of the foreground window via pygetwindow, or None if
+    there is no active window or the platform is unsupported.
+    """
+    global _unsupported
+    if _unsupported:
+        return None
+    try:
+        import pygetwindow as gw
+    except Exception:
+        # pygetwindow raises NotImplementedError on import on Linux
+        _unsupported = True
+        return None
+    try:
+        win = gw.getActiveWindow()
+    except Exception as e:
+        logging.debug(f"Active window lookup failed: {e}")
+        return None
+    if not win:
+        return None
+    try:
+        left, top, width, height = int(win.left), int(win.top), int(win.width), int(win.height)
+    except Exception:
+        return None
+    return {
+        "title": getattr(win, "title", "") or "",
+        "process": "unknown",
+        "minimized": bool(getattr(win, "isMinimized", False)) or left <= _MINIMIZED_COORD,
+        "bounding_box": {"x": left, "y": top, "width": width, "height": height}
+    }
+
+
+def window_region(window: dict,
+                  bounds: Tuple[int, int, int, int],
+                  margin: int = 0,
+                  min_size: int = 64) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Capture region (x, y, width, height) covering `window` plus `margin`
+    pixels, clamped to `bounds` (the monitor being captured). Returns None
+    when the window is minimized, off-screen or smaller than `min_size`.
+    """
+    if not window or window.get("minimized"):
+        return None
+    box = window["bounding_box"]
+    bx, by, bw, bh = bounds
+    x1 = max(box["x"] - margin, bx)
+    y1 = max(box["y"] - margin, by)
+    x2 = min(box["x"] + box["width"] + margin, bx + bw)
+    y2 = min(box["y"] + box["height"] + margin, by + bh)
+    if x2 - x1 < min_size or y2 - y1 < min_size:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
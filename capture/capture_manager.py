@@ -1,9 +1,15 @@
 import os
 import time
-import imagehash
-from PIL import Image
+from typing import Optional, Union
+from capture import image_hash
 from capture.screen_capture import ScreenCapture
 from capture.cleanup import CaptureCleanup
+from capture.continuous_capture import ContinuousCapture
+from capture.screen_settle import ScreenSettleDetector
+from capture.dirty_regions import DirtyRegionTracker
+from capture.screenshot_writer import ScreenshotWriter
+from capture.frame import Frame
+from capture.active_window import get_active_window, window_region
 import logging
 from collections import deque
 
@@ -16,6 +22,29 @@ class CaptureManager:
         
         monitor_index = self.config.get("monitor_index", 0)
         self.screen_capture = ScreenCapture(monitor_index=monitor_index)
+        # Grab every physical monitor separately (in parallel) instead of one
+        # huge combined virtual-screen image.
+        self.multi_monitor = bool(self.config.get("multi_monitor", False)) and not self.config.get("capture_region")
+        # Monitor geometry does not change between steps; query mss once.
+        self.settle_monitor = None
+        if self.multi_monitor:
+            virtual = self.screen_capture.get_virtual_screen()
+            self.monitor_dimensions = (virtual["width"], virtual["height"])
+            # Settle/change detection and the continuous grabber watch one
+            # physical monitor (the configured one, else the primary) instead
+            # of the combined virtual screen.
+            indices = self.screen_capture.monitor_indices()
+            self.settle_monitor = self.screen_capture.monitor_index if self.screen_capture.monitor_index in indices else indices[0]
+        else:
+            self.monitor_dimensions = self.screen_capture.get_monitor_dimensions()
+        
+        # ROI mode: crop every grab to the foreground window (+ margin)
+        self.active_window_roi = (bool(self.config.get("active_window_roi", False))
+                                  and not self.config.get("capture_region") and not self.multi_monitor)
+        self.roi_margin = int(self.config.get("roi_margin", 16))
+        self.roi_min_size = int(self.config.get("roi_min_size", 64))
+        self.roi_region = None
+        self.active_window = None
         
         self.cleanup = CaptureCleanup(
             temp_dir=self.temp_dir,
@@ -26,63 +55,344 @@ class CaptureManager:
         # Start background cleanup every 60s
         self.cleanup.start_background_cleanup(interval_seconds=60)
         
+        # Frames stay in memory; they are only written to temp_dir when
+        # persistence is enabled (debugging / audit trails), and then by a
+        # background writer so encoding and disk I/O stay off the step.
+        self.save_screenshots = bool(self.config.get("save_screenshots", False))
+        self.writer = ScreenshotWriter(
+            fmt=self.config.get("screenshot_format", "PNG") if self.save_screenshots else "none",
+            png_compression=self.config.get("screenshot_png_compression", 3),
+            quality=self.config.get("screenshot_quality", 90),
+            max_queue=self.config.get("screenshot_queue_size", 8),
+            max_queue_mb=self.config.get("screenshot_queue_mb", 256),
+            on_written=self._on_screenshot_written
+        )
+
         self.last_capture_path = None
+        self.last_frame = None
         self.last_hash = None
         state_cfg = config.get("state", {})
         self.loop_repeat_limit = state_cfg.get("repeated_state_limit", 5)
         self.hash_window_size = max(int(self.loop_repeat_limit) * 2, int(self.loop_repeat_limit))
         self.hash_history = deque(maxlen=self.hash_window_size)
+        # Hashes within this many differing bits count as the same screen
+        self.hash_tolerance = int(state_cfg.get("loop_hash_tolerance", 0))
         self._consecutive_same_hash = 0
+        # A carried-over frame counts as current if a fresh sample is within this many bits
+        self.reuse_hash_tolerance = int(state_cfg.get("frame_reuse_hash_tolerance", 0))
+        
+        # Tile-level change tracking between consecutive captures
+        self.dirty_tracker = self._new_dirty_tracker()
+        self.monitor_dirty_trackers = {}
+        
+        # Change/settle detection on downscaled thumbnails (replaces fixed sleeps)
+        self.settle_detector = ScreenSettleDetector(
+            sample_fn=lambda since: self.wait_for_frame(since, timeout=0.5),
+            thumb_width=state_cfg.get("settle_thumb_width", 160),
+            diff_threshold=state_cfg.get("settle_diff_threshold", 8.0),
+            sample_interval_ms=state_cfg.get("settle_sample_interval_ms", 15)
+        )
+        
+        # Optional background grabber feeding a latest-frame mailbox
+        self.continuous = None
+        if self.config.get("continuous_capture", False):
+            self.start_continuous_capture(self.config.get("continuous_fps", 10))
         
-    def capture_screen(self, session_id: str, step_id: str) -> dict:
+    def _new_dirty_tracker(self) -> DirtyRegionTracker:
+        return DirtyRegionTracker(
+            tile_size=self.config.get("dirty_tile_size", 64),
+            pixel_threshold=self.config.get("dirty_pixel_threshold", 0)
+        )
+        
+    def start_continuous_capture(self, fps: float = 10):
+        """Grab frames on a dedicated thread so capture_screen returns immediately."""
+        if self.continuous is None:
+            self.continuous = ContinuousCapture(
+                monitor_index=self.settle_monitor or self.screen_capture.monitor_index,
+                region=self.config.get("capture_region", None),
+                fps=fps
+            )
+        self.continuous.start()
+        
+    def stop_continuous_capture(self):
+        if self.continuous is not None:
+            self.continuous.stop()
+            
+    def get_latest_frame(self) -> Optional[Frame]:
+        """Freshest frame from the continuous grabber, or None if it is not running."""
+        if self.continuous is None or not self.continuous.running:
+            return None
+        return self.continuous.mailbox.latest()
+        
+    def wait_for_frame(self, newer_than: float, timeout: float = 1.0) -> Optional[Frame]:
         """
-        Capture the current screen. 
-        Returns dict containing the file path and perceptual hash.
+        Wait for a frame grabbed after `newer_than` (time.monotonic() seconds).
+        Uses the continuous grabber when running, otherwise grabs synchronously.
         """
-        timestamp = int(time.time() * 1000)
-        filename = f"{session_id}_{timestamp}_{step_id}.png"
-        output_path = os.path.join(self.temp_dir, filename)
+        if self.continuous is not None and self.continuous.running:
+            return self.continuous.mailbox.wait_newer(newer_than, timeout)
+        return self._grab_frame()
+        
+    def update_active_window_roi(self):
+        """Re-read the foreground window and the region ROI captures are cropped to."""
+        window = get_active_window()
+        left, top = self.screen_capture.get_monitor_origin()
+        width, height = self.screen_capture.get_monitor_dimensions()
+        region = window_region(window, (left, top, width, height), self.roi_margin, self.roi_min_size)
+        if region is not None and self.roi_region is not None and region[:2] != self.roi_region[:2]:
+            # Tiles no longer line up with the previous capture
+            self.dirty_tracker.reset()
+        self.active_window = window
+        self.roi_region = region
+        return region
         
-        region = self.config.get("capture_region", None)
+    def _apply_roi(self, frame: Frame) -> Frame:
+        """Crop a larger frame (e.g. a full-monitor mailbox frame) down to the ROI."""
+        if self.roi_region is None:
+            return frame
+        x, y, w, h = self.roi_region
+        x1, y1 = max(x - frame.left, 0), max(y - frame.top, 0)
+        x2, y2 = min(x + w - frame.left, frame.width), min(y + h - frame.top, frame.height)
+        if x2 <= x1 or y2 <= y1 or (x2 - x1, y2 - y1) == frame.size:
+            return frame
+        return frame.sub_frame(x1, y1, x2 - x1, y2 - y1)
         
+    def _grab_frame(self) -> Frame:
+        if self.multi_monitor:
+            return self.screen_capture.grab_monitors([self.settle_monitor])[0]
+        region = self.config.get("capture_region", None) or self.roi_region
         try:
-            if region:
-                self.screen_capture.capture_region(region, output_path)
-            else:
-                self.screen_capture.capture_full_screen(output_path)
+            return self.screen_capture.grab_frame(region)
         except Exception as e:
             raise RuntimeError(f"Screen capture failed (monitor_index={self.config.get('monitor_index', 0)}, region={region}): {e}") from e
+        
+    def wait_for_settle(self,
+                        baseline: Optional[Frame] = None,
+                        change_timeout: float = 1.0,
+                        quiet_period: float = 0.15,
+                        max_wait: float = 5.0) -> dict:
+        """
+        Block until the screen changes relative to `baseline` and then stays
+        idle for `quiet_period`, or until the timeouts pass.
+        See ScreenSettleDetector.wait for the returned dict.
+        """
+        return self.settle_detector.wait(baseline, change_timeout, quiet_period, max_wait)
+        
+    def capture_screen(self, session_id: str, step_id: str, newer_than: Optional[float] = None, frame: Optional[Frame] = None) -> dict:
+        """
+        Capture the current screen into memory.
+        Returns dict containing the Frame, its perceptual hash and the file path
+        (None unless screenshots are persisted). The file is written in the
+        background and may not exist yet; call flush_screenshots() before
+        reading it.
+
+        In continuous mode the freshest mailbox frame is returned immediately;
+        pass `newer_than` (time.monotonic() seconds) to require a frame grabbed
+        after that instant, e.g. after an action finished. An already grabbed
+        `frame` (e.g. from wait_for_settle) can be passed in to be hashed and
+        recorded instead of grabbing a new one; it is only used if it was
+        grabbed after `newer_than`.
+
+        With capture.multi_monitor enabled this delegates to capture_monitors
+        so every step (and its loop-detection hash) sees all monitors the same way.
+        """
+        if self.multi_monitor:
+            return self.capture_monitors(session_id, step_id, newer_than, frame)
+        if not self._grabbed_after(frame, newer_than):
+            frame = None
+        if self.active_window_roi:
+            self.update_active_window_roi()
+        else:
+            # Window title and bounds are reported in every mode; the lookup is cheap
+            self.active_window = get_active_window()
+        if frame is None and self.continuous is not None and self.continuous.running:
+            if newer_than is None:
+                frame = self.continuous.mailbox.latest()
+            else:
+                # Two frame intervals is plenty; fall back to a direct grab otherwise
+                frame = self.continuous.mailbox.wait_newer(newer_than, timeout=2.0 / self.continuous.fps)
+        if frame is None:
+            frame = self._grab_frame()
+        
+        offset = (0, 0)
+        active_window = None
+        # Element coordinates are reported relative to the monitor
+        origin = self.screen_capture.get_monitor_origin()
+        if self.active_window_roi:
+            frame = self._apply_roi(frame)
+            offset = (frame.left - origin[0], frame.top - origin[1])
+        if self.active_window:
+            box = self.active_window["bounding_box"]
+            active_window = dict(self.active_window, bounding_box=dict(box, x=box["x"] - origin[0], y=box["y"] - origin[1]))
+        
+        self._finalize_frame(frame, session_id, step_id, self.dirty_tracker)
+            
+        self.last_frame = frame
+        self.last_capture_path = frame.path
+        self.last_hash = frame.hash
             
-        self.last_capture_path = output_path
+        return {
+            "frame": frame,
+            "frames": [frame],
+            "path": frame.path,
+            "hash": frame.hash,
+            "phash": frame.phash,
+            "timestamp": frame.timestamp,
+            "dirty_rects": frame.dirty_rects,
+            "offset": offset,
+            "region": [offset[0], offset[1], frame.width, frame.height] if self.active_window_roi else None,
+            "active_window": active_window
+        }
         
-        # Compute phash for loop detection
+    def settle_frame(self, cap_data: dict) -> Optional[Frame]:
+        """
+        The frame of a capture_screen result that settle detection compares
+        against: the frame itself, or the settle monitor's frame of a
+        multi-monitor capture.
+        """
+        if cap_data.get("frame") is not None:
+            return cap_data["frame"]
+        for frame in cap_data.get("frames") or []:
+            if frame.monitor_index == self.settle_monitor:
+                return frame
+        return None
+
+    @staticmethod
+    def _grabbed_after(frame: Optional[Frame], newer_than: Optional[float]) -> bool:
+        return frame is not None and (newer_than is None or frame.monotonic > newer_than)
+
+    def _is_settle_monitor_frame(self, frame: Frame) -> bool:
+        monitor = self.screen_capture.get_monitor(self.settle_monitor)
+        return (frame.left, frame.top, frame.width, frame.height) == \
+            (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+
+    def capture_monitors(self, session_id: str, step_id: str, newer_than: Optional[float] = None, frame: Optional[Frame] = None) -> dict:
+        """
+        Grab every monitor separately and in parallel.
+        Returns the same dict as capture_screen, with one Frame per monitor in
+        "frames" ("frame" is None) and a hash combining all monitors.
+
+        Every monitor is grabbed now, so all frames are newer than
+        `newer_than`. A settled `frame` of the settle monitor (grabbed after
+        `newer_than`) is used for that monitor instead of grabbing it again.
+        """
+        indices = self.screen_capture.monitor_indices()
+        reused = None
+        if self._grabbed_after(frame, newer_than) and self._is_settle_monitor_frame(frame):
+            reused = frame
+            reused.monitor_index = self.settle_monitor
+            indices = [i for i in indices if i != self.settle_monitor]
         try:
-            img = Image.open(output_path)
-            self.last_hash = str(imagehash.phash(img))
-        except Exception:
-            self.last_hash = None
+            frames = self.screen_capture.grab_monitors(indices) if indices else []
+        except Exception as e:
+            raise RuntimeError(f"Multi-monitor screen capture failed: {e}") from e
+        if reused is not None:
+            frames = sorted(frames + [reused], key=lambda f: f.monitor_index)
             
+        for frame in frames:
+            tracker = self.monitor_dirty_trackers.get(frame.monitor_index)
+            if tracker is None:
+                tracker = self.monitor_dirty_trackers[frame.monitor_index] = self._new_dirty_tracker()
+            self._finalize_frame(frame, session_id, f"{step_id}_m{frame.monitor_index}", tracker)
+            
+        combined = image_hash.combine([f.phash for f in frames])
+        self.last_frame = None
+        self.last_capture_path = None
+        self.last_hash = image_hash.to_hex(combined)
+        
         return {
-            "path": output_path,
+            "frame": None,
+            "frames": frames,
+            "path": None,
             "hash": self.last_hash,
-            "timestamp": timestamp
+            "phash": combined,
+            "timestamp": frames[0].timestamp if frames else int(time.time() * 1000),
+            "dirty_rects": None,
+            "offset": (0, 0),
+            "region": None,
+            # Multi-monitor elements are in virtual screen coordinates, as is the window
+            "active_window": get_active_window()
         }
         
+    def _finalize_frame(self, frame: Frame, session_id: str, step_id: str, tracker: DirtyRegionTracker):
+        """Queue persistence, hash the frame and record what changed since the last capture."""
+        if self.writer.enabled and frame.path is None:
+            base_path = os.path.join(self.temp_dir, f"{session_id}_{frame.timestamp}_{step_id}")
+            frame.path = self.writer.submit(frame, base_path)
+        
+        # Compute phash for loop detection straight from the in-memory buffer
+        if frame.phash is None:
+            try:
+                frame.phash = image_hash.phash(frame)
+                frame.hash = image_hash.to_hex(frame.phash)
+            except Exception:
+                frame.phash = None
+                frame.hash = None
+            
+        # Which tiles changed since the previous capture (perception can limit work to these)
+        if frame.dirty_rects is None:
+            try:
+                frame.dirty_rects = tracker.update(frame.image, frame.monotonic)
+                frame.dirty_base = tracker.base_token
+                frame.dirty_fraction = DirtyRegionTracker.dirty_fraction(frame.dirty_rects, frame.width, frame.height)
+            except Exception as e:
+                logging.debug(f"Dirty region tracking failed: {e}")
+                tracker.reset()
+        
+    def is_frame_current(self, frame: Optional[Frame], max_age_ms: float) -> bool:
+        """
+        True if `frame` is younger than `max_age_ms` and the screen still
+        looks the same: its phash is compared against the newest mailbox frame
+        or, without continuous capture, a quick grab that is only hashed.
+        """
+        if frame is None or frame.phash is None or max_age_ms <= 0:
+            return False
+        if (time.monotonic() - frame.monotonic) * 1000.0 > max_age_ms:
+            return False
+        try:
+            sample = None
+            if self.continuous is not None and self.continuous.running:
+                sample = self.continuous.mailbox.latest()
+            if sample is None or sample.monotonic <= frame.monotonic:
+                sample = self._grab_frame()
+            if self.active_window_roi:
+                sample = self._apply_roi(sample)
+            if sample.size != frame.size:
+                return False
+            return image_hash.hamming(image_hash.phash(sample), frame.phash) <= self.reuse_hash_tolerance
+        except Exception as e:
+            logging.debug(f"Frame reuse check failed: {e}")
+            return False
+        
     def get_monitor_dimensions(self):
-        return self.screen_capture.get_monitor_dimensions()
+        return self.monitor_dimensions
+
+    def max_frame_bytes(self) -> int:
+        """Size of the largest (BGRA) frame capture_screen can return, e.g. to size shared memory."""
+        if self.multi_monitor:
+            monitors = [self.screen_capture.get_monitor(i) for i in self.screen_capture.monitor_indices()]
+            return max(m["width"] * m["height"] * 4 for m in monitors)
+        width, height = self.monitor_dimensions
+        return width * height * 4
+        
+    def _same_hash(self, a: int, b: int) -> bool:
+        return image_hash.hamming(a, b) <= self.hash_tolerance
         
-    def check_loop(self, new_hash: str) -> bool:
+    def check_loop(self, new_hash: Union[int, str, None]) -> bool:
         """Return True if the screen looks stuck based on repeated hashes.
 
         More robust than a strict equality across the whole window:
         - Ignores missing hashes (e.g. if hashing fails).
         - Tracks consecutive repetition and also frequency inside a sliding window.
+        - Accepts the integer phash or its hex form; hashes are compared with
+          XOR/popcount so near-identical screens can be tolerated.
         """
-        if not new_hash:
+        new_hash = image_hash.to_int(new_hash) if new_hash != "" else None
+        if new_hash is None:
             self._consecutive_same_hash = 0
             return False
 
-        if self.hash_history and self.hash_history[-1] == new_hash:
+        if self.hash_history and self._same_hash(self.hash_history[-1], new_hash):
             self._consecutive_same_hash += 1
         else:
             self._consecutive_same_hash = 1
@@ -92,31 +402,49 @@ class CaptureManager:
         if self._consecutive_same_hash >= self.loop_repeat_limit:
             logging.info(
                 "Loop detected by consecutive hash repetition: hash=%s repeats=%s window=%s",
-                new_hash,
+                image_hash.to_hex(new_hash),
                 self._consecutive_same_hash,
-                list(self.hash_history),
+                [image_hash.to_hex(h) for h in self.hash_history],
             )
             return True
 
         # Frequency-based guard to catch A/B/A/B toggles etc.
-        freq = sum(1 for h in self.hash_history if h == new_hash)
+        freq = sum(1 for h in self.hash_history if self._same_hash(h, new_hash))
         if freq >= self.loop_repeat_limit and len(self.hash_history) >= self.loop_repeat_limit:
             logging.info(
                 "Loop suspected by sliding-window repetition: hash=%s freq=%s/%s window=%s",
-                new_hash,
+                image_hash.to_hex(new_hash),
                 freq,
                 len(self.hash_history),
-                list(self.hash_history),
+                [image_hash.to_hex(h) for h in self.hash_history],
             )
             return True
 
         return False
         
+    def _on_screenshot_written(self, path: str, nbytes: int):
+        # Index every persisted file so retention never has to scan the directory
+        self.cleanup.register(path)
+        
+    def flush_screenshots(self):
+        """Block until queued screenshots are on disk (a capture's "path" may still be pending)."""
+        self.writer.flush()
+        
+    def get_persistence_stats(self) -> dict:
+        """Screenshot writer counters: queue depth, files/bytes written, drops."""
+        return self.writer.stats()
+        
     def task_complete(self, session_id: str):
         """Called when a task is finished to clean up all its screens immediately."""
+        if self.writer.enabled:
+            # Let pending writes land first so the session cleanup catches them
+            self.writer.flush()
+            logging.info(f"Screenshot persistence stats: {self.writer.stats()}")
         self.cleanup.clean_session(session_id)
         self.cleanup.enforce_policy()
         
     def shutdown(self):
+        self.stop_continuous_capture()
+        self.writer.stop()
         self.cleanup.stop_background_cleanup()
         self.screen_capture.close()
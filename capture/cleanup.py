@@ -1,68 +1,151 @@
 import os
 import time
-import glob
 import logging
 import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+from capture.screenshot_writer import SCREENSHOT_EXTENSIONS
 
 class CaptureCleanup:
+    """
+    Retention policy for persisted screenshots.
+
+    Every file CaptureManager writes is registered in an in-memory index
+    ordered by capture time and grouped per session, so enforcing the age and
+    count limits costs O(evicted) instead of a directory scan plus one stat per
+    file. The directory is only scanned once, at startup, to pick up files left
+    over from a previous run.
+    """
     def __init__(self, temp_dir: str, max_count: int = 200, max_age_seconds: int = 3600):
         self.temp_dir = temp_dir
         self.max_count = max_count
         self.max_age_seconds = max_age_seconds
-        
+
         if not os.path.exists(self.temp_dir):
             os.makedirs(self.temp_dir, exist_ok=True)
-            
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # path -> (timestamp seconds, session_id), oldest first
+        self._sessions = {}          # session_id -> set of paths
         self._stop_event = threading.Event()
         self._thread = None
 
-    def clean_session(self, session_id: str):
-        """Delete all screenshots belonging to a specific session."""
-        pattern = os.path.join(self.temp_dir, f"{session_id}_*.png")
-        files = glob.glob(pattern)
-        for f in files:
-            try:
-                os.remove(f)
-            except OSError as e:
-                logging.warning(f"Could not remove temporary screenshot {f}: {e}")
-        logging.info(f"Cleaned {len(files)} screenshots for session {session_id}")
+        self._rebuild_index()
 
-    def enforce_policy(self):
-        """Enforce the max_count and max_age_seconds policies."""
+    @staticmethod
+    def _parse_filename(path: str) -> Tuple[Optional[str], Optional[float]]:
+        """Filenames look like {session_id}_{timestamp_ms}_{step_id}.{ext}."""
+        parts = os.path.basename(path).split("_", 2)
+        session_id = parts[0] if len(parts) > 1 else None
+        timestamp = None
+        if len(parts) > 1:
+            stamp = parts[1].split(".", 1)[0]
+            if stamp.isdigit():
+                timestamp = int(stamp) / 1000.0
+        return session_id, timestamp
+
+    def _rebuild_index(self):
+        """Scan temp_dir once (startup) and index existing screenshots by age."""
+        entries = []
         try:
-            files = [os.path.join(self.temp_dir, f) for f in os.listdir(self.temp_dir) if f.endswith('.png')]
+            with os.scandir(self.temp_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(SCREENSHOT_EXTENSIONS) or not entry.is_file():
+                        continue
+                    session_id, timestamp = self._parse_filename(entry.path)
+                    if timestamp is None:
+                        try:
+                            timestamp = entry.stat().st_mtime
+                        except OSError:
+                            continue
+                    entries.append((timestamp, entry.path, session_id))
         except FileNotFoundError:
             return
 
-        now = time.time()
-        
-        # 1. Enforce max age
-        files_removed = 0
-        valid_files = []
-        for f in files:
+        entries.sort()
+        with self._lock:
+            self._index.clear()
+            self._sessions.clear()
+            for timestamp, path, session_id in entries:
+                self._add(path, timestamp, session_id)
+        if entries:
+            logging.info(f"Indexed {len(entries)} existing screenshots in {self.temp_dir}")
+
+    def _add(self, path: str, timestamp: float, session_id: Optional[str]):
+        # Caller holds the lock
+        if path in self._index:
+            self._drop(path)
+        self._index[path] = (timestamp, session_id)
+        self._sessions.setdefault(session_id, set()).add(path)
+        # Writes normally arrive in capture order; if one is late, move the few
+        # newer entries back behind it so the head stays the oldest file.
+        newer = []
+        for other in reversed(self._index):
+            if other == path:
+                continue
+            if self._index[other][0] <= timestamp:
+                break
+            newer.append(other)
+        for other in reversed(newer):
+            self._index.move_to_end(other)
+
+    def _drop(self, path: str):
+        # Caller holds the lock
+        _, session_id = self._index.pop(path)
+        paths = self._sessions.get(session_id)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._sessions[session_id]
+
+    def register(self, path: str, session_id: Optional[str] = None, timestamp: Optional[float] = None):
+        """Record a newly written screenshot (called by CaptureManager after each write)."""
+        parsed_session, parsed_timestamp = self._parse_filename(path)
+        session_id = session_id or parsed_session
+        timestamp = timestamp or parsed_timestamp or time.time()
+        with self._lock:
+            self._add(path, timestamp, session_id)
+
+    def indexed_count(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def _unlink_batch(self, paths: Iterable[str]) -> int:
+        """Delete files outside the index lock; missing files are not an error."""
+        removed = 0
+        for f in paths:
             try:
-                mtime = os.path.getmtime(f)
-                if now - mtime > self.max_age_seconds:
-                    os.remove(f)
-                    files_removed += 1
-                else:
-                    valid_files.append((mtime, f))
-            except OSError:
+                os.remove(f)
+                removed += 1
+            except FileNotFoundError:
                 continue
-                
-        # 2. Enforce max count (remove oldest first)
-        if len(valid_files) > self.max_count:
-            # Sort by mtime ascending
-            valid_files.sort(key=lambda x: x[0])
-            to_remove_count = len(valid_files) - self.max_count
-            for i in range(to_remove_count):
-                try:
-                    os.remove(valid_files[i][1])
-                    files_removed += 1
-                except OSError:
-                    continue
-                    
-        if files_removed > 0:
+            except OSError as e:
+                logging.warning(f"Could not remove temporary screenshot {f}: {e}")
+        return removed
+
+    def clean_session(self, session_id: str):
+        """Delete all screenshots belonging to a specific session."""
+        with self._lock:
+            files: List[str] = list(self._sessions.get(session_id, ()))
+            for f in files:
+                self._drop(f)
+        removed = self._unlink_batch(files)
+        logging.info(f"Cleaned {removed} screenshots for session {session_id}")
+
+    def enforce_policy(self):
+        """Enforce the max_count and max_age_seconds policies (oldest evicted first)."""
+        cutoff = time.time() - self.max_age_seconds
+        evicted = []
+        with self._lock:
+            while self._index:
+                path, (timestamp, _) = next(iter(self._index.items()))
+                if timestamp >= cutoff and len(self._index) <= self.max_count:
+                    break
+                self._drop(path)
+                evicted.append(path)
+
+        if evicted:
+            files_removed = self._unlink_batch(evicted)
             logging.info(f"Retention policy enforced: removed {files_removed} old/excess screenshots.")
 
     def _cleanup_loop(self, interval_seconds: int = 60):
@@ -77,7 +160,7 @@ class CaptureCleanup:
         if self._thread is None or not self._thread.is_alive():
             self._stop_event.clear()
             self._thread = threading.Thread(
-                target=self._cleanup_loop, 
+                target=self._cleanup_loop,
                 args=(interval_seconds,),
                 daemon=True,
                 name="CaptureCleanupThread"
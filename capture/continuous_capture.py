@@ -0,0 +1,100 @@
+import time
+import logging
+import threading
+from typing import Optional, Tuple
+from capture.frame import Frame
+from capture.screen_capture import ScreenCapture
+
+
+class FrameMailbox:
+    """Single-slot, timestamped mailbox: holds only the most recent frame."""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self.frames_posted = 0
+
+    def put(self, frame: Frame):
+        with self._cond:
+            self._frame = frame
+            self.frames_posted += 1
+            self._cond.notify_all()
+
+    def latest(self) -> Optional[Frame]:
+        """Return the freshest frame immediately (None if nothing was grabbed yet)."""
+        with self._cond:
+            return self._frame
+
+    def wait_newer(self, since: float, timeout: float) -> Optional[Frame]:
+        """
+        Block until a frame grabbed after `since` (time.monotonic() seconds) is
+        available, or until `timeout` seconds pass. Returns None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._frame is None or self._frame.monotonic <= since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._frame
+
+
+class ContinuousCapture:
+    """
+    Grabs frames on a dedicated thread at a fixed rate into a FrameMailbox so
+    consumers never wait on the screen grab itself.
+    """
+    def __init__(self, monitor_index: int = 0, region: Optional[Tuple[int, int, int, int]] = None, fps: float = 10.0):
+        self.monitor_index = monitor_index
+        self.region = region
+        self.fps = max(float(fps), 0.1)
+        self.mailbox = FrameMailbox()
+        self.last_error = None
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _capture_loop(self):
+        # mss handles are bound to the thread that created them, so the
+        # capture thread owns its own ScreenCapture.
+        screen_capture = ScreenCapture(monitor_index=self.monitor_index)
+        interval = 1.0 / self.fps
+        try:
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    self.mailbox.put(screen_capture.grab_frame(self.region))
+                    self.last_error = None
+                except Exception as e:
+                    if self.last_error is None:
+                        logging.warning(f"Continuous capture grab failed: {e}")
+                    self.last_error = e
+                    # Back off a little so a broken display does not spin the CPU
+                    self._stop_event.wait(0.5)
+                    continue
+                self._stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            screen_capture.close()
+
+    def start(self):
+        """Start the background capture thread."""
+        if not self.running:
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._capture_loop,
+                daemon=True,
+                name="ContinuousCaptureThread"
+            )
+            self._thread.start()
+            logging.info(f"Continuous capture started at {self.fps:g} FPS")
+
+    def stop(self):
+        """Stop the background capture thread."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+Rect = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+class DirtyRegionTracker:
+    """
+    Tracks which fixed-size tiles changed between consecutive frames.
+
+    The comparison is fully vectorized: a per-pixel change mask is reduced to a
+    tile grid with np.logical_or.reduceat (no padding or copies of the frame),
+    and dirty tiles are merged into a short list of rectangles.
+    """
+    def __init__(self, tile_size: int = 64, pixel_threshold: int = 0):
+        self.tile_size = max(int(tile_size), 8)
+        self.pixel_threshold = max(int(pixel_threshold), 0)
+        self._prev = None
+        self._token = None
+        # Token of the frame the last update() compared against (None if it had no predecessor)
+        self.base_token = None
+
+    def reset(self):
+        self._prev = None
+        self._token = None
+        self.base_token = None
+
+    def changed_tiles(self, prev: np.ndarray, cur: np.ndarray) -> np.ndarray:
+        """Boolean (rows, cols) grid, True where any pixel of the tile changed."""
+        if self.pixel_threshold == 0:
+            mask = prev != cur
+        else:
+            mask = cv2.absdiff(prev, cur) > self.pixel_threshold
+        if mask.ndim == 3:
+            mask = mask.any(axis=2)
+        ts = self.tile_size
+        rows = np.logical_or.reduceat(mask, np.arange(0, mask.shape[0], ts), axis=0)
+        return np.logical_or.reduceat(rows, np.arange(0, mask.shape[1], ts), axis=1)
+
+    def update(self, image: np.ndarray, token=None) -> List[Rect]:
+        """
+        Compare `image` with the previously seen one and return the changed
+        regions as (x, y, width, height) rectangles in image coordinates.
+        The first frame (or a change of size) is reported as fully dirty.
+        `token` identifies the frame; afterwards `base_token` holds the token
+        of the frame it was compared against.
+        """
+        prev, self._prev = self._prev, image
+        self.base_token, self._token = self._token, token
+        height, width = image.shape[:2]
+        if prev is None or prev.shape != image.shape:
+            self.base_token = None
+            return [(0, 0, width, height)]
+        if prev is image:
+            return []
+        return self.tiles_to_rects(self.changed_tiles(prev, image), self.tile_size, width, height)
+
+    @staticmethod
+    def tiles_to_rects(grid: np.ndarray, tile_size: int, width: int, height: int) -> List[Rect]:
+        """
+        Merge a dirty tile grid into rectangles: runs of dirty tiles within a
+        row are joined, and identical runs on consecutive rows are stacked.
+        """
+        rects = []
+        open_runs = {}  # (c0, c1) -> index into rects of the rectangle being grown
+        for r in range(grid.shape[0]):
+            row = grid[r]
+            if not row.any():
+                open_runs = {}
+                continue
+            # Run boundaries via diff of the padded row
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], row.astype(np.int8), [0]))))
+            next_runs = {}
+            for c0, c1 in zip(edges[::2], edges[1::2]):
+                key = (int(c0), int(c1))
+                if key in open_runs:
+                    idx = open_runs[key]
+                    rects[idx][3] += 1
+                else:
+                    idx = len(rects)
+                    rects.append([key[0], r, key[1] - key[0], 1])
+                next_runs[key] = idx
+            open_runs = next_runs
+
+        result = []
+        for c, r, cw, rh in rects:
+            x, y = c * tile_size, r * tile_size
+            result.append((x, y, min(cw * tile_size, width - x), min(rh * tile_size, height - y)))
+        return result
+
+    @staticmethod
+    def dirty_fraction(rects: List[Rect], width: int, height: int) -> float:
+        """Share of the frame area covered by the (non-overlapping) dirty rectangles."""
+        if not width or not height:
+            return 0.0
+        return min(1.0, sum(w * h for _, _, w, h in rects) / float(width * height))
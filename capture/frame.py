@@ -0,0 +1,108 @@
+import time
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class Frame:
+    """
+    A single screen grab held in memory.
+
+    `image` is the raw buffer returned by mss (H x W x 4, BGRA) or any
+    H x W x 3 BGR array. Derived views (BGR, grayscale) are computed at most
+    once per frame and shared by every perception stage, so a frame is never
+    encoded to disk and decoded again just to be analysed.
+    """
+    def __init__(self,
+                 image: np.ndarray,
+                 left: int = 0,
+                 top: int = 0,
+                 timestamp: Optional[int] = None,
+                 monotonic: Optional[float] = None):
+        self.image = image
+        self.left = int(left)
+        self.top = int(top)
+        # Wall clock (ms) for filenames/logs, monotonic clock for ordering frames.
+        self.timestamp = timestamp if timestamp is not None else int(time.time() * 1000)
+        self.monotonic = monotonic if monotonic is not None else time.monotonic()
+
+        self.monitor_index = None  # mss monitor index for per-monitor grabs
+        self.path = None   # Set when the frame was queued for persistence (the write may be pending)
+        self.hash = None   # Perceptual hash as hex, filled in by CaptureManager
+        self.phash = None  # Same hash as a 64-bit integer (XOR/popcount comparisons)
+        # Regions (x, y, width, height) that changed since the previous capture.
+        # None means unknown, i.e. treat the whole frame as changed.
+        self.dirty_rects = None
+        self.dirty_fraction = 1.0
+        # monotonic timestamp of the frame dirty_rects were computed against
+        self.dirty_base = None
+
+        self._bgr = None
+        self._gray = None
+
+    @property
+    def width(self) -> int:
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.image.shape[0]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the frame in pixels."""
+        return (self.width, self.height)
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.image.ndim == 2 else self.image.shape[2]
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """3-channel BGR view (what OpenCV and ultralytics expect)."""
+        if self._bgr is None:
+            channels = self.channels
+            if channels == 3:
+                self._bgr = self.image
+            elif channels == 4:
+                self._bgr = cv2.cvtColor(self.image, cv2.COLOR_BGRA2BGR)
+            else:
+                self._bgr = cv2.cvtColor(self.image, cv2.COLOR_GRAY2BGR)
+        return self._bgr
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Single channel grayscale view, converted straight from the raw buffer."""
+        if self._gray is None:
+            channels = self.channels
+            if channels == 4:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGRA2GRAY)
+            elif channels == 3:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+            else:
+                self._gray = self.image
+        return self._gray
+
+    def crop(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """View (no copy) of a rectangle of the raw buffer, in frame coordinates."""
+        return self.image[y:y + height, x:x + width]
+
+    def sub_frame(self, x: int, y: int, width: int, height: int) -> "Frame":
+        """
+        A Frame over a rectangle of this one (frame coordinates). Shares the
+        pixel buffer and capture time; left/top stay in screen coordinates.
+        """
+        sub = Frame(self.crop(x, y, width, height), left=self.left + x, top=self.top + y,
+                    timestamp=self.timestamp, monotonic=self.monotonic)
+        sub.monitor_index = self.monitor_index
+        return sub
+
+    def save(self, output_path: str) -> str:
+        """Encode the frame to disk (format chosen by the file extension)."""
+        if not cv2.imwrite(output_path, self.bgr):
+            raise IOError(f"Could not write frame to {output_path}")
+        self.path = output_path
+        return output_path
+
+    def __repr__(self):
+        return f"Frame({self.width}x{self.height} at ({self.left},{self.top}), ts={self.timestamp})"
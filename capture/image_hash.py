@@ -0,0 +1,81 @@
+"""
+Perceptual hashes computed straight from in-memory capture buffers.
+
+Both hashes area-average the raw BGRA/BGR/gray buffer down to a tiny image
+before any colour conversion, so the cost is dominated by a single pass over
+the frame, and return a 64-bit integer. Comparing two hashes is an integer
+XOR plus popcount (see `hamming`).
+"""
+import cv2
+import numpy as np
+from typing import List, Optional, Union
+
+def area_downscale(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    INTER_AREA resize to width x height. Large reductions go through an
+    integer-factor pass first (OpenCV's fast path for area averaging), which
+    drops at most factor-1 edge pixels and roughly halves the cost at 4K.
+    """
+    h, w = image.shape[:2]
+    k = min(w // (width * 4), h // (height * 4))
+    if k >= 2:
+        image = cv2.resize(image[:h - h % k, :w - w % k], (w // k, h // k), interpolation=cv2.INTER_AREA)
+    return cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+def _small_gray(image, width: int, height: int) -> np.ndarray:
+    """Area-average `image` (Frame, or gray/BGR/BGRA array) to width x height gray float32."""
+    if hasattr(image, "image"):
+        image = image.image
+    small = area_downscale(image, width, height)
+    if small.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        small = cv2.cvtColor(small, code)
+    return small.astype(np.float32)
+
+def _pack_bits(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+def phash(image, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """
+    DCT perceptual hash: downscale to (hash_size * highfreq_factor)^2, take the
+    2D DCT and compare the low-frequency hash_size x hash_size block against its
+    median. Same construction as imagehash.phash, returned as an integer.
+    """
+    img_size = hash_size * highfreq_factor
+    dct = cv2.dct(_small_gray(image, img_size, img_size))
+    low = dct[:hash_size, :hash_size]
+    return _pack_bits(low > np.median(low))
+
+def dhash(image, hash_size: int = 8) -> int:
+    """Difference hash: compare horizontally adjacent pixels of a (hash_size+1) x hash_size thumbnail."""
+    small = _small_gray(image, hash_size + 1, hash_size)
+    return _pack_bits(small[:, 1:] > small[:, :-1])
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two integer hashes."""
+    return (a ^ b).bit_count()
+
+def combine(values: List[Optional[int]]) -> Optional[int]:
+    """
+    Fold several 64-bit hashes (e.g. one per monitor) into one. Each hash is
+    rotated by its position first so identical screens on two monitors do not
+    cancel out.
+    """
+    combined = None
+    for i, value in enumerate(values):
+        if value is None:
+            return None
+        shift = (i * 7) % 64
+        rotated = ((value << shift) | (value >> (64 - shift))) & 0xFFFFFFFFFFFFFFFF if shift else value
+        combined = rotated if combined is None else combined ^ rotated
+    return combined
+
+def to_hex(value: Optional[int]) -> Optional[str]:
+    """Fixed width hex string (same format imagehash produces for 64-bit hashes)."""
+    return None if value is None else f"{value:016x}"
+
+def to_int(value: Union[int, str, None]) -> Optional[int]:
+    """Accept an integer hash or its hex string form."""
+    if value is None or isinstance(value, int):
+        return value
+    return int(str(value), 16)
@@ -2,7 +2,11 @@ import mss
 import logging
 import os
 import time
-from typing import Tuple, Optional
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional
+from capture.frame import Frame
 
 class ScreenCapture:
     def __init__(self, monitor_index: int = 0):
@@ -20,13 +24,19 @@ class ScreenCapture:
         else:
             self.monitor_index = self.monitor_index
             
+        # Per-thread mss handles for parallel per-monitor grabs (mss handles
+        # must not be shared between threads on every platform).
+        self._local = threading.local()
+        self._handles = []
+        self._handles_lock = threading.Lock()
+        self._pool = None
 
-    def capture_full_screen(self, output_path: str) -> str:
+    def capture_full_screen(self, output_path: Optional[str] = None) -> np.ndarray:
         """Capture the full screen of the selected monitor."""
         monitor = self.sct.monitors[self.monitor_index]
         return self._capture_region(monitor, output_path)
 
-    def capture_region(self, region: Tuple[int, int, int, int], output_path: str) -> str:
+    def capture_region(self, region: Tuple[int, int, int, int], output_path: Optional[str] = None) -> np.ndarray:
         """
         Capture a specific region of the screen.
         region: (x, y, width, height)
@@ -39,16 +49,73 @@ class ScreenCapture:
         }
         return self._capture_region(monitor, output_path)
         
-    def _capture_region(self, monitor_dict: dict, output_path: str) -> str:
-        """Internal method to perform the capture and save it."""
+    def grab_frame(self, region: Optional[Tuple[int, int, int, int]] = None) -> Frame:
+        """Grab the selected monitor (or a region of it) into an in-memory Frame."""
+        if region:
+            image = self.capture_region(region)
+            left, top = region[0], region[1]
+        else:
+            image = self.capture_full_screen()
+            left, top = self.get_monitor_origin()
+        return Frame(image, left=left, top=top)
+
+    def get_monitor_origin(self) -> Tuple[int, int]:
+        """Returns (left, top) of the selected monitor in virtual screen coordinates."""
+        monitor = self.sct.monitors[self.monitor_index]
+        return (monitor["left"], monitor["top"])
+
+    def _capture_region(self, monitor_dict: dict, output_path: Optional[str] = None) -> np.ndarray:
+        """
+        Internal method to perform the capture.
+        Returns the raw BGRA buffer (H x W x 4) without copying it; the PNG is
+        only written when an output_path is given.
+        """
         try:
             sct_img = self.sct.grab(monitor_dict)
-            mss.tools.to_png(sct_img.rgb, sct_img.size, output=output_path)
-            return output_path
+            if output_path:
+                mss.tools.to_png(sct_img.rgb, sct_img.size, output=output_path)
+            return np.asarray(sct_img)
         except Exception as e:
             logging.error(f"Failed to capture screen: {e}")
             raise
             
+    def monitor_indices(self) -> List[int]:
+        """mss indices of the physical monitors (index 0 is the combined virtual screen)."""
+        return list(range(1, len(self.sct.monitors)))
+
+    def get_virtual_screen(self) -> dict:
+        """Bounding box of all monitors in virtual screen coordinates."""
+        return dict(self.sct.monitors[0])
+
+    def get_monitor(self, index: int) -> dict:
+        """Bounds of the mss monitor `index` in virtual screen coordinates."""
+        return dict(self.sct.monitors[index])
+
+    def _thread_sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._handles_lock:
+                self._handles.append(sct)
+        return sct
+
+    def _grab_monitor(self, index: int) -> Frame:
+        sct = self._thread_sct()
+        monitor = sct.monitors[index]
+        frame = Frame(np.asarray(sct.grab(monitor)), left=monitor["left"], top=monitor["top"])
+        frame.monitor_index = index
+        return frame
+
+    def grab_monitors(self, indices: Optional[List[int]] = None) -> List[Frame]:
+        """Grab each physical monitor separately, in parallel, as one Frame per monitor."""
+        indices = indices or self.monitor_indices()
+        if len(indices) <= 1:
+            return [self._grab_monitor(i) for i in indices]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(indices), thread_name_prefix="MonitorGrab")
+        return list(self._pool.map(self._grab_monitor, indices))
+
     def get_monitor_dimensions(self) -> Tuple[int, int]:
         """Returns (width, height) of the selected monitor."""
         monitor = self.sct.monitors[self.monitor_index]
@@ -56,4 +123,14 @@ class ScreenCapture:
         
     def close(self):
         """Clean up mss resources."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+        for sct in handles:
+            try:
+                sct.close()
+            except Exception:
+                pass
         self.sct.close()
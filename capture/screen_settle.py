@@ -0,0 +1,114 @@
+import time
+import cv2
+import numpy as np
+from typing import Callable, Optional
+from capture.frame import Frame
+from capture.image_hash import area_downscale
+
+
+class ScreenSettleDetector:
+    """
+    Waits for the screen to change and then settle, using cheap area-averaged
+    grayscale thumbnails instead of full-resolution comparisons.
+
+    `sample_fn(since)` must return a frame grabbed after the monotonic
+    timestamp `since` (or None if none arrived in time).
+    """
+    def __init__(self,
+                 sample_fn: Callable[[float], Optional[Frame]],
+                 thumb_width: int = 160,
+                 diff_threshold: float = 8.0,
+                 sample_interval_ms: float = 15):
+        self.sample_fn = sample_fn
+        self.thumb_width = max(int(thumb_width), 8)
+        self.diff_threshold = float(diff_threshold)
+        self.sample_interval = max(sample_interval_ms, 0) / 1000.0
+
+    def thumbnail(self, frame: Frame) -> np.ndarray:
+        """Area-average the raw buffer down to thumb_width and convert to gray."""
+        h, w = frame.image.shape[:2]
+        tw = min(self.thumb_width, w)
+        th = max(1, int(round(h * tw / float(w))))
+        small = area_downscale(frame.image, tw, th)
+        if small.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            small = cv2.cvtColor(small, code)
+        return small.astype(np.int16)
+
+    def differs(self, a: np.ndarray, b: np.ndarray) -> bool:
+        """True if any thumbnail pixel moved by more than diff_threshold gray levels."""
+        if a.shape != b.shape:
+            return True
+        return bool(np.abs(a - b).max() > self.diff_threshold)
+
+    def wait(self,
+             baseline: Optional[Frame] = None,
+             change_timeout: float = 1.0,
+             quiet_period: float = 0.15,
+             max_wait: float = 5.0) -> dict:
+        """
+        Wait until the screen differs from `baseline` and then stays unchanged
+        for `quiet_period` seconds. Gives up waiting for the first change after
+        `change_timeout` seconds and returns no later than `max_wait` seconds.
+
+        Returns a dict with:
+          changed    - the screen differed from the baseline at some point
+          settled    - the screen was stable for quiet_period when returning
+          change_ms  - time until the first change (None if unchanged)
+          elapsed_ms - total time spent waiting
+          frame      - the last sampled Frame (the "after" evidence)
+        """
+        start = time.monotonic()
+        deadline = start + max(max_wait, 0.0)
+        change_deadline = start + max(min(change_timeout, max_wait), 0.0)
+
+        frame = baseline
+        since = start
+        if baseline is None:
+            frame = self.sample_fn(since)
+        base_thumb = self.thumbnail(frame) if frame is not None else None
+        prev_thumb = base_thumb
+
+        changed = False
+        change_at = None
+        last_change = start
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if not changed and now >= change_deadline:
+                break
+
+            sample = self.sample_fn(since)
+            now = time.monotonic()
+            if sample is None:
+                continue
+            since = sample.monotonic
+            frame = sample
+            thumb = self.thumbnail(sample)
+
+            if base_thumb is None:
+                base_thumb = prev_thumb = thumb
+            elif not changed:
+                if self.differs(thumb, base_thumb):
+                    changed = True
+                    change_at = last_change = now
+            elif self.differs(thumb, prev_thumb):
+                last_change = now
+            prev_thumb = thumb
+
+            if changed and now - last_change >= quiet_period:
+                break
+
+            if self.sample_interval > 0:
+                time.sleep(min(self.sample_interval, max(0.0, deadline - time.monotonic())))
+
+        end = time.monotonic()
+        return {
+            "changed": changed,
+            "settled": changed and end - last_change >= quiet_period,
+            "change_ms": int((change_at - start) * 1000) if change_at is not None else None,
+            "elapsed_ms": int((end - start) * 1000),
+            "frame": frame
+        }
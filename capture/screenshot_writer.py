@@ -0,0 +1,166 @@
+import io
+import os
+import queue
+import logging
+import threading
+import cv2
+import numpy as np
+from typing import Callable, Optional
+from capture.frame import Frame
+
+# Supported persistence formats and the file extension each one writes
+FORMAT_EXTENSIONS = {
+    "png": ".png",
+    "jpeg": ".jpg",
+    "jpg": ".jpg",
+    "webp": ".webp",
+    "npy": ".npy",
+}
+SCREENSHOT_EXTENSIONS = tuple(sorted(set(FORMAT_EXTENSIONS.values())))
+
+
+class ScreenshotWriter:
+    """
+    Persists frames on a background thread through a queue bounded both in
+    frames and in raw bytes, so disk I/O never blocks the agent loop and a
+    backlog of 4K frames cannot pile up in memory. When either bound is hit
+    new frames are dropped (and counted) instead of waiting.
+
+    `submit` returns the target path before the file exists; call `flush`
+    before reading it.
+    """
+    def __init__(self,
+                 fmt: str = "png",
+                 png_compression: int = 3,
+                 quality: int = 90,
+                 max_queue: int = 8,
+                 max_queue_mb: float = 256.0,
+                 on_written: Optional[Callable[[str, int], None]] = None):
+        fmt = str(fmt or "none").lower()
+        if fmt != "none" and fmt not in FORMAT_EXTENSIONS:
+            logging.warning(f"Unknown screenshot_format '{fmt}'. Falling back to PNG.")
+            fmt = "png"
+        self.format = fmt
+        self.extension = FORMAT_EXTENSIONS.get(fmt)
+        self.png_compression = min(max(int(png_compression), 0), 9)
+        self.quality = min(max(int(quality), 1), 100)
+        self.on_written = on_written
+
+        self._queue = queue.Queue(maxsize=max(int(max_queue), 1))
+        self.max_queue_bytes = int(float(max_queue_mb) * 1024 * 1024)
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.bytes_written = 0
+        self.files_written = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.format != "none"
+
+    def submit(self, frame: Frame, base_path: str) -> Optional[str]:
+        """
+        Queue `frame` to be written to `base_path` + the format's extension.
+        Returns the target path, or None if persistence is disabled or the
+        queue is full. The file may still be pending when this returns.
+        """
+        if not self.enabled:
+            return None
+        self._ensure_started()
+        path = base_path + self.extension
+        nbytes = frame.image.nbytes
+        with self._lock:
+            # A single frame larger than the byte bound is still accepted into an empty queue
+            over_budget = self._pending_bytes > 0 and self._pending_bytes + nbytes > self.max_queue_bytes
+            if not over_budget:
+                try:
+                    self._queue.put_nowait((frame, path))
+                    self._pending_bytes += nbytes
+                    return path
+                except queue.Full:
+                    pass
+            self.dropped += 1
+        logging.warning(f"Screenshot writer queue full ({self._queue.maxsize} frames / "
+                        f"{self.max_queue_bytes // (1024 * 1024)} MB); dropping {os.path.basename(path)}")
+        return None
+
+    def encode(self, frame: Frame) -> bytes:
+        """Encode a frame in the configured format."""
+        if self.format == "npy":
+            return self._npy_bytes(frame.image)
+        if self.format == "png":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression]
+        elif self.format == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        ok, buf = cv2.imencode(self.extension, frame.bgr, params)
+        if not ok:
+            raise IOError(f"OpenCV could not encode frame as {self.format}")
+        return buf.tobytes()
+
+    @staticmethod
+    def _npy_bytes(image: np.ndarray) -> bytes:
+        buf = io.BytesIO()
+        np.save(buf, image, allow_pickle=False)
+        return buf.getvalue()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                frame, path = item
+                try:
+                    data = self.encode(frame)
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    with self._lock:
+                        self.bytes_written += len(data)
+                        self.files_written += 1
+                    if self.on_written is not None:
+                        self.on_written(path, len(data))
+                except Exception as e:
+                    with self._lock:
+                        self.errors += 1
+                    logging.warning(f"Could not persist screenshot {path}: {e}")
+                finally:
+                    with self._lock:
+                        self._pending_bytes -= frame.image.nbytes
+            finally:
+                self._queue.task_done()
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._write_loop, daemon=True, name="ScreenshotWriterThread")
+            self._thread.start()
+
+    def flush(self):
+        """Block until every queued frame has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "format": self.format,
+                "queue_depth": self._queue.qsize(),
+                "queue_bytes": self._pending_bytes,
+                "files_written": self.files_written,
+                "bytes_written": self.bytes_written,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+    def stop(self, timeout: float = 5.0):
+        """Write out what is queued (up to `timeout`) and stop the writer thread."""
+        if self._thread is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=timeout)
+            self._thread = None
@@ -0,0 +1,29 @@
+import unittest
+import numpy as np
+from capture.active_window import window_region
+from capture.frame import Frame
+
+def window(x, y, w, h, minimized=False):
+    return {"title": "App", "minimized": minimized, "bounding_box": {"x": x, "y": y, "width": w, "height": h}}
+
+class TestWindowRegion(unittest.TestCase):
+    BOUNDS = (0, 0, 1920, 1080)
+
+    def test_margin_is_added_and_clamped_to_monitor(self):
+        self.assertEqual(window_region(window(100, 50, 800, 600), self.BOUNDS, margin=16), (84, 34, 832, 632))
+        self.assertEqual(window_region(window(-10, -10, 2000, 1200), self.BOUNDS, margin=16), self.BOUNDS)
+
+    def test_unusable_windows_fall_back_to_full_grab(self):
+        self.assertIsNone(window_region(None, self.BOUNDS))
+        self.assertIsNone(window_region(window(-32000, -32000, 160, 28, minimized=True), self.BOUNDS))
+        self.assertIsNone(window_region(window(100, 100, 20, 20), self.BOUNDS, min_size=64))
+        self.assertIsNone(window_region(window(3000, 0, 800, 600), self.BOUNDS))
+
+    def test_sub_frame_keeps_screen_coordinates(self):
+        frame = Frame(np.zeros((1080, 1920, 4), dtype=np.uint8), left=1920, top=0)
+        sub = frame.sub_frame(84, 34, 832, 632)
+        self.assertEqual((sub.left, sub.top, sub.width, sub.height), (2004, 34, 832, 632))
+        self.assertEqual(sub.monotonic, frame.monotonic)
+
+if __name__ == '__main__':
+    unittest.main()
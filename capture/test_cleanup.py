@@ -0,0 +1,65 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from capture.cleanup import CaptureCleanup
+
+class TestCaptureCleanup(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _write(self, session_id, timestamp_s, step="step_1", ext=".png"):
+        path = os.path.join(self.dir, f"{session_id}_{int(timestamp_s * 1000)}_{step}{ext}")
+        with open(path, "wb") as f:
+            f.write(b"x")
+        return path
+
+    def test_index_is_rebuilt_from_disk_at_startup(self):
+        now = time.time()
+        self._write("aaaa", now - 10)
+        self._write("bbbb", now - 5, ext=".jpg")
+        with open(os.path.join(self.dir, "notes.txt"), "w") as f:
+            f.write("not a screenshot")
+
+        cleanup = CaptureCleanup(self.dir, max_count=10, max_age_seconds=3600)
+        self.assertEqual(cleanup.indexed_count(), 2)
+
+    def test_enforce_policy_evicts_oldest_by_count_and_age(self):
+        cleanup = CaptureCleanup(self.dir, max_count=2, max_age_seconds=60)
+        now = time.time()
+        expired = self._write("aaaa", now - 120)
+        oldest = self._write("aaaa", now - 30)
+        middle = self._write("aaaa", now - 20)
+        newest = self._write("aaaa", now - 10)
+        # Registered out of order: the index must still evict the oldest first
+        for path in (newest, expired, middle, oldest):
+            cleanup.register(path)
+
+        cleanup.enforce_policy()
+
+        self.assertFalse(os.path.exists(expired))
+        self.assertFalse(os.path.exists(oldest))
+        self.assertTrue(os.path.exists(middle))
+        self.assertTrue(os.path.exists(newest))
+        self.assertEqual(cleanup.indexed_count(), 2)
+
+    def test_clean_session_only_removes_that_session(self):
+        cleanup = CaptureCleanup(self.dir)
+        now = time.time()
+        mine = [self._write("aaaa", now - i) for i in range(3)]
+        other = self._write("bbbb", now)
+        for path in mine + [other]:
+            cleanup.register(path)
+
+        cleanup.clean_session("aaaa")
+
+        self.assertTrue(all(not os.path.exists(p) for p in mine))
+        self.assertTrue(os.path.exists(other))
+        self.assertEqual(cleanup.indexed_count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
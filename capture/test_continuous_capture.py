@@ -0,0 +1,41 @@
+import unittest
+import threading
+import time
+import numpy as np
+from capture.frame import Frame
+from capture.continuous_capture import FrameMailbox
+
+class TestFrameMailbox(unittest.TestCase):
+    def _frame(self):
+        return Frame(np.zeros((10, 20, 4), dtype=np.uint8))
+
+    def test_latest_keeps_only_newest_frame(self):
+        mailbox = FrameMailbox()
+        self.assertIsNone(mailbox.latest())
+
+        first, second = self._frame(), self._frame()
+        mailbox.put(first)
+        mailbox.put(second)
+
+        self.assertIs(mailbox.latest(), second)
+        self.assertEqual(mailbox.frames_posted, 2)
+
+    def test_wait_newer_times_out_on_stale_frame(self):
+        mailbox = FrameMailbox()
+        mailbox.put(self._frame())
+        since = time.monotonic()
+        self.assertIsNone(mailbox.wait_newer(since, timeout=0.05))
+
+    def test_wait_newer_wakes_on_new_frame(self):
+        mailbox = FrameMailbox()
+        since = time.monotonic()
+        fresh = self._frame()
+        timer = threading.Timer(0.05, mailbox.put, args=(fresh,))
+        timer.start()
+        try:
+            self.assertIs(mailbox.wait_newer(since, timeout=2.0), fresh)
+        finally:
+            timer.cancel()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from capture.dirty_regions import DirtyRegionTracker
+
+class TestDirtyRegionTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = DirtyRegionTracker(tile_size=16)
+        self.base = np.zeros((100, 130, 4), dtype=np.uint8)
+
+    def test_first_frame_is_fully_dirty(self):
+        self.assertEqual(self.tracker.update(self.base), [(0, 0, 130, 100)])
+
+    def test_identical_frame_has_no_dirty_regions(self):
+        self.tracker.update(self.base)
+        self.assertEqual(self.tracker.update(self.base.copy()), [])
+
+    def test_changed_pixels_map_to_tiles(self):
+        self.tracker.update(self.base)
+        cur = self.base.copy()
+        cur[20, 40] = 255      # tile row 1, col 2
+        cur[21:40, 41] = 255   # spans tile rows 1-2, col 2
+        self.assertEqual(self.tracker.update(cur), [(32, 16, 16, 32)])
+
+    def test_edge_tiles_are_clipped_to_frame(self):
+        self.tracker.update(self.base)
+        cur = self.base.copy()
+        cur[99, 129] = 1
+        self.assertEqual(self.tracker.update(cur), [(128, 96, 2, 4)])
+
+    def test_adjacent_tiles_merge_into_rows(self):
+        grid = np.array([
+            [0, 1, 1, 0],
+            [0, 1, 1, 0],
+            [1, 0, 0, 0],
+        ], dtype=bool)
+        rects = DirtyRegionTracker.tiles_to_rects(grid, 10, 40, 30)
+        self.assertEqual(rects, [(10, 0, 20, 20), (0, 20, 10, 10)])
+
+    def test_pixel_threshold_ignores_small_changes(self):
+        tracker = DirtyRegionTracker(tile_size=16, pixel_threshold=10)
+        tracker.update(self.base)
+        cur = self.base.copy()
+        cur[5, 5] = 5
+        self.assertEqual(tracker.update(cur), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from capture.frame import Frame
+from capture import image_hash
+
+class TestImageHash(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = rng.integers(0, 255, (360, 640, 4), dtype=np.uint8)
+
+    def test_hashes_are_64_bit_integers(self):
+        for fn in (image_hash.phash, image_hash.dhash):
+            value = fn(self.image)
+            self.assertIsInstance(value, int)
+            self.assertLess(value, 1 << 64)
+
+    def test_frame_and_array_give_same_hash(self):
+        self.assertEqual(image_hash.phash(Frame(self.image)), image_hash.phash(self.image))
+
+    def test_identical_content_in_different_layouts_matches(self):
+        bgr = np.ascontiguousarray(self.image[:, :, :3])
+        self.assertLessEqual(image_hash.hamming(image_hash.phash(self.image), image_hash.phash(bgr)), 2)
+
+    def test_different_screens_are_far_apart(self):
+        other = np.ascontiguousarray(self.image[::-1, ::-1])
+        self.assertGreater(image_hash.hamming(image_hash.phash(self.image), image_hash.phash(other)), 10)
+
+    def test_hex_round_trip(self):
+        value = image_hash.phash(self.image)
+        text = image_hash.to_hex(value)
+        self.assertEqual(len(text), 16)
+        self.assertEqual(image_hash.to_int(text), value)
+        self.assertEqual(image_hash.hamming(value, value), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from capture.frame import Frame
+from capture.screen_settle import ScreenSettleDetector
+
+class ScriptedScreen:
+    """Returns a scripted sequence of frames, repeating the last one forever."""
+    def __init__(self, values):
+        self.values = list(values)
+        self.calls = 0
+
+    def sample(self, since):
+        value = self.values[min(self.calls, len(self.values) - 1)]
+        self.calls += 1
+        return Frame(np.full((90, 160, 4), value, dtype=np.uint8))
+
+class TestScreenSettleDetector(unittest.TestCase):
+    def _detector(self, screen):
+        return ScreenSettleDetector(screen.sample, thumb_width=32, sample_interval_ms=1)
+
+    def test_returns_after_change_and_quiet_period(self):
+        screen = ScriptedScreen([0, 0, 200, 120, 120])
+        baseline = Frame(np.zeros((90, 160, 4), dtype=np.uint8))
+        result = self._detector(screen).wait(baseline, change_timeout=1.0, quiet_period=0.02, max_wait=2.0)
+
+        self.assertTrue(result["changed"])
+        self.assertTrue(result["settled"])
+        self.assertEqual(int(result["frame"].image[0, 0, 0]), 120)
+        self.assertLess(result["elapsed_ms"], 1000)
+
+    def test_gives_up_when_screen_never_changes(self):
+        screen = ScriptedScreen([50])
+        baseline = Frame(np.full((90, 160, 4), 50, dtype=np.uint8))
+        result = self._detector(screen).wait(baseline, change_timeout=0.05, quiet_period=0.02, max_wait=2.0)
+
+        self.assertFalse(result["changed"])
+        self.assertFalse(result["settled"])
+        self.assertIsNone(result["change_ms"])
+        self.assertLess(result["elapsed_ms"], 1000)
+
+    def test_small_changes_below_threshold_are_ignored(self):
+        screen = ScriptedScreen([3])
+        baseline = Frame(np.zeros((90, 160, 4), dtype=np.uint8))
+        result = self._detector(screen).wait(baseline, change_timeout=0.05, quiet_period=0.02, max_wait=1.0)
+        self.assertFalse(result["changed"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import threading
+import unittest
+import cv2
+import numpy as np
+from capture.frame import Frame
+from capture.screenshot_writer import ScreenshotWriter
+
+def screen(value=0):
+    image = np.zeros((48, 64, 4), dtype=np.uint8)
+    image[..., 3] = 255
+    image[8:40, 8:56, :3] = (30 + value, 120, 220)
+    return Frame(image)
+
+class TestScreenshotWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_per_format(self):
+        frame = screen()
+        # Lossy formats: mean error per channel value (edges suffer from chroma subsampling)
+        for fmt, tolerance in (("png", 0), ("jpeg", 4), ("webp", 4), ("npy", 0)):
+            writer = ScreenshotWriter(fmt, quality=95)
+            path = writer.submit(frame, os.path.join(self.tmp.name, f"shot_{fmt}"))
+            writer.flush()
+            if fmt == "npy":
+                self.assertTrue(np.array_equal(np.load(path), frame.image))
+            else:
+                decoded = cv2.imread(path).astype(np.int16)
+                self.assertLessEqual(float(np.abs(decoded - frame.bgr).mean()), tolerance, fmt)
+            self.assertEqual(writer.stats()["files_written"], 1)
+            writer.stop()
+
+    def test_drops_when_full(self):
+        entered, release = threading.Event(), threading.Event()
+        def on_written(path, nbytes):
+            entered.set()
+            release.wait(5)
+        writer = ScreenshotWriter("npy", max_queue=1, on_written=on_written)
+        base = os.path.join(self.tmp.name, "shot")
+        self.assertIsNotNone(writer.submit(screen(1), base + "1"))
+        self.assertTrue(entered.wait(5))  # the writer thread is busy with the first frame
+        self.assertIsNotNone(writer.submit(screen(2), base + "2"))
+        self.assertIsNone(writer.submit(screen(3), base + "3"))
+        self.assertEqual(writer.stats()["dropped"], 1)
+        release.set()
+        writer.stop()
+        self.assertEqual(writer.stats()["files_written"], 2)
+
+    def test_drops_past_byte_budget(self):
+        entered, release = threading.Event(), threading.Event()
+        writer = ScreenshotWriter("npy", max_queue=8, max_queue_mb=0.015,
+                                  on_written=lambda p, n: (entered.set(), release.wait(5)))
+        base = os.path.join(self.tmp.name, "shot")
+        self.assertIsNotNone(writer.submit(screen(), base + "1"))  # 12 KB: fits an empty queue
+        self.assertTrue(entered.wait(5))
+        self.assertIsNone(writer.submit(screen(), base + "2"))
+        release.set()
+        writer.stop()
+
+    def test_flush_and_stop_write_everything(self):
+        writer = ScreenshotWriter("png", max_queue=8)
+        paths = [writer.submit(screen(i), os.path.join(self.tmp.name, f"shot{i}")) for i in range(5)]
+        writer.stop()
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+        self.assertEqual(writer.stats()["queue_bytes"], 0)
+        writer.flush()  # no-op once stopped
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,18 @@ def validate_config(config: dict) -> dict:
     Falls back to safe defaults if invalid values are found.
     """
     
+    # helper resolving nested sections such as "perception.ocr"
+    def section_dict(section):
+        node = config
+        for part in section.split("."):
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        return node
+
     # helper for ints
     def get_int(section, key, default, min_val=None, max_val=None):
-        val = config.get(section, {}).get(key, default)
+        val = section_dict(section).get(key, default)
         try:
             val = int(val)
             if min_val is not None and val < min_val:
@@ -19,35 +28,31 @@ def validate_config(config: dict) -> dict:
             if max_val is not None and val > max_val:
                 val = max_val
                 logger.warning(f"Config {section}.{key} above maximum, clamping to {max_val}")
-            if section in config:
-                config[section][key] = val
+            section_dict(section)[key] = val
             return val
         except (ValueError, TypeError):
             logger.warning(f"Invalid config for {section}.{key}: {val}. Using default: {default}")
-            if section in config:
-                config[section][key] = default
+            section_dict(section)[key] = default
             return default
 
     # helper for floats
     def get_float(section, key, default, min_val=None):
-        val = config.get(section, {}).get(key, default)
+        val = section_dict(section).get(key, default)
         try:
             val = float(val)
             if min_val is not None and val < min_val:
                 val = min_val
                 logger.warning(f"Config {section}.{key} below minimum, clamping to {min_val}")
-            if section in config:
-                config[section][key] = val
+            section_dict(section)[key] = val
             return val
         except (ValueError, TypeError):
             logger.warning(f"Invalid config for {section}.{key}: {val}. Using default: {default}")
-            if section in config:
-                config[section][key] = default
+            section_dict(section)[key] = default
             return default
 
     # helper for bools
     def get_bool(section, key, default):
-        val = config.get(section, {}).get(key, default)
+        val = section_dict(section).get(key, default)
         if not isinstance(val, bool):
             # Attempt to interpret strings like "true", "false" if needed, 
             # but standard yaml loader usually handles it.
@@ -58,9 +63,7 @@ def validate_config(config: dict) -> dict:
             else:
                 logger.warning(f"Invalid boolean config for {section}.{key}: {val}. Using default: {default}")
                 val = default
-        if section not in config:
-            config[section] = {}
-        config[section][key] = val
+        section_dict(section)[key] = val
         return val
 
     # System Section
@@ -74,6 +77,24 @@ def validate_config(config: dict) -> dict:
         config["capture"] = {}
     get_int("capture", "max_screenshot_count", 200, min_val=1)
     get_int("capture", "max_retention_seconds", 3600, min_val=60)
+    get_bool("capture", "save_screenshots", False)
+    get_int("capture", "screenshot_png_compression", 3, min_val=0, max_val=9)
+    get_int("capture", "screenshot_quality", 90, min_val=1, max_val=100)
+    get_int("capture", "screenshot_queue_size", 8, min_val=1)
+    get_float("capture", "screenshot_queue_mb", 256.0, min_val=1.0)
+    screenshot_format = str(config["capture"].get("screenshot_format", "PNG") or "none").lower()
+    if screenshot_format not in ("none", "png", "jpeg", "jpg", "webp", "npy"):
+        logger.warning(f"Invalid config for capture.screenshot_format: {screenshot_format}. Using default: PNG")
+        screenshot_format = "png"
+    config["capture"]["screenshot_format"] = screenshot_format
+    get_bool("capture", "continuous_capture", False)
+    get_float("capture", "continuous_fps", 10.0, min_val=0.1)
+    get_int("capture", "dirty_tile_size", 64, min_val=8)
+    get_int("capture", "dirty_pixel_threshold", 0, min_val=0, max_val=255)
+    get_bool("capture", "multi_monitor", False)
+    get_bool("capture", "active_window_roi", False)
+    get_int("capture", "roi_margin", 16, min_val=0)
+    get_int("capture", "roi_min_size", 64, min_val=1)
 
     # Planning Section
     if "planning" not in config:
@@ -86,12 +107,21 @@ def validate_config(config: dict) -> dict:
     if "state" not in config:
         config["state"] = {}
     get_int("state", "repeated_state_limit", 5, min_val=1)
+    get_int("state", "loop_hash_tolerance", 0, min_val=0, max_val=63)
     get_int("state", "element_wait_timeout", 30, min_val=1)
     get_int("state", "step_timeout_seconds", 120, min_val=1)
     get_int("state", "max_retries", 5, min_val=0)
     
     get_float("state", "base_delay", 1.0, min_val=0.0)
     get_float("state", "max_delay", 30.0, min_val=0.0)
+    get_int("state", "settle_change_timeout_ms", 1000, min_val=0)
+    get_int("state", "settle_quiet_ms", 150, min_val=0)
+    get_int("state", "settle_max_wait_ms", 5000, min_val=0)
+    get_float("state", "settle_diff_threshold", 8.0, min_val=0.0)
+    get_int("state", "settle_thumb_width", 160, min_val=8)
+    get_int("state", "settle_sample_interval_ms", 15, min_val=0)
+    get_int("state", "frame_reuse_max_age_ms", 1500, min_val=0)
+    get_int("state", "frame_reuse_hash_tolerance", 0, min_val=0, max_val=63)
 
     # Reasoning Section
     if "reasoning" not in config:
@@ -111,6 +141,86 @@ def validate_config(config: dict) -> dict:
         config["perception"]["vision"] = {}
     if "ocr" not in config["perception"]:
         config["perception"]["ocr"] = {}
+    get_int("perception", "monitor_workers", 0, min_val=0)
+    get_bool("perception.scheduler", "enabled", False)
+    get_float("perception.scheduler", "default_deadline_ms", 2000.0, min_val=1.0)
+    get_float("perception.scheduler", "max_stale_ms", 5000.0, min_val=0.0)
+    get_int("perception.scheduler", "workers_per_stage", 1, min_val=1)
+    get_bool("perception.service", "enabled", False)
+    get_int("perception.service", "ring_slots", 4, min_val=1)
+    get_float("perception.service", "slot_mb", 0.0, min_val=0.0)
+    get_float("perception.service", "start_timeout_s", 120.0, min_val=1.0)
+    get_float("perception.service", "call_timeout_s", 30.0, min_val=0.1)
+    get_float("perception.service", "hang_timeout_s", 60.0, min_val=1.0)
+    get_float("perception.service", "health_interval_s", 2.0, min_val=0.1)
+    get_bool("perception.motion", "enabled", True)
+    get_int("perception.motion", "burst_frames", 6, min_val=3)
+    get_float("perception.motion", "sample_interval_ms", 50.0, min_val=0.0)
+    get_int("perception.motion", "thumb_width", 320, min_val=16)
+    get_float("perception.motion", "diff_threshold", 10.0, min_val=0.0)
+    get_float("perception.motion", "min_persistence", 0.6, min_val=0.0)
+    get_float("perception.motion", "max_region_fraction", 0.25, min_val=0.0)
+    get_float("perception.motion", "max_area_fraction", 0.02, min_val=0.0)
+    get_bool("perception.motion", "skip_decision_when_busy", False)
+    get_int("perception.motion", "max_busy_skips", 3, min_val=0)
+    get_float("perception.motion", "idle_timeout_ms", 10000.0, min_val=0.0)
+    get_bool("perception.ocr", "tile_cache", False)
+    get_float("perception.ocr", "noise_threshold", 3.0, min_val=0.0)
+    get_float("perception.ocr", "clahe_clip_limit", 2.0, min_val=0.1)
+    get_float("perception.ocr", "upscale_factor", 1.0, min_val=1.0)
+    denoise = config["perception"]["ocr"].get("denoise", "auto")
+    if isinstance(denoise, str) and denoise.lower() in ("auto", "none", "off"):
+        config["perception"]["ocr"]["denoise"] = denoise.lower()
+    else:
+        get_bool("perception.ocr", "denoise", "auto")
+    get_int("perception.ocr", "tile_size", 640, min_val=64)
+    get_int("perception.ocr", "tile_overlap", 96, min_val=0)
+    get_float("perception.ocr", "tile_cache_mb", 32.0, min_val=0.0)
+    get_bool("perception.ocr", "incremental", False)
+    get_int("perception.ocr", "incremental_margin", 8, min_val=0)
+    get_float("perception.ocr", "incremental_max_dirty_fraction", 0.6, min_val=0.0)
+    get_int("perception.ocr", "batch_size", 8, min_val=1)
+    get_int("perception.ocr", "batch_bucket_step", 64, min_val=8)
+    get_int("perception.ocr", "tesseract_psm", 3, min_val=0, max_val=13)
+    get_int("perception.ocr", "tesseract_workers", 0, min_val=0)
+    get_int("perception.ocr", "tesseract_band_height", 360, min_val=64)
+    get_int("perception.ocr", "tesseract_band_overlap", 48, min_val=0)
+    get_int("perception.vision", "inference_threads", 0, min_val=0)
+    get_bool("perception.vision", "int8", False)
+    get_int("perception.vision", "input_size", 640, min_val=32)
+    get_float("perception.vision", "template_threshold", 0.5, min_val=0.0)
+    get_float("perception.vision", "template_nms_threshold", 0.3, min_val=0.0)
+    scales = config["perception"]["vision"].get("template_scales", [0.8, 1.0, 1.25])
+    try:
+        scales = [float(s) for s in scales]
+        if not scales or any(s <= 0 for s in scales):
+            raise ValueError(scales)
+    except (TypeError, ValueError):
+        logger.warning("Invalid config for perception.vision.template_scales: %r. Using [0.8, 1.0, 1.25].", scales)
+        scales = [0.8, 1.0, 1.25]
+    config["perception"]["vision"]["template_scales"] = scales
+    get_int("perception.vision", "template_max_matches", 20, min_val=1)
+    get_int("perception.vision", "template_workers", 0, min_val=0)
+    for section in ("perception.ocr", "perception.vision"):
+        engine = section_dict(section)
+        preset = str(engine.get("resolution_preset", "quality")).lower()
+        if preset not in ("quality", "balanced", "fast"):
+            logger.warning("Invalid config for %s.resolution_preset: %r. Using 'quality'.", section, preset)
+            preset = "quality"
+        engine["resolution_preset"] = preset
+        # null keeps the preset's value
+        if engine.get("resolution_scale") is not None:
+            get_float(section, "resolution_scale", 1.0, min_val=0.05)
+        if engine.get("max_long_side") is not None:
+            get_int(section, "max_long_side", 0, min_val=0)
+    get_bool("perception.ocr", "auto_scale", False)
+    get_float("perception.ocr", "auto_text_height", 14.0, min_val=4.0)
+    get_float("perception.ocr", "auto_min_scale", 0.5, min_val=0.05)
+    backend = str(config["perception"]["vision"].get("backend", "ultralytics")).lower()
+    if backend not in ("ultralytics", "onnxruntime", "openvino", "auto"):
+        logger.warning("Invalid config for perception.vision.backend: %r. Using 'ultralytics'.", backend)
+        backend = "ultralytics"
+    config["perception"]["vision"]["backend"] = backend
     yolo_path = config.get("perception", {}).get("vision", {}).get("yolo_model_path", "yolov8n.pt")
     if yolo_path is None:
         config["perception"]["vision"]["yolo_model_path"] = ""
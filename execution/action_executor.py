@@ -10,19 +10,40 @@ from tools.perplexity_search import PerplexitySearchTool
 class ActionExecutor:
     def __init__(self, config: dict):
         self.exec_config = config.get("execution", {})
-        self.keyboard = KeyboardController(
-            min_delay_ms=self.exec_config.get("min_type_delay_ms", 30),
-            max_delay_ms=self.exec_config.get("max_type_delay_ms", 80)
-        )
-        self.mouse = MouseController(
-            cursor_speed_multiplier=self.exec_config.get("cursor_speed_multiplier", 1.0),
-            drag_hold_delay_ms=self.exec_config.get("drag_hold_delay_ms", 150),
-            drag_release_delay_ms=self.exec_config.get("drag_release_delay_ms", 100)
-        )
+        # Input controllers (and pynput) are created on first real use; dry runs never need them
+        self._keyboard = None
+        self._mouse = None
         # Initialize Perplexity tool for Autonomous Web Retrieval
         api_key = os.getenv("PERPLEXITY_API_KEY", "")
         self.perplexity = PerplexitySearchTool(api_key=api_key)
 
+    @property
+    def keyboard(self) -> KeyboardController:
+        if self._keyboard is None:
+            self._keyboard = KeyboardController(
+                min_delay_ms=self.exec_config.get("min_type_delay_ms", 30),
+                max_delay_ms=self.exec_config.get("max_type_delay_ms", 80)
+            )
+        return self._keyboard
+
+    @keyboard.setter
+    def keyboard(self, controller):
+        self._keyboard = controller
+
+    @property
+    def mouse(self) -> MouseController:
+        if self._mouse is None:
+            self._mouse = MouseController(
+                cursor_speed_multiplier=self.exec_config.get("cursor_speed_multiplier", 1.0),
+                drag_hold_delay_ms=self.exec_config.get("drag_hold_delay_ms", 150),
+                drag_release_delay_ms=self.exec_config.get("drag_release_delay_ms", 100)
+            )
+        return self._mouse
+
+    @mouse.setter
+    def mouse(self, controller):
+        self._mouse = controller
+
     async def execute(self, action_cmd: dict):
         """Asynchronously dispatches the action command JSON to the correct controller."""
         failsafe.check()
@@ -68,7 +89,7 @@ class ActionExecutor:
                 logging.info(f"DRY RUN: Executing {action_type} with coords {coords} and params {params}")
                 if post_wait > 0:
                     await asyncio.sleep(post_wait)
-                return None
+                return {"dry_run": True, "action_type": action_type}
 
             if action_type == "click":
                 await asyncio.to_thread(self.mouse.click, x, y, button=params.get("button", "left"))
@@ -1,8 +1,11 @@
 import threading
 import time
 import sys
-import pyautogui
-from pynput import keyboard
+from lazy_imports import lazy_module
+
+# Loaded when the listener starts, so dry runs and headless imports never need them
+pyautogui = lazy_module("pyautogui")
+keyboard = lazy_module("pynput.keyboard")
 
 class FailsafeTriggered(Exception):
     """Exception raised when the failsafe key is pressed."""
@@ -13,15 +16,15 @@ class FailsafeMonitor:
         self.failsafe_key = failsafe_key
         self.triggered = False
         self._listener = None
-        self._key_map = {
+        self.target_key = None
+
+    def _resolve_key(self):
+        key_map = {
             "F12": keyboard.Key.f12,
             "ESC": keyboard.Key.esc,
             "PAUSE": keyboard.Key.pause
         }
-        self.target_key = self._key_map.get(str(self.failsafe_key).upper(), keyboard.Key.f12)
-        
-        # Enable pyautogui failsafe (moving mouse to corner aborts)
-        pyautogui.FAILSAFE = True
+        return key_map.get(str(self.failsafe_key).upper(), keyboard.Key.f12)
 
     def _on_press(self, key):
         if key == self.target_key:
@@ -33,6 +36,9 @@ class FailsafeMonitor:
         """Start listening for the failsafe key in the background."""
         if self._listener is None or not self._listener.running:
             self.triggered = False
+            self.target_key = self._resolve_key()
+            # Enable pyautogui failsafe (moving mouse to corner aborts)
+            pyautogui.FAILSAFE = True
             self._listener = keyboard.Listener(on_press=self._on_press)
             self._listener.start()
 
@@ -1,11 +1,14 @@
 import random
 import time
-from pynput.keyboard import Controller, Key
+from lazy_imports import lazy_module
 from execution.failsafe_monitor import failsafe
 
+pynput_keyboard = lazy_module("pynput.keyboard")
+
 class KeyboardController:
     def __init__(self, min_delay_ms=30, max_delay_ms=80):
-        self.keyboard = Controller()
+        self.keyboard = pynput_keyboard.Controller()
+        Key = pynput_keyboard.Key
         self.min_delay = min_delay_ms / 1000.0
         self.max_delay = max_delay_ms / 1000.0
         
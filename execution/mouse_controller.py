@@ -1,26 +1,28 @@
 import time
 import random
-from pynput.mouse import Controller, Button
+from lazy_imports import lazy_module
 from execution.motion_animator import MotionAnimator
 from execution.failsafe_monitor import failsafe
 
+pynput_mouse = lazy_module("pynput.mouse")
+
 class MouseController:
     def __init__(self, 
                  cursor_speed_multiplier=1.0,
                  drag_hold_delay_ms=150,
                  drag_release_delay_ms=100):
         
-        self.mouse = Controller()
+        self.mouse = pynput_mouse.Controller()
         self.animator = MotionAnimator(cursor_speed_multiplier=cursor_speed_multiplier)
         self.drag_hold_delay = drag_hold_delay_ms / 1000.0
         self.drag_release_delay = drag_release_delay_ms / 1000.0
 
-    def _get_button(self, btn_name: str) -> Button:
+    def _get_button(self, btn_name: str):
         if btn_name.lower() in ["right", "r"]:
-            return Button.right
+            return pynput_mouse.Button.right
         elif btn_name.lower() in ["middle", "m"]:
-            return Button.middle
-        return Button.left
+            return pynput_mouse.Button.middle
+        return pynput_mouse.Button.left
 
     def get_position(self) -> tuple[int, int]:
         return self.mouse.position
@@ -76,7 +78,7 @@ class MouseController:
         self.move(start_x, start_y)
         
         # Press and hold
-        self.mouse.press(Button.left)
+        self.mouse.press(pynput_mouse.Button.left)
         time.sleep(self.drag_hold_delay + random.uniform(0, 0.1))
         
         # Drag smoothly
@@ -86,7 +88,7 @@ class MouseController:
         time.sleep(self.drag_release_delay + random.uniform(0, 0.05))
         
         # Release
-        self.mouse.release(Button.left)
+        self.mouse.release(pynput_mouse.Button.left)
         time.sleep(random.uniform(0.2, 0.4))
 
     def scroll(self, x: int = None, y: int = None, dy: int = -1):
@@ -1,14 +1,9 @@
+import asyncio
 import unittest
-import sys
 from unittest.mock import MagicMock
 
-sys.modules['pynput'] = MagicMock()
-sys.modules['pynput.keyboard'] = MagicMock()
-sys.modules['pynput.mouse'] = MagicMock()
-sys.modules['pyautogui'] = MagicMock()
-sys.modules['pywin32'] = MagicMock() # just in case
-
-from execution.action_executor import ActionExecutor
+# No pynput/pyautogui stubs: input libraries are imported lazily, on first real use
+from execution import mouse_controller, keyboard_controller
 from execution.action_executor import ActionExecutor
 
 class TestActionExecutor(unittest.TestCase):
@@ -30,8 +25,11 @@ class TestActionExecutor(unittest.TestCase):
         executor = ActionExecutor(self.config)
         executor.mouse = MagicMock()
         
-        executor.execute({"action_type": "click", "coordinates": {"x": 100, "y": 100}})
+        result = asyncio.run(executor.execute({"action_type": "click", "coordinates": {"x": 100, "y": 100}}))
+        self.assertTrue(result["dry_run"])
         executor.mouse.click.assert_not_called()
+        self.assertFalse(mouse_controller.pynput_mouse.is_loaded)
+        self.assertFalse(keyboard_controller.pynput_keyboard.is_loaded)
 
     def test_target_resolution(self):
         # Target bounding box: [100, 200, 300, 400]
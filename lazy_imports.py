@@ -0,0 +1,63 @@
+"""
+Deferred imports for heavy or platform-specific dependencies.
+
+`lazy_module("easyocr")` returns a stand-in module object that performs the
+real import on first attribute access, so importing a LADAS module no longer
+pulls in torch, ultralytics, openai, chromadb, pynput or pygetwindow unless
+the code path that needs them actually runs (e.g. only when the EasyOCR
+engine is selected, or only when real input is sent). `is_available` checks
+whether a package is installed without importing it.
+"""
+import importlib
+import importlib.util
+import threading
+import types
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def is_available(name: str) -> bool:
+    """True if `name` can be found on the import path (the module is not executed)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
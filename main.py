@@ -5,8 +5,6 @@ import logging
 import uuid
 import time
 import asyncio
-import pyperclip
-import pygetwindow as gw
 from aioconsole import ainput
 from rich.console import Console
 
@@ -17,6 +15,12 @@ from capture.capture_manager import CaptureManager
 from perception.ocr_engine import OCREngine
 from perception.vision_detector import VisionDetector
 from perception.state_builder import StateBuilder
+from perception.multi_monitor import MultiMonitorPerception
+from perception.geometry import offset_elements
+from perception.scheduler import PerceptionScheduler, merge_status
+from perception.motion_detector import MotionDetector
+from perception.prefetch import PerceptionPrefetch
+from perception.worker_service import PerceptionService
 from planning.task_planner import TaskPlanner
 from reasoning.instruction_parser import InstructionParser
 from reasoning.decision_engine import DecisionEngine
@@ -24,17 +28,21 @@ from reasoning.llm_client import LLMClient
 from reasoning.mock_llm import MockLLMClient
 from execution.action_executor import ActionExecutor
 from execution.failsafe_monitor import failsafe, FailsafeTriggered
-from memory.database import Database
-from memory.task_store import TaskStore
-from memory.action_log import ActionLog
 from state.fsm import StateTracker, FSMState
 from config_utils import validate_config
+from lazy_imports import lazy_module
+from startup_manager import StartupManager
+
+# Clipboard / window helpers are only needed once the context daemon runs
+pyperclip = lazy_module("pyperclip")
+gw = lazy_module("pygetwindow")
 
 # Setup rich console for terminal output
 console = Console()
 
 class LADAS:
     def __init__(self, config_path: str = "config.yaml"):
+        init_start = time.perf_counter()
         # 1. Load Config
         candidate_paths = [config_path]
         if not os.path.isabs(config_path):
@@ -67,25 +75,63 @@ class LADAS:
             fh.setFormatter(formatter)
             logger.addHandler(fh)
         
-        # 3. Initialize Memory
-        self.db = Database("memory.db")
-        self.task_store = TaskStore(self.db)
-        self.action_log = ActionLog(self.db)
+        # Critical path: only what the prompt needs. Models, the LLM client,
+        # the database and the failsafe listener load in the background and
+        # each task waits only for the components it uses.
+        self.startup = StartupManager(t0=init_start)
+        self.startup.record("config_logging", init_start)
         
-        # 4. Initialize State Tracker
-        self.state = StateTracker()
-        self.state.context_buffer = {
-            "active_window": "",
-            "clipboard": ""
-        }
+        # 3. Initialize State Tracker
+        with self.startup.phase("state"):
+            self.state = StateTracker()
+            self.state.context_buffer = {
+                "active_window": "",
+                "clipboard": ""
+            }
         
-        # 5. Initialize Hardware Interfaces
-        console.print("[yellow]Initializing Screen Capture & Failsafe...[/yellow]")
-        self.capture = CaptureManager(self.config)
-        failsafe.start()
+        # 4. Initialize Screen Capture
+        console.print("[yellow]Initializing Screen Capture...[/yellow]")
+        with self.startup.phase("capture"):
+            self.capture = CaptureManager(self.config)
         
-        # 6. Initialize Models
-        console.print("[yellow]Initializing Models (LLM, Vision, OCR)...[/yellow]")
+        self.session_id = uuid.uuid4().hex[:8]
+        with self.startup.phase("validate"):
+            self._validate_startup()
+        
+        # 5. Background loading (Memory, Failsafe, LLM, Vision, OCR)
+        console.print("[yellow]Loading models in the background (LLM, Vision, OCR)...[/yellow]")
+        self.perception_service = None
+        self.perception_scheduler = None
+        self.monitor_perception = None
+        self.motion = None
+        self.startup.submit("memory", self._load_memory)
+        if self.config.get("execution", {}).get("dry_run", False):
+            # Dry runs send no real input, so pynput's key listener is not needed
+            self.startup.submit("failsafe", lambda: None)
+        else:
+            self.startup.submit("failsafe", failsafe.start)
+        self.startup.submit("llm", self._load_llm)
+        self.startup.submit("executor", self._load_executor)
+        if self.config.get("perception", {}).get("service", {}).get("enabled", False):
+            self.startup.submit("ocr_vision_service", self._load_perception_service)
+            self.startup.submit("ocr", lambda: self._wait_worker(self.ocr), warmup=lambda: self.ocr.warm_up(), deps=("ocr_vision_service",))
+            self.startup.submit("vision", lambda: self._wait_worker(self.vision), warmup=lambda: self.vision.warm_up(), deps=("ocr_vision_service",))
+        else:
+            self.startup.submit("ocr", self._load_ocr, warmup=lambda: self.ocr.warm_up())
+            self.startup.submit("vision", self._load_vision, warmup=lambda: self.vision.warm_up())
+        self.startup.submit("perception", self._load_perception, deps=("ocr", "vision"))
+        console.print(f"[green]Ready. Session: {self.session_id}[/green]")
+
+    def _load_memory(self):
+        # Imported here so SQLAlchemy loads off the critical path
+        from memory.database import Database
+        from memory.task_store import TaskStore
+        from memory.action_log import ActionLog
+        self.db = Database("memory.db")
+        self.task_store = TaskStore(self.db)
+        self.action_log = ActionLog(self.db)
+
+    def _load_llm(self):
         llm_model = self.config.get("reasoning", {}).get("default_nim_model", "meta/llama-3.1-70b-instruct")
         try:
             self.llm = LLMClient(model_name=llm_model) 
@@ -96,20 +142,54 @@ class LADAS:
                 self.llm = MockLLMClient()
                 console.print("[yellow]Warning: Using MockLLMClient due to failure.[/yellow]")
             else:
-                console.print("[bold red]Failed to initialize LLM. Configuration forbids mock fallback. See logs for details.[/bold red]")
-                sys.exit(1)
+                raise RuntimeError("Failed to initialize LLM. Configuration forbids mock fallback. See logs for details.") from e
         
         self.parser = InstructionParser(self.llm, self.config)
         self.planner = TaskPlanner(self.llm, self.config)
         self.decision = DecisionEngine(self.llm, self.config)
-        
+
+    def _load_executor(self):
+        self.executor = ActionExecutor(self.config)
+
+    def _load_perception_service(self):
+        # OCR and vision run in worker processes; frames go through shared memory
+        self.perception_service = PerceptionService(self.config, self.capture.max_frame_bytes())
+        self.ocr = self.perception_service.ocr
+        self.vision = self.perception_service.vision
+
+    @staticmethod
+    def _wait_worker(client):
+        """A worker counts as loaded once its process has built the component."""
+        if not client.wait_ready():
+            raise RuntimeError(f"perception worker '{client.name}' did not start")
+        return client
+
+    def _load_ocr(self):
         self.ocr = OCREngine(self.config)
+
+    def _load_vision(self):
         self.vision = VisionDetector(self.config)
-        self.executor = ActionExecutor(self.config)
-        
-        self.session_id = uuid.uuid4().hex[:8]
-        self._validate_startup()
-        console.print(f"[green]Initialization Complete. Session: {self.session_id}[/green]")
+
+    def _load_perception(self):
+        self.perception_scheduler = self._build_scheduler()
+        self.monitor_perception = MultiMonitorPerception(
+            self._perceive_frame,
+            self.config.get("perception", {}).get("monitor_workers", 0)
+        )
+        motion_cfg = self.config.get("perception", {}).get("motion", {})
+        if motion_cfg.get("enabled", True):
+            # Bursts come from the continuous grabber when running, direct grabs otherwise
+            self.motion = MotionDetector.from_config(lambda since: self.capture.wait_for_frame(since, 0.5), motion_cfg)
+
+    async def _report_startup(self):
+        """Log (and show) the startup timing report once background loading has finished."""
+        await asyncio.to_thread(self.startup.wait_all)
+        report = self.startup.report()
+        logger.info("Startup timings:\n" + report)
+        if self.config.get("system", {}).get("show_startup_report", True):
+            console.print(f"[dim]{report}[/dim]")
+        if not self.startup.ready("llm"):
+            console.print("[bold red]LLM failed to initialize; tasks cannot run. See logs for details.[/bold red]")
 
     def _validate_startup(self):
         """Validates critical dependencies before starting."""
@@ -126,6 +206,73 @@ class LADAS:
                 sys.exit(1)
         logger.info("Startup validation passed successfully.")
 
+    def _build_scheduler(self):
+        """OCR, YOLO and template matching as concurrent stages with per-stage deadlines."""
+        scheduler_cfg = self.config.get("perception", {}).get("scheduler", {})
+        if not scheduler_cfg.get("enabled", False):
+            return None
+        stages = {"ocr": self.ocr.process_image, "templates": self.vision.detect_templates}
+        if self.vision.has_model:
+            stages["yolo"] = self.vision.detect_yolo
+        return PerceptionScheduler(
+            stages,
+            deadlines_ms=scheduler_cfg.get("deadlines_ms", {}),
+            default_deadline_ms=scheduler_cfg.get("default_deadline_ms", 2000),
+            max_stale_ms=scheduler_cfg.get("max_stale_ms", 5000),
+            workers_per_stage=scheduler_cfg.get("workers_per_stage", 1)
+        )
+
+    def _perceive_frame(self, frame, step_id: str):
+        """OCR + vision on a single frame; failures degrade to empty results. Returns (ocr, vision, stage_status)."""
+        key = getattr(frame, "monitor_index", None)
+        if self.perception_service is not None:
+            # Every stage's worker call reads the frame from one shared memory slot
+            with self.perception_service.share(frame) as shared:
+                return self._run_stages(shared, step_id, key)
+        return self._run_stages(frame, step_id, key)
+
+    def _run_stages(self, frame, step_id: str, key=None):
+        if self.perception_scheduler is not None:
+            results, status = self.perception_scheduler.run(frame, step_id, key=key)
+            # Template matching only stands in when YOLO found nothing (or is unavailable)
+            vis_data = results.get("yolo") or results.get("templates", [])
+            return results.get("ocr", []), vis_data, status
+        try:
+            ocr_data = self.ocr.process_image(frame, step_id)
+        except Exception:
+            ocr_data = []
+        try:
+            vis_data = self.vision.detect_elements(frame, step_id)
+        except Exception:
+            vis_data = []
+        return ocr_data, vis_data, {}
+
+    async def _perceive(self, cap_data: dict, step_id: str):
+        """Returns (ocr_data, vis_data, monitors, stage_status) for a capture_screen result."""
+        if cap_data.get("frame") is None and cap_data.get("frames"):
+            # Multi-monitor capture: perceive monitors concurrently, merged into global coordinates
+            ocr_data, vis_data, monitors = await asyncio.to_thread(self.monitor_perception.process, cap_data["frames"], step_id)
+            return ocr_data, vis_data, monitors, merge_status([m.get("perception_status") for m in monitors])
+        ocr_data, vis_data, status = await asyncio.to_thread(self._perceive_frame, cap_data["frame"], step_id)
+        dx, dy = cap_data.get("offset") or (0, 0)
+        if dx or dy:
+            # ROI capture: map window-crop coordinates back onto the monitor
+            ocr_data = offset_elements(ocr_data, dx, dy)
+            vis_data = offset_elements(vis_data, dx, dy)
+        return ocr_data, vis_data, None, status
+
+    def _busy_regions(self, cap_data: dict) -> list:
+        """Animated (loading) regions in monitor coordinates; empty when disabled or for multi-monitor captures."""
+        if self.motion is None or cap_data.get("frame") is None:
+            return []
+        try:
+            regions = self.motion.busy_regions()
+        except Exception as e:
+            logger.warning(f"Motion detection failed: {e}")
+            return []
+        origin = self.capture.screen_capture.get_monitor_origin()
+        return offset_elements(regions, -origin[0], -origin[1])
+
     async def _context_updater_daemon(self):
         """
         Agentic Asynchronous Execution: "Rolling Context Buffer" 
@@ -158,6 +305,7 @@ class LADAS:
         
         # Fire and forget the context aggregation daemon
         daemon_task = asyncio.create_task(self._context_updater_daemon())
+        startup_report_task = asyncio.create_task(self._report_startup())
         
         # To handle cancellation
         active_tasks = []
@@ -171,7 +319,6 @@ class LADAS:
                 if not user_input:
                     continue
                 if user_input.lower() in ["quit", "exit"]:
-                    self._shutdown()
                     break
                     
                 # Comet Paradigm: Fire task execution concurrently in the background so the terminal
@@ -185,10 +332,12 @@ class LADAS:
             console.print("\n[yellow]Keyboard interrupt. Shutting down...[/yellow]")
         finally:
             daemon_task.cancel()
+            startup_report_task.cancel()
             for t in active_tasks:
                 if not t.done():
                     t.cancel()
-            self._shutdown()
+            # Components still loading are waited for off the event loop
+            await asyncio.to_thread(self._shutdown)
 
     async def _execute_task(self, instruction: str):
         """The core execution lifecycle implemented asynchronously."""
@@ -197,6 +346,14 @@ class LADAS:
         self.state.session_id = self.session_id
         self.state.task_id = f"task_{int(time.time())}"
         
+        try:
+            # Parsing and planning only need the LLM and the task store; models keep loading meanwhile
+            await self.startup.require("memory", "llm")
+        except Exception as e:
+            console.print(f"[bold red]\\[FATAL ERROR][/bold red] Startup failed: {e}")
+            self.state.transition_to(FSMState.FAILED)
+            return
+        
         self.state.transition_to(FSMState.PARSING)
         console.print("[dim cyan]\\[PARSING][/dim cyan] Interpreting instruction...")
         
@@ -240,11 +397,26 @@ class LADAS:
             await asyncio.to_thread(self.task_store.update_task_status, self.state.task_id, self.state.fsm_state.name)
             return
 
+        try:
+            # Execution needs perception, the executor and the failsafe listener
+            await self.startup.require("failsafe", "executor", "perception")
+        except Exception as e:
+            console.print(f"[bold red]\\[FATAL ERROR][/bold red] Startup failed: {e}")
+            self.state.transition_to(FSMState.FAILED)
+            await asyncio.to_thread(self.task_store.update_task_status, self.state.task_id, self.state.fsm_state.name)
+            return
+        
         if not self.state.advance_step():
              return 
              
         global_timeout = self.config.get("planning", {}).get("global_timeout_seconds", 1800)
         self.state.task_start_time = time.time()
+        frame_reuse_max_age = self.config.get("state", {}).get("frame_reuse_max_age_ms", 1500)
+        # Validated post-action capture (and its in-flight perception) handed to the next step
+        prefetch = PerceptionPrefetch(self._perceive, self.capture.is_frame_current, frame_reuse_max_age)
+        motion_cfg = self.config.get("perception", {}).get("motion", {})
+        # Consecutive steps skipped because the UI showed a loading indicator
+        busy_skips = 0
         
         try:
             while self.state.fsm_state in [FSMState.EXECUTING, FSMState.VALIDATING, FSMState.RETRYING]:
@@ -266,13 +438,19 @@ class LADAS:
                     
                 console.print(f"[blue]\\[EXECUTING][/blue] {step.get('description', 'Unknown Step')}")
                 
-                # Capture Screen
+                # Capture Screen (served from the latest-frame mailbox in continuous mode)
                 capture_retries = 3
-                cap_data, dims = None, None
+                cap_data = None
+                dims = self.capture.get_monitor_dimensions()
+                # Reuse the previous step's validated post-frame if the screen has not moved on
+                cap_data, perception_task = await prefetch.take(self.state.current_step_id)
+                if cap_data is not None:
+                    logger.debug("Reusing post-action frame from the previous step")
                 for attempt in range(1, capture_retries + 1):
+                    if cap_data:
+                        break
                     try:
                         cap_data = await asyncio.to_thread(self.capture.capture_screen, self.session_id, self.state.current_step_id)
-                        dims = await asyncio.to_thread(self.capture.get_monitor_dimensions)
                         break
                     except Exception:
                         if attempt < capture_retries:
@@ -283,6 +461,8 @@ class LADAS:
                     self.state.transition_to(FSMState.FAILED)
                     break
 
+                screen_frame = cap_data["frame"]
+                # Written in the background; capture.flush_screenshots() before reading the file
                 screen_path = cap_data["path"]
                 screen_hash = cap_data["hash"]
                 
@@ -291,7 +471,7 @@ class LADAS:
                 last_act = history[-1]["action_type"] if history else None
                 is_static_expected = last_act in ["wait", "run_command", "scroll", "search_web"]
                 
-                is_loop = await asyncio.to_thread(self.capture.check_loop, screen_hash)
+                is_loop = await asyncio.to_thread(self.capture.check_loop, cap_data["phash"])
                 if is_loop:
                     if not is_static_expected:
                         self.state.repeated_state_count += 1
@@ -302,30 +482,52 @@ class LADAS:
                 else:
                     self.state.repeated_state_count = 0
                     
-                # Perception Pipeline
-                try:
-                    ocr_data = await asyncio.to_thread(self.ocr.process_image, screen_path, self.state.current_step_id)
-                except Exception:
-                    ocr_data = []
-                    
-                try:
-                    vis_data = await asyncio.to_thread(self.vision.detect_elements, screen_path, self.state.current_step_id)
-                except Exception:
-                    vis_data = []
+                # Loading indicator detection samples its own short burst alongside perception
+                motion_task = asyncio.create_task(asyncio.to_thread(self._busy_regions, cap_data))
+                
+                # Perception Pipeline (already running in the background for a reused frame)
+                if perception_task is not None:
+                    ocr_data, vis_data, monitors, perception_status = await perception_task
+                else:
+                    ocr_data, vis_data, monitors, perception_status = await self._perceive(cap_data, self.state.current_step_id)
+                motion_regions = await motion_task
                 
                 try:
                     screen_state = await asyncio.to_thread(
                         StateBuilder.build_screen_state,
                         self.session_id, self.state.current_step_id,
                         self.config.get("capture", {}).get("monitor_index", 0),
-                        self.config.get("capture", {}).get("capture_region", None),
-                        dims, screen_hash, ocr_data, vis_data
+                        cap_data.get("region") or self.config.get("capture", {}).get("capture_region", None),
+                        dims, screen_hash, ocr_data, vis_data, monitors, cap_data.get("active_window"),
+                        perception_status, motion_regions
                     )
                     # Inject asynchronously aggregated context daemon states into perception context window
-                    screen_state["context_buffer"] = self.state.context_buffer
+                    # A snapshot: the daemon mutates the buffer in place, which would not refresh the cached JSON
+                    screen_state["context_buffer"] = dict(self.state.context_buffer)
                 except Exception:
                     screen_state = {"resolution": dims, "elements": [], "text_regions": [], "screenshot_path": screen_path}
                 
+                # While the UI is visibly busy, wait for it instead of spending an LLM call on "wait"
+                busy = screen_state.get("loading_indicators_detected", False)
+                if busy and motion_cfg.get("skip_decision_when_busy", False) and busy_skips < motion_cfg.get("max_busy_skips", 3):
+                    busy_skips += 1
+                    if is_loop and not is_static_expected:
+                        # Waiting on a loading indicator is not a repeated state
+                        self.state.repeated_state_count = max(self.state.repeated_state_count - 1, 0)
+                    console.print("[blue]  ├─ UI busy (loading indicator); waiting before deciding[/blue]")
+                    if self.motion is not None:
+                        idle = await asyncio.to_thread(self.motion.wait_until_idle, motion_cfg.get("idle_timeout_ms", 10000) / 1000.0)
+                        logger.debug("Wait until idle: idle=%s elapsed_ms=%s", idle["idle"], idle["elapsed_ms"])
+                        settled = idle["idle"]
+                    else:
+                        await asyncio.sleep(1.0)
+                        settled = False
+                    if settled:
+                        # The screen changed under the indicator; perceive it again
+                        continue
+                    # Still busy: decide on the state we already have rather than re-running perception
+                busy_skips = 0
+                
                 # Action Decision
                 try:
                      action_cmd = await asyncio.to_thread(
@@ -342,6 +544,10 @@ class LADAS:
                 console.print(f"  ├─ Action: {action_cmd.get('action_type')} | Reason: {action_cmd.get('reasoning')}")
                 
                 # Action Execution
+                # Baseline for change detection: freshest mailbox frame if available
+                baseline_frame = self.capture.get_latest_frame() or self.capture.settle_frame(cap_data)
+                if baseline_frame is None:
+                    baseline_frame = await asyncio.to_thread(self.capture.wait_for_frame, 0.0, 0.5)
                 try:
                     action_result = await self.executor.execute(action_cmd)
                     if action_result and action_cmd.get("action_type") == "search_web":
@@ -360,35 +566,70 @@ class LADAS:
                     await asyncio.sleep(1.5)
                     continue
                 
+                # Frames grabbed before this instant (e.g. the settle baseline) show the pre-action screen
+                action_end = time.monotonic()
+                
+                # Start watching for the UI to react and settle while the action is logged
+                state_cfg = self.config.get("state", {})
+                settle_quiet = state_cfg.get("settle_quiet_ms", 150) / 1000.0
+                settle_task = asyncio.create_task(asyncio.to_thread(
+                    self.capture.wait_for_settle,
+                    baseline_frame,
+                    state_cfg.get("settle_change_timeout_ms", 1000) / 1000.0,
+                    settle_quiet,
+                    state_cfg.get("settle_max_wait_ms", 5000) / 1000.0
+                ))
+                
                 # Log Action (Now includes Perplexity searches seamlessly for reasoning context window)
                 await asyncio.to_thread(self.action_log.log_action, self.session_id, self.state.task_id, self.state.current_step_id, action_cmd, screen_hash)
                 
                 # Real result validation
-                post_wait = max(action_cmd.get("post_action_wait_ms", 500) / 1000.0, 0.5)
-                await asyncio.sleep(post_wait)
-                
                 self.state.transition_to(FSMState.VALIDATING)
+                settle = None
+                try:
+                    settle = await settle_task
+                    logger.debug(
+                        "Screen settle: changed=%s settled=%s change_ms=%s elapsed_ms=%s",
+                        settle["changed"], settle["settled"], settle["change_ms"], settle["elapsed_ms"]
+                    )
+                except Exception as e:
+                    logger.warning(f"Screen settle detection failed ({e}); falling back to a fixed wait.")
+                    post_wait = max(action_cmd.get("post_action_wait_ms", 500) / 1000.0, 0.5)
+                    await asyncio.sleep(post_wait)
+                
                 post_cap_data = None
+                # Only frames grabbed after the action (after the fixed wait if settling failed)
+                # are valid "after" evidence; capture_screen drops an older settled frame
+                post_since = action_end if settle else time.monotonic()
+                settled_frame = settle.get("frame") if settle else None
                 for attempt in range(1, 3):
                     try:
-                        post_cap_data = await asyncio.to_thread(self.capture.capture_screen, self.session_id, f"{self.state.current_step_id}_post")
+                        post_cap_data = await asyncio.to_thread(self.capture.capture_screen, self.session_id, f"{self.state.current_step_id}_post", post_since, settled_frame)
                         break
                     except Exception:
+                        settled_frame = None
                         await asyncio.sleep(0.3)
+                # Perceive the post-frame while it is validated; the next step (or retry)
+                # reuses both if the frame is still current by then
+                await prefetch.start(post_cap_data, f"{self.state.current_step_id}_post")
                 
                 no_change_ok = action_cmd.get("action_type", "") in ("wait", "scroll", "hover", "move", "press_key", "search_web")
                 
                 if post_cap_data:
-                    post_hash = post_cap_data["hash"]
-                    screen_unchanged = await asyncio.to_thread(self.capture.check_loop, post_hash)
+                    screen_unchanged = await asyncio.to_thread(self.capture.check_loop, post_cap_data["phash"])
+                    if settle and settle.get("changed"):
+                        # The settle detector saw the UI react to the action
+                        screen_unchanged = False
                 
                     if screen_unchanged and not no_change_ok:
                         self.state.step_retry_count += 1
                         retry_limit = self.config.get("execution", {}).get("step_retry_limit", 3)
                         if self.state.step_retry_count <= retry_limit:
-                            delay = min(self.config.get("state", {}).get("base_delay", 1.0) * (2 ** self.state.step_retry_count), self.config.get("state", {}).get("max_delay", 30.0))
+                            delay = min(state_cfg.get("base_delay", 1.0) * (2 ** self.state.step_retry_count), state_cfg.get("max_delay", 30.0))
                             self.state.transition_to(FSMState.RETRYING)
-                            await asyncio.sleep(delay)
+                            # The backoff is only an upper bound: retry as soon as
+                            # the screen changes and settles.
+                            await asyncio.to_thread(self.capture.wait_for_settle, self.capture.settle_frame(post_cap_data), delay, settle_quiet, delay)
                             continue
                         else:
                             await asyncio.to_thread(self.task_store.update_step_status, self.state.task_id, self.state.current_step_id, "FAILED", self.state.step_retry_count)
@@ -416,6 +657,7 @@ class LADAS:
             console.print(f"\n[bold red]\\[ERROR][/bold red] {e}")
             
         finally:
+            await prefetch.drain()
             await asyncio.to_thread(self.task_store.update_task_status, self.state.task_id, self.state.fsm_state.name)
             await asyncio.to_thread(self.capture.task_complete, self.session_id)
             if self.state.fsm_state == FSMState.TASK_COMPLETE:
@@ -425,7 +667,22 @@ class LADAS:
 
     def _shutdown(self):
         console.print("[yellow]Cleaning up processes...[/yellow]")
+        # Components that have not started loading are cancelled; ones already
+        # loading (or warming up) finish first so nothing is created after cleanup
+        self.startup.shutdown()
+        self.startup.wait_all(timeout=30)
         failsafe.stop()
+        if self.monitor_perception is not None:
+            self.monitor_perception.shutdown()
+        if self.perception_scheduler is not None:
+            self.perception_scheduler.shutdown()
+        if self.perception_service is not None:
+            self.perception_service.close()
+        else:
+            if self.startup.ready("ocr"):
+                self.ocr.close()
+            if self.startup.ready("vision"):
+                self.vision.close()
         self.capture.shutdown()
         console.print("Goodbye.")
         
@@ -2,10 +2,10 @@ import logging
 import json
 from typing import List, Dict, Any, Optional
 
-try:
-    import chromadb
-except ImportError:
-    chromadb = None
+from lazy_imports import lazy_module, is_available
+
+chromadb = lazy_module("chromadb")
+CHROMADB_AVAILABLE = is_available("chromadb")
 
 logger = logging.getLogger("ladas.memory.rag")
 
@@ -19,7 +19,7 @@ class RAGMemoryStorage:
         self._collection_name = "task_traces"
         self.collection = None
         
-        if chromadb is None:
+        if not CHROMADB_AVAILABLE:
             logger.warning("chromadb not installed. RAG memory module will operate in fallback mock mode.")
             return
             
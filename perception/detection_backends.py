@@ -0,0 +1,268 @@
+"""
+Pluggable object detection backends for VisionDetector.
+
+`ultralytics` runs the .pt weights through PyTorch (the original path).
+`onnxruntime` and `openvino` run an ONNX export of the same weights that is
+created once and cached next to the .pt file (`<name>.onnx`, or
+`<name>.int8.onnx` when INT8 quantization is enabled). Letterboxing and NMS
+for the ONNX backends are plain vectorized numpy.
+
+Every backend's `predict(bgr)` returns a list of
+(x1, y1, x2, y2, confidence, class_name) in input image coordinates.
+"""
+import os
+import ast
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from lazy_imports import lazy_module, is_available
+
+# Backends are imported only when the configured one is created
+ultralytics = lazy_module("ultralytics")
+ort = lazy_module("onnxruntime")
+ov = lazy_module("openvino")
+YOLO_AVAILABLE = is_available("ultralytics")
+ONNXRUNTIME_AVAILABLE = is_available("onnxruntime")
+OPENVINO_AVAILABLE = is_available("openvino")
+
+Detection = Tuple[float, float, float, float, float, str]
+
+
+def letterbox(image: np.ndarray, size: int, pad_value: int = 114) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize a BGR image to fit size x size keeping its aspect ratio, pad the
+    rest and return an NCHW float32 RGB tensor in [0, 1], the scale ratio and
+    the (left, top) padding.
+    """
+    h, w = image.shape[:2]
+    ratio = min(size / h, size / w)
+    nw, nh = int(round(w * ratio)), int(round(h * ratio))
+    resized = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR) if (nw, nh) != (w, h) else image
+    left, top = (size - nw) // 2, (size - nh) // 2
+    canvas = np.full((size, size, 3), pad_value, dtype=np.uint8)
+    canvas[top:top + nh, left:left + nw] = resized
+    tensor = canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) * (1.0 / 255.0)
+    return np.ascontiguousarray(tensor), ratio, (left, top)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy non-maximum suppression on (N, 4) xyxy boxes; returns kept indices by score."""
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    x1, y1, x2, y2 = boxes.T
+    areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.maximum(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0)
+        h = np.maximum(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def postprocess(output: np.ndarray,
+                conf_threshold: float,
+                iou_threshold: float,
+                ratio: float,
+                pad: Tuple[int, int],
+                image_shape: Tuple[int, int],
+                names: Dict[int, str],
+                max_det: int = 300) -> List[Detection]:
+    """
+    Decode a YOLOv8 head output of shape (1, 4 + classes, anchors) into
+    detections: confidence filter, class-aware NMS and undoing the letterbox.
+    """
+    pred = output[0].T  # (anchors, 4 + classes)
+    class_scores = pred[:, 4:]
+    class_ids = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(class_ids)), class_ids]
+    mask = scores >= conf_threshold
+    if not mask.any():
+        return []
+    xywh, scores, class_ids = pred[mask, :4], scores[mask], class_ids[mask]
+
+    boxes = np.empty_like(xywh)
+    boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+    boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+    # Offset boxes per class so one NMS pass never suppresses across classes
+    offsets = class_ids[:, None].astype(np.float32) * 4096.0
+    keep = nms(boxes + offsets, scores, iou_threshold)[:max_det]
+
+    boxes = boxes[keep]
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad[0]) / ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad[1]) / ratio
+    h, w = image_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+    return [(float(b[0]), float(b[1]), float(b[2]), float(b[3]), float(s), names.get(int(c), str(int(c))))
+            for b, s, c in zip(boxes, scores[keep], class_ids[keep])]
+
+
+def onnx_export_path(weights_path: str, imgsz: int = 640, int8: bool = False) -> str:
+    """Cached export path; the input size is part of the name since the export is static."""
+    stem, _ = os.path.splitext(weights_path)
+    return f"{stem}.{int(imgsz)}.int8.onnx" if int8 else f"{stem}.{int(imgsz)}.onnx"
+
+
+def ensure_onnx(weights_path: str, imgsz: int = 640, int8: bool = False) -> str:
+    """
+    Export `weights_path` (.pt) to ONNX once per input size and reuse the
+    cached file until the weights change. Optionally writes a dynamically
+    INT8-quantized copy.
+    """
+    if weights_path.endswith(".onnx"):
+        return weights_path
+    target = onnx_export_path(weights_path, imgsz, int8)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(weights_path):
+        return target
+
+    fp32 = onnx_export_path(weights_path, imgsz)
+    if not os.path.exists(fp32) or os.path.getmtime(fp32) < os.path.getmtime(weights_path):
+        if not YOLO_AVAILABLE:
+            raise RuntimeError("ultralytics is required once to export the .pt weights to ONNX")
+        logging.info(f"Exporting {weights_path} to ONNX (imgsz={imgsz}); this happens once")
+        exported = ultralytics.YOLO(weights_path).export(format="onnx", imgsz=imgsz, dynamic=False)
+        if os.path.abspath(str(exported)) != os.path.abspath(fp32):
+            os.replace(str(exported), fp32)
+
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        logging.info(f"Quantizing {fp32} to INT8")
+        quantize_dynamic(fp32, target, weight_type=QuantType.QUInt8)
+    return target
+
+
+def _names_from_metadata(metadata: Optional[dict]) -> Dict[int, str]:
+    """Ultralytics stores the class names in the ONNX metadata as a dict literal."""
+    try:
+        return {int(k): str(v) for k, v in ast.literal_eval((metadata or {}).get("names", "{}")).items()}
+    except (ValueError, SyntaxError):
+        return {}
+
+
+class UltralyticsBackend:
+    """The original PyTorch path through ultralytics."""
+    name = "ultralytics"
+
+    def __init__(self, weights_path: str, device: str = "cpu", conf: float = 0.5, iou: float = 0.45):
+        self.model = ultralytics.YOLO(weights_path)
+        try:
+            self.model.to(device)
+        except Exception as e:
+            logging.warning(
+                "YOLO model loaded but moving to device '%s' failed (%s). Falling back to default device.", device, e
+            )
+        self.conf = conf
+        self.iou = iou
+        self.names = self.model.names
+
+    def predict(self, bgr: np.ndarray) -> List[Detection]:
+        # ultralytics treats numpy input as BGR, same as cv2.imread
+        results = self.model(bgr, conf=self.conf, iou=self.iou, verbose=False)[0]
+        detections = []
+        for box in results.boxes:
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            detections.append((x1, y1, x2, y2, box.conf[0].item(), self.names[int(box.cls[0].item())]))
+        return detections
+
+
+class OnnxRuntimeBackend:
+    """ONNX Runtime CPU inference with explicit intra-op threading."""
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path: str, conf: float = 0.5, iou: float = 0.45, threads: int = 0):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = int(threads) or (os.cpu_count() or 1)
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.imgsz = int(model_input.shape[2]) if isinstance(model_input.shape[2], int) else 640
+        self.names = _names_from_metadata(self.session.get_modelmeta().custom_metadata_map)
+        self.conf = conf
+        self.iou = iou
+
+    def predict(self, bgr: np.ndarray) -> List[Detection]:
+        tensor, ratio, pad = letterbox(bgr, self.imgsz)
+        output = self.session.run(None, {self.input_name: tensor})[0]
+        return postprocess(output, self.conf, self.iou, ratio, pad, bgr.shape, self.names)
+
+
+class OpenVINOBackend:
+    """OpenVINO CPU inference of the ONNX export."""
+    name = "openvino"
+
+    def __init__(self, onnx_path: str, conf: float = 0.5, iou: float = 0.45, threads: int = 0):
+        core = ov.Core()
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if threads:
+            config["INFERENCE_NUM_THREADS"] = int(threads)
+        model = core.read_model(onnx_path)
+        self.compiled = core.compile_model(model, "CPU", config)
+        shape = self.compiled.input(0).get_partial_shape()
+        self.imgsz = shape[2].get_length() if shape[2].is_static else 640
+        self.names = {}
+        try:
+            self.names = _names_from_metadata({"names": model.get_rt_info(["framework", "names"]).astype(str)})
+        except Exception:
+            pass
+        if not self.names and ONNXRUNTIME_AVAILABLE:
+            self.names = _names_from_metadata(ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"]).get_modelmeta().custom_metadata_map)
+        self.conf = conf
+        self.iou = iou
+
+    def predict(self, bgr: np.ndarray) -> List[Detection]:
+        tensor, ratio, pad = letterbox(bgr, self.imgsz)
+        output = self.compiled([tensor])[self.compiled.output(0)]
+        return postprocess(output, self.conf, self.iou, ratio, pad, bgr.shape, self.names)
+
+
+def create_backend(weights_path: str,
+                   backend: str = "ultralytics",
+                   device: str = "cpu",
+                   conf: float = 0.5,
+                   iou: float = 0.45,
+                   threads: int = 0,
+                   int8: bool = False,
+                   imgsz: int = 640):
+    """
+    Build the configured backend. "auto" prefers OpenVINO, then ONNX Runtime,
+    then ultralytics. An ONNX backend that cannot be set up falls back to
+    ultralytics with a warning.
+    """
+    backend = (backend or "ultralytics").lower()
+    if backend == "auto":
+        if device == "cpu" and OPENVINO_AVAILABLE:
+            backend = "openvino"
+        elif device == "cpu" and ONNXRUNTIME_AVAILABLE:
+            backend = "onnxruntime"
+        else:
+            backend = "ultralytics"
+
+    if backend in ("onnxruntime", "openvino"):
+        available = ONNXRUNTIME_AVAILABLE if backend == "onnxruntime" else OPENVINO_AVAILABLE
+        if not available:
+            logging.warning(f"Detection backend '{backend}' is not installed; using ultralytics.")
+        else:
+            try:
+                onnx_path = ensure_onnx(weights_path, imgsz=imgsz, int8=int8)
+                cls = OnnxRuntimeBackend if backend == "onnxruntime" else OpenVINOBackend
+                instance = cls(onnx_path, conf=conf, iou=iou, threads=threads)
+                logging.info(f"Detection backend: {backend} ({onnx_path})")
+                return instance
+            except Exception as e:
+                logging.warning(f"Could not set up detection backend '{backend}' ({e}); using ultralytics.")
+
+    if not YOLO_AVAILABLE:
+        raise RuntimeError("ultralytics is not installed")
+    return UltralyticsBackend(weights_path, device=device, conf=conf, iou=iou)
@@ -0,0 +1,215 @@
+import json
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Element keys stored as interned strings, in the order rows are rebuilt
+STRING_FIELDS = ("id", "class", "label", "text", "confidence_level")
+_BOX_KEYS = ("x", "y", "width", "height")
+
+
+class StringTable:
+    """Interns strings so repeated labels/texts (and OCR text copied into labels) are stored once."""
+    __slots__ = ("strings", "_index")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = idx
+        return idx
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+class ElementTable(Sequence):
+    """
+    Read-only, columnar storage for a list of OCR or vision elements.
+
+    Integer boxes and centers and float confidences live in numpy arrays
+    (int64 / float64, so rows come back exactly as stored); id/class/label/
+    text are indices into a (shareable) StringTable; any other keys, and
+    boxes with non-integer coordinates, are kept per row as-is. Indexing or
+    iterating rebuilds plain element dicts, so code written against lists of
+    dicts keeps working. JSON is produced once per indent setting and cached.
+    """
+    def __init__(self, elements: Iterable[Dict[str, Any]], strings: Optional[StringTable] = None):
+        elements = list(elements)
+        n = len(elements)
+        self.strings = strings if strings is not None else StringTable()
+        self.string_ids = np.full((n, len(STRING_FIELDS)), -1, dtype=np.int32)
+        self.boxes = np.zeros((n, 4), dtype=np.int64)
+        self.has_box = np.zeros(n, dtype=bool)
+        self.centers = np.zeros((n, 2), dtype=np.int64)
+        self.has_center = np.zeros(n, dtype=bool)
+        self.confidence = np.full(n, np.nan, dtype=np.float64)
+        self.extras: List[Optional[Dict[str, Any]]] = [None] * n
+        self._json: Dict[Optional[int], str] = {}
+
+        for i, element in enumerate(elements):
+            extra = {}
+            for key, value in element.items():
+                if key in STRING_FIELDS and isinstance(value, str):
+                    self.string_ids[i, STRING_FIELDS.index(key)] = self.strings.intern(value)
+                elif key == "bounding_box" and isinstance(value, dict) and set(value) == set(_BOX_KEYS) \
+                        and all(_is_int(v) for v in value.values()):
+                    self.boxes[i] = [value[k] for k in _BOX_KEYS]
+                    self.has_box[i] = True
+                elif key == "center" and isinstance(value, dict) and set(value) == {"x", "y"} \
+                        and all(_is_int(v) for v in value.values()):
+                    self.centers[i] = (value["x"], value["y"])
+                    self.has_center[i] = True
+                elif key == "confidence" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self.confidence[i] = value
+                else:
+                    extra[key] = value
+            self.extras[i] = extra or None
+
+    def __len__(self) -> int:
+        return len(self.extras)
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        row: Dict[str, Any] = {}
+        ids = self.string_ids[i]
+        for field, sid in zip(STRING_FIELDS[:4], ids[:4]):
+            if sid >= 0:
+                row[field] = self.strings.strings[sid]
+        if not np.isnan(self.confidence[i]):
+            row["confidence"] = float(self.confidence[i])
+        if ids[4] >= 0:
+            row["confidence_level"] = self.strings.strings[ids[4]]
+        if self.has_box[i]:
+            row["bounding_box"] = dict(zip(_BOX_KEYS, self.boxes[i].tolist()))
+        if self.has_center[i]:
+            x, y = self.centers[i].tolist()
+            row["center"] = {"x": x, "y": y}
+        if self.extras[i]:
+            row.update(self.extras[i])
+        return row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("element index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (ElementTable, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ElementTable({len(self)} elements)"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        cached = self._json.get(indent)
+        if cached is None:
+            cached = self._json[indent] = json.dumps(self.to_list(), indent=indent)
+        return cached
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns (strings are shared through the StringTable)."""
+        return (self.string_ids.nbytes + self.boxes.nbytes + self.has_box.nbytes +
+                self.centers.nbytes + self.has_center.nbytes + self.confidence.nbytes)
+
+
+def _json_default(value):
+    if isinstance(value, ElementTable):
+        return value.to_list()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ScreenState(dict):
+    """
+    The screen state dict, with element lists stored as ElementTables and
+    its JSON form built on first use and cached until the state is modified.
+
+    Only top-level assignments invalidate the cache. Replace nested values
+    (e.g. assign a copy of the context buffer) instead of mutating them in
+    place, or call `invalidate()` afterwards.
+
+    `items()` yields element tables as plain lists, so `json.dumps(state)`
+    works without `to_json()`; the json encoder walks dicts through it.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._json: Optional[str] = None
+
+    def invalidate(self):
+        """Drop the cached JSON, e.g. after mutating a nested value in place."""
+        self._json = None
+
+    _invalidate = invalidate
+
+    def items(self):
+        return [(key, value.to_list() if isinstance(value, ElementTable) else value)
+                for key, value in super().items()]
+
+    def __setitem__(self, key, value):
+        self._invalidate()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._invalidate()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._invalidate()
+        super().update(*args, **kwargs)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._invalidate()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._invalidate()
+        return super().setdefault(key, default)
+
+    def clear(self):
+        self._invalidate()
+        super().clear()
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self, default=_json_default)
+        return self._json
+
+    def elements_json(self, key: str, indent: Optional[int] = 2) -> str:
+        """JSON for one element list (as used in the decision prompt), cached on the table."""
+        elements = self.get(key, [])
+        if isinstance(elements, ElementTable):
+            return elements.to_json(indent)
+        return json.dumps(elements, indent=indent, default=_json_default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict/list copy (element tables expanded)."""
+        return json.loads(self.to_json())
@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+
+def offset_elements(elements: List[Dict[str, Any]], dx: int, dy: int) -> List[Dict[str, Any]]:
+    """
+    Shift element bounding boxes and centers by (dx, dy), e.g. from a monitor
+    or crop back into global screen coordinates. Returns shallow copies so
+    cached per-frame results are never mutated.
+    """
+    if not dx and not dy:
+        return [dict(e) for e in elements]
+    shifted = []
+    for e in elements:
+        e = dict(e)
+        box = e.get("bounding_box")
+        if box:
+            e["bounding_box"] = dict(box, x=box.get("x", 0) + dx, y=box.get("y", 0) + dy)
+        center = e.get("center")
+        if center:
+            e["center"] = dict(center, x=center.get("x", 0) + dx, y=center.get("y", 0) + dy)
+        shifted.append(e)
+    return shifted
+
+
+class ResolutionScaler:
+    """
+    Chooses the resolution an engine runs inference at. The factor comes
+    from a fixed `scale`, a cap on the long side (`max_long_side`) or, in
+    auto mode, from the median text height of recent OCR results so text
+    lands near `target_text_height` pixels. Callers resize with `resize`
+    and divide result coordinates by the factor to get back to the frame.
+    """
+    PRESETS = {
+        "quality": {"scale": 1.0, "max_long_side": 0},
+        "balanced": {"scale": 1.0, "max_long_side": 2560},
+        "fast": {"scale": 1.0, "max_long_side": 1600},
+    }
+    # Auto factors are rounded to this step so the image size (and the
+    # incremental OCR / tile caches keyed on it) does not change every frame
+    AUTO_STEP = 0.125
+
+    def __init__(self,
+                 scale: float = 1.0,
+                 max_long_side: int = 0,
+                 auto: bool = False,
+                 target_text_height: float = 14.0,
+                 min_scale: float = 0.5,
+                 max_scale: float = 1.0,
+                 history: int = 5):
+        self.scale = max(float(scale), 0.05)
+        self.max_long_side = max(int(max_long_side or 0), 0)
+        self.auto = bool(auto)
+        self.target_text_height = float(target_text_height)
+        self.min_scale = float(min_scale)
+        self.max_scale = max(float(max_scale), self.min_scale)
+        self._heights = deque(maxlen=max(int(history), 1))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, section: dict) -> "ResolutionScaler":
+        """Build from an engine config section (resolution_preset, resolution_scale, max_long_side, auto_scale...)."""
+        preset = cls.PRESETS.get(str(section.get("resolution_preset", "quality")).lower(), cls.PRESETS["quality"])
+        scale = section.get("resolution_scale")
+        max_long_side = section.get("max_long_side")
+        return cls(
+            scale=preset["scale"] if scale is None else scale,
+            max_long_side=preset["max_long_side"] if max_long_side is None else max_long_side,
+            auto=section.get("auto_scale", False),
+            target_text_height=section.get("auto_text_height", 14.0),
+            min_scale=section.get("auto_min_scale", 0.5),
+            history=section.get("auto_history", 5)
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.scale != 1.0 or self.max_long_side > 0 or self.auto
+
+    def observe(self, elements: List[Dict[str, Any]]):
+        """Record the median box height (frame pixels) of one frame's OCR results."""
+        heights = [e["bounding_box"]["height"] for e in elements if e.get("bounding_box", {}).get("height", 0) > 0]
+        if heights:
+            with self._lock:
+                self._heights.append(float(np.median(heights)))
+
+    def auto_factor(self) -> Optional[float]:
+        """Factor that brings the median text height to the target, or None before any observation."""
+        with self._lock:
+            if not self._heights:
+                return None
+            median_height = float(np.median(self._heights))
+        factor = min(max(self.target_text_height / median_height, self.min_scale), self.max_scale)
+        return max(round(factor / self.AUTO_STEP) * self.AUTO_STEP, self.AUTO_STEP)
+
+    def factor_for(self, width: int, height: int) -> float:
+        """Resize factor for a width x height frame (1.0 = native resolution)."""
+        factor = self.scale
+        if self.auto:
+            auto_factor = self.auto_factor()
+            if auto_factor is not None:
+                factor = auto_factor
+        long_side = max(width, height)
+        if self.max_long_side and long_side * factor > self.max_long_side:
+            factor = self.max_long_side / long_side
+        return 1.0 if abs(factor - 1.0) < 1e-3 else factor
+
+    @staticmethod
+    def resize(image: np.ndarray, factor: float) -> np.ndarray:
+        if factor == 1.0:
+            return image
+        h, w = image.shape[:2]
+        size = (max(int(round(w * factor)), 1), max(int(round(h * factor)), 1))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA if factor < 1.0 else cv2.INTER_LINEAR)
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _contains(outer: Rect, inner: Rect) -> bool:
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+            inner[0] + inner[2] <= outer[0] + outer[2] and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    x1, y1 = min(a[0], b[0]), min(a[1], b[1])
+    x2, y2 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def _merge_rects(rects: List[Rect]) -> List[Rect]:
+    """Union overlapping rectangles until none overlap."""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        out: List[Rect] = []
+        for r in rects:
+            for i, o in enumerate(out):
+                if _intersects(r, o):
+                    out[i] = _union(r, o)
+                    merged = True
+                    break
+            else:
+                out.append(r)
+        rects = out
+    return rects
+
+
+class _OCRState:
+    __slots__ = ("token", "shape", "entries")
+
+    def __init__(self, token, shape, entries):
+        self.token = token
+        self.shape = shape
+        self.entries = entries
+
+
+class IncrementalOCR:
+    """
+    Reuses the previous frame's OCR between steps.
+
+    Keeps the last frame's text boxes together with a hash of each box's
+    pixels. On the next frame (when its dirty rectangles were computed
+    against that same frame) detection only runs inside the dirty areas,
+    grown to fully cover any previous box they touch; boxes outside them are
+    carried forward as-is. Newly detected boxes whose pixels hash the same as
+    a previous box reuse its text and ID, so only boxes with changed pixels
+    are recognized again.
+
+    `detect_fn(image)` returns (x, y, width, height) text boxes;
+    `recognize_fn(image, boxes)` returns one (text, confidence) per box.
+    State is kept per `key` (e.g. monitor index).
+    """
+    def __init__(self,
+                 detect_fn: Callable[[np.ndarray], List[Rect]],
+                 recognize_fn: Callable[[np.ndarray, List[Rect]], List[Tuple[str, float]]],
+                 margin: int = 8,
+                 max_dirty_fraction: float = 0.6):
+        self.detect_fn = detect_fn
+        self.recognize_fn = recognize_fn
+        self.margin = max(int(margin), 0)
+        self.max_dirty_fraction = float(max_dirty_fraction)
+        self._states: Dict[Hashable, _OCRState] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.last_stats = {}
+
+    @staticmethod
+    def box_hash(image: np.ndarray, box: Rect) -> bytes:
+        x, y, w, h = box
+        crop = np.ascontiguousarray(image[y:y + h, x:x + w])
+        digest = hashlib.blake2b(crop.data, digest_size=12)
+        digest.update(repr(crop.shape).encode())
+        return digest.digest()
+
+    def _new_id(self, step_id: str) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"ocr_{step_id}_{self._next_id}"
+
+    def reset(self):
+        with self._lock:
+            self._states.clear()
+
+    def _dirty_regions(self, dirty_rects: Sequence[Rect], scale: float, width: int, height: int,
+                       previous: List[dict]) -> List[Rect]:
+        regions = []
+        for (x, y, w, h) in dirty_rects:
+            x1 = max(int(x * scale) - self.margin, 0)
+            y1 = max(int(y * scale) - self.margin, 0)
+            x2 = min(int((x + w) * scale) + self.margin, width)
+            y2 = min(int((y + h) * scale) + self.margin, height)
+            if x2 > x1 and y2 > y1:
+                regions.append((x1, y1, x2 - x1, y2 - y1))
+        # Grow regions over every previous box they touch so no box is cut in half
+        grown = True
+        while grown:
+            grown = False
+            regions = _merge_rects(regions)
+            for i, region in enumerate(regions):
+                for entry in previous:
+                    box = entry["box"]
+                    if _intersects(region, box) and not _contains(region, box):
+                        region = _union(region, box)
+                        grown = True
+                regions[i] = region
+        return regions
+
+    def process(self,
+                image: np.ndarray,
+                step_id: str,
+                key: Hashable = None,
+                token=None,
+                base_token=None,
+                dirty_rects: Optional[Sequence[Rect]] = None,
+                scale: float = 1.0) -> List[dict]:
+        """
+        OCR `image` (the preprocessed frame). `token` identifies this frame,
+        `base_token` the frame `dirty_rects` (in frame coordinates, multiplied
+        by `scale` to reach image coordinates) were computed against. Returns
+        entries with id, box (image coordinates), text and confidence.
+        """
+        height, width = image.shape[:2]
+        state = self._states.get(key)
+        incremental = (state is not None and dirty_rects is not None and base_token is not None
+                       and state.token == base_token and state.shape == image.shape)
+
+        previous = state.entries if state is not None else []
+        if incremental:
+            regions = self._dirty_regions(dirty_rects, scale, width, height, previous)
+            area = sum(w * h for _, _, w, h in regions)
+            if area > self.max_dirty_fraction * width * height:
+                incremental = False
+
+        if incremental:
+            kept = [e for e in previous if not any(_intersects(e["box"], r) for r in regions)]
+            boxes = []
+            for (rx, ry, rw, rh) in regions:
+                for (x, y, w, h) in self.detect_fn(image[ry:ry + rh, rx:rx + rw]):
+                    boxes.append((rx + x, ry + y, w, h))
+        else:
+            kept = []
+            boxes = list(self.detect_fn(image))
+
+        # Previous boxes by pixel hash: identical pixels need no recognition
+        kept_ids = {e["id"] for e in kept}
+        by_hash: Dict[bytes, List[dict]] = {}
+        for entry in previous:
+            if entry["id"] not in kept_ids:
+                by_hash.setdefault(entry["hash"], []).append(entry)
+
+        entries = list(kept)
+        pending = []
+        for box in boxes:
+            digest = self.box_hash(image, box)
+            candidates = by_hash.get(digest)
+            if candidates:
+                # Prefer the candidate at the same position (stable IDs)
+                match = min(candidates, key=lambda e: abs(e["box"][0] - box[0]) + abs(e["box"][1] - box[1]))
+                candidates.remove(match)
+                entries.append(dict(match, box=box))
+            else:
+                pending.append((box, digest))
+
+        if pending:
+            recognized = self.recognize_fn(image, [box for box, _ in pending])
+            for (box, digest), (text, conf) in zip(pending, recognized):
+                if text is None:
+                    continue
+                entries.append({"id": self._new_id(step_id), "box": box, "hash": digest,
+                                "text": text, "confidence": float(conf)})
+
+        entries.sort(key=lambda e: (e["box"][1], e["box"][0]))
+        self._states[key] = _OCRState(token, image.shape, entries)
+        self.last_stats = {"incremental": incremental, "carried": len(kept),
+                           "reused": len(boxes) - len(pending), "recognized": len(pending)}
+        logging.debug(f"Incremental OCR: {self.last_stats}")
+        return entries
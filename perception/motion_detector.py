@@ -0,0 +1,149 @@
+import time
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from capture.frame import Frame
+from capture.image_hash import area_downscale
+
+
+class MotionDetector:
+    """
+    Finds loading indicators (spinners, indeterminate progress bars, pulsing
+    placeholders) without a trained model: small screen regions that keep
+    changing across a short burst of downscaled grayscale frames.
+
+    A region counts as animating when it changed between at least
+    `min_persistence` of the consecutive frame pairs. One-off changes (a
+    blinking caret, a tooltip appearing) and large changes (video, scrolling)
+    are ignored.
+
+    `sample_fn(since)` must return a frame grabbed after the monotonic
+    timestamp `since` (or None if none arrived in time), as for
+    ScreenSettleDetector.
+    """
+    def __init__(self,
+                 sample_fn: Callable[[float], Optional[Frame]],
+                 burst_frames: int = 6,
+                 sample_interval_ms: float = 50,
+                 thumb_width: int = 320,
+                 diff_threshold: float = 10.0,
+                 min_persistence: float = 0.6,
+                 max_region_fraction: float = 0.25,
+                 max_area_fraction: float = 0.02):
+        self.sample_fn = sample_fn
+        self.burst_frames = max(int(burst_frames), 3)
+        self.sample_interval = max(float(sample_interval_ms), 0.0) / 1000.0
+        self.thumb_width = max(int(thumb_width), 16)
+        self.diff_threshold = float(diff_threshold)
+        self.min_persistence = float(min_persistence)
+        self.max_region_fraction = float(max_region_fraction)
+        self.max_area_fraction = float(max_area_fraction)
+        self._kernel = np.ones((3, 3), dtype=np.uint8)
+
+    @classmethod
+    def from_config(cls, sample_fn: Callable[[float], Optional[Frame]], motion_config: dict) -> "MotionDetector":
+        return cls(
+            sample_fn,
+            burst_frames=motion_config.get("burst_frames", 6),
+            sample_interval_ms=motion_config.get("sample_interval_ms", 50),
+            thumb_width=motion_config.get("thumb_width", 320),
+            diff_threshold=motion_config.get("diff_threshold", 10.0),
+            min_persistence=motion_config.get("min_persistence", 0.6),
+            max_region_fraction=motion_config.get("max_region_fraction", 0.25),
+            max_area_fraction=motion_config.get("max_area_fraction", 0.02)
+        )
+
+    def thumbnail(self, frame: Frame) -> np.ndarray:
+        h, w = frame.image.shape[:2]
+        tw = min(self.thumb_width, w)
+        th = max(1, int(round(h * tw / float(w))))
+        small = area_downscale(frame.image, tw, th)
+        if small.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            small = cv2.cvtColor(small, code)
+        return small.astype(np.int16)
+
+    def sample_burst(self) -> List[Frame]:
+        """Grab `burst_frames` consecutive frames of the same size and position."""
+        frames: List[Frame] = []
+        since = time.monotonic()
+        deadline = since + max(self.burst_frames * self.sample_interval * 3, 1.0)
+        while len(frames) < self.burst_frames and time.monotonic() < deadline:
+            frame = self.sample_fn(since)
+            if frame is None:
+                continue
+            since = frame.monotonic
+            if frames and (frame.image.shape != frames[0].image.shape or
+                           (frame.left, frame.top) != (frames[0].left, frames[0].top)):
+                frames = []  # capture region moved; start the burst again
+            frames.append(frame)
+            if self.sample_interval > 0 and len(frames) < self.burst_frames:
+                time.sleep(self.sample_interval)
+        return frames
+
+    def detect(self, frames: Sequence[Frame]) -> List[Dict[str, Any]]:
+        """
+        Animated regions in a burst of frames, as elements with a
+        bounding_box in screen coordinates (frame.left/top applied) and an
+        `activity` score (share of frame pairs the region changed in).
+        """
+        if len(frames) < 3:
+            return []
+        thumbs = [self.thumbnail(f) for f in frames]
+        diffs = [np.abs(b - a) > self.diff_threshold for a, b in zip(thumbs, thumbs[1:])]
+        union = np.logical_or.reduce(diffs).astype(np.uint8)
+        if not union.any():
+            return []
+        union = cv2.dilate(union, self._kernel)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(union, connectivity=8)
+
+        th, tw = thumbs[0].shape
+        frame = frames[-1]
+        sx, sy = frame.width / float(tw), frame.height / float(th)
+        regions = []
+        for label in range(1, count):
+            x, y, w, h, _ = stats[label]
+            if w > self.max_region_fraction * tw or h > self.max_region_fraction * th:
+                continue
+            if w * h > self.max_area_fraction * tw * th:
+                continue
+            activity = sum(bool(d[y:y + h, x:x + w].any()) for d in diffs) / float(len(diffs))
+            if activity < self.min_persistence:
+                continue
+            bx, by = frame.left + int(x * sx), frame.top + int(y * sy)
+            bw, bh = int(np.ceil(w * sx)), int(np.ceil(h * sy))
+            regions.append({
+                "id": f"motion_{len(regions)}",
+                "class": "animation",
+                "activity": round(activity, 2),
+                "bounding_box": {"x": bx, "y": by, "width": bw, "height": bh},
+                "center": {"x": bx + bw // 2, "y": by + bh // 2}
+            })
+        return regions
+
+    def busy_regions(self) -> List[Dict[str, Any]]:
+        """Sample one burst and return its animated regions."""
+        return self.detect(self.sample_burst())
+
+    def wait_until_idle(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Sample bursts until one shows no animation or `timeout` seconds pass.
+
+        Returns a dict with:
+          idle       - the last burst had no animated regions
+          elapsed_ms - total time spent waiting
+          regions    - animated regions of the last burst
+        """
+        start = time.monotonic()
+        regions: List[Dict[str, Any]] = []
+        while True:
+            regions = self.busy_regions()
+            if not regions or time.monotonic() - start >= timeout:
+                break
+        return {
+            "idle": not regions,
+            "elapsed_ms": int((time.monotonic() - start) * 1000),
+            "regions": regions
+        }
+
@@ -0,0 +1,94 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from perception.geometry import offset_elements
+
+# perceive_fn(frame, step_id) -> (ocr_elements, vision_elements[, stage_status]), in frame coordinates
+PerceiveFn = Callable[[Any, str], Tuple]
+
+
+class MultiMonitorPerception:
+    """
+    Runs perception on each monitor's Frame concurrently and merges the
+    results into global (virtual screen) coordinates.
+
+    Monitors whose frame reports no dirty tiles since the previous capture
+    (`frame.dirty_rects == []`) are skipped and their previous results reused.
+    A per-stage status returned by `perceive_fn` is reported per monitor as
+    "perception_status".
+
+    OCR and model inference are serialized by the engines' own locks, so
+    monitors only overlap in the remaining work (preprocessing, template
+    matching, coordinate mapping) and in waiting for the locks.
+    """
+    def __init__(self, perceive_fn: PerceiveFn, max_workers: Optional[int] = None):
+        self.perceive_fn = perceive_fn
+        self.max_workers = max_workers
+        self._pool = None
+        self._cache = {}  # monitor_index -> (ocr_elements, vision_elements[, status]) in monitor coordinates
+        self.last_skipped: List[int] = []
+
+    def _perceive_one(self, frame, step_id: str):
+        return self.perceive_fn(frame, f"{step_id}_m{frame.monitor_index}")
+
+    def process(self, frames: List[Any], step_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Returns (ocr_elements, vision_elements, monitors) where elements are in
+        global coordinates and `monitors` describes each monitor's bounds.
+        """
+        todo = []
+        skipped = []
+        for frame in frames:
+            if frame.dirty_rects == [] and frame.monitor_index in self._cache:
+                skipped.append(frame.monitor_index)
+            else:
+                todo.append(frame)
+
+        if len(todo) > 1:
+            if self._pool is None:
+                workers = self.max_workers or len(frames)
+                self._pool = ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="MonitorPerception")
+            futures = [(frame, self._pool.submit(self._perceive_one, frame, step_id)) for frame in todo]
+            results = []
+            for frame, future in futures:
+                try:
+                    results.append((frame, future.result()))
+                except Exception as e:
+                    logging.error(f"Perception failed on monitor {frame.monitor_index}: {e}")
+                    results.append((frame, ([], [])))
+        else:
+            results = []
+            for frame in todo:
+                try:
+                    results.append((frame, self._perceive_one(frame, step_id)))
+                except Exception as e:
+                    logging.error(f"Perception failed on monitor {frame.monitor_index}: {e}")
+                    results.append((frame, ([], [])))
+
+        for frame, result in results:
+            self._cache[frame.monitor_index] = result
+        self.last_skipped = skipped
+        if skipped:
+            logging.debug(f"Reused perception for unchanged monitors {skipped}")
+
+        ocr_all, vis_all, monitors = [], [], []
+        for frame in frames:
+            cached = self._cache.get(frame.monitor_index, ([], []))
+            ocr, vis = cached[0], cached[1]
+            ocr_all.extend(offset_elements(ocr, frame.left, frame.top))
+            vis_all.extend(offset_elements(vis, frame.left, frame.top))
+            monitor = {
+                "index": frame.monitor_index,
+                "bounding_box": {"x": frame.left, "y": frame.top, "width": frame.width, "height": frame.height},
+                "reused": frame.monitor_index in skipped
+            }
+            if len(cached) > 2:
+                monitor["perception_status"] = cached[2]
+            monitors.append(monitor)
+        return ocr_all, vis_all, monitors
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
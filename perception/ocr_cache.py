@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# (x, y, width, height, text, confidence)
+Box = Tuple[int, int, int, int, str, float]
+
+# Rough per-entry bookkeeping cost used for the memory cap
+_ENTRY_OVERHEAD = 200
+_BOX_OVERHEAD = 120
+
+
+class OCRTileCache:
+    """
+    Tile-level OCR result cache.
+
+    The (preprocessed) frame is split into overlapping tiles; each tile's
+    pixels are hashed and looked up in an LRU cache holding the recognized
+    boxes in tile-local coordinates. Only tiles that miss are sent to the
+    recognizer. Results are mapped back to frame coordinates, duplicates from
+    the overlaps are dropped and text cut by a tile edge is stitched back
+    together, so the output matches a full-frame run as closely as the
+    recognizer allows.
+    """
+    def __init__(self, tile_size: int = 640, overlap: int = 96, max_bytes: int = 32 * 1024 * 1024):
+        self.tile_size = max(int(tile_size), 64)
+        self.overlap = min(max(int(overlap), 0), self.tile_size // 2)
+        self.max_bytes = max(int(max_bytes), 0)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # tile hash -> (boxes, size estimate)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # -- tiling -----------------------------------------------------------
+
+    def _starts(self, length: int) -> List[int]:
+        if length <= self.tile_size:
+            return [0]
+        stride = self.tile_size - self.overlap
+        starts = list(range(0, length - self.tile_size, stride))
+        starts.append(length - self.tile_size)  # last tile flush with the edge
+        return starts
+
+    def tiles(self, width: int, height: int) -> List[Tuple[int, int, int, int]]:
+        """Overlapping (x, y, w, h) tiles covering a width x height frame."""
+        return [(x, y, min(self.tile_size, width), min(self.tile_size, height))
+                for y in self._starts(height) for x in self._starts(width)]
+
+    @staticmethod
+    def tile_key(tile: np.ndarray) -> bytes:
+        digest = hashlib.blake2b(np.ascontiguousarray(tile).data, digest_size=16)
+        digest.update(repr(tile.shape).encode())
+        return digest.digest()
+
+    # -- cache ------------------------------------------------------------
+
+    def _get(self, key: bytes) -> Optional[List[Box]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: bytes, boxes: List[Box]):
+        size = _ENTRY_OVERHEAD + sum(_BOX_OVERHEAD + len(b[4]) for b in boxes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (boxes, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    # -- recognition ------------------------------------------------------
+
+    def recognize(self, image: np.ndarray, recognize_fn: Callable[[List[np.ndarray]], List[List[Box]]]) -> List[Box]:
+        """
+        OCR `image` tile by tile. `recognize_fn(tiles)` receives every tile
+        that missed the cache in one call and must return each tile's boxes in
+        tile coordinates; cached tiles skip it entirely.
+        """
+        height, width = image.shape[:2]
+        rects = self.tiles(width, height)
+        tiles = [image[ty:ty + th, tx:tx + tw] for (tx, ty, tw, th) in rects]
+        keys = [self.tile_key(tile) for tile in tiles]
+        found = [self._get(key) for key in keys]
+
+        missing = [i for i, boxes in enumerate(found) if boxes is None]
+        if missing:
+            for i, boxes in zip(missing, recognize_fn([tiles[i] for i in missing])):
+                found[i] = list(boxes)
+                self._put(keys[i], found[i])
+
+        placed = []  # (boxes in frame coordinates, tile rect)
+        for (tx, ty, tw, th), boxes in zip(rects, found):
+            placed.append(([(x + tx, y + ty, w, h, text, conf) for (x, y, w, h, text, conf) in boxes], (tx, ty, tw, th)))
+        if len(placed) == 1:
+            return list(placed[0][0])
+        logging.debug(f"OCR tile cache: {self.stats()}")
+        return merge_tile_boxes(placed, width, height)
+
+
+def _touches_inner_edge(box: Box, tile: Tuple[int, int, int, int], width: int, height: int, margin: int = 2) -> bool:
+    """True if the box reaches a tile edge that is not also the frame edge (i.e. it may be cut)."""
+    x, y, w, h = box[:4]
+    tx, ty, tw, th = tile
+    return ((tx > 0 and x <= tx + margin) or
+            (ty > 0 and y <= ty + margin) or
+            (tx + tw < width and x + w >= tx + tw - margin) or
+            (ty + th < height and y + h >= ty + th - margin))
+
+
+def _intersection(a: Box, b: Box) -> int:
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    return max(ix, 0) * max(iy, 0)
+
+
+def _area(box: Box) -> int:
+    return max(box[2], 1) * max(box[3], 1)
+
+
+def _stitch_text(left: str, right: str) -> str:
+    """Join two fragments of one line, dropping the characters both tiles read."""
+    for n in range(min(len(left), len(right)), 0, -1):
+        if left.endswith(right[:n]):
+            return left + right[n:]
+    return f"{left} {right}"
+
+
+def merge_tile_boxes(placed: List[Tuple[List[Box], Tuple[int, int, int, int]]], width: int, height: int) -> List[Box]:
+    """
+    Combine per-tile boxes (already in frame coordinates): boxes seen whole
+    in several overlapping tiles are kept once, fragments covered by a whole
+    box are dropped and the remaining fragments of one line are stitched.
+    Output is ordered top-to-bottom, left-to-right.
+    """
+    whole, fragments = [], []
+    for boxes, tile in placed:
+        for box in boxes:
+            (fragments if _touches_inner_edge(box, tile, width, height) else whole).append(box)
+
+    kept: List[Box] = []
+    for box in sorted(whole, key=lambda b: -b[5]):
+        if any(_intersection(box, k) > 0.5 * min(_area(box), _area(k)) for k in kept):
+            continue
+        kept.append(box)
+
+    pieces = [f for f in fragments
+              if not any(_intersection(f, k) >= 0.7 * _area(f) for k in kept)]
+    pieces.sort(key=lambda b: (b[1], b[0]))
+    merged: List[Box] = []
+    for piece in pieces:
+        for i, m in enumerate(merged):
+            same_line = min(m[1] + m[3], piece[1] + piece[3]) - max(m[1], piece[1]) >= 0.5 * min(m[3], piece[3])
+            touching = piece[0] <= m[0] + m[2] and m[0] <= piece[0] + piece[2]
+            if same_line and touching:
+                first, second = (m, piece) if m[0] <= piece[0] else (piece, m)
+                if second[0] + second[2] <= first[0] + first[2]:
+                    text = first[4] if len(first[4]) >= len(second[4]) else second[4]
+                else:
+                    text = _stitch_text(first[4], second[4])
+                x1, y1 = min(m[0], piece[0]), min(m[1], piece[1])
+                x2 = max(m[0] + m[2], piece[0] + piece[2])
+                y2 = max(m[1] + m[3], piece[1] + piece[3])
+                merged[i] = (x1, y1, x2 - x1, y2 - y1, text, min(m[5], piece[5]))
+                break
+        else:
+            merged.append(piece)
+
+    result = kept + merged
+    result.sort(key=lambda b: (b[1], b[0]))
+    return result
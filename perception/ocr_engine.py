@@ -1,15 +1,20 @@
 import logging
-import pytesseract
-from PIL import Image
-from typing import List, Dict, Any
+import threading
+import cv2
+import numpy as np
+from typing import List, Dict, Any, Sequence, Tuple
 
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+from lazy_imports import lazy_module, is_available
 
-from perception.image_preprocessor import preprocess_image_for_ocr
+# Imported (together with torch) only when the EasyOCR engine is actually built
+easyocr = lazy_module("easyocr")
+EASYOCR_AVAILABLE = is_available("easyocr")
+
+from perception.image_preprocessor import OCRPreprocessor, to_bgr, to_gray
+from perception.ocr_cache import OCRTileCache
+from perception.tesseract_backend import TesseractBackend
+from perception.incremental_ocr import IncrementalOCR
+from perception.geometry import ResolutionScaler
 
 class OCREngine:
     def __init__(self, config: dict):
@@ -19,8 +24,37 @@ class OCREngine:
         self.use_gpu = self.config.get("gpu_enabled", True)
         self.langs = self.config.get("languages", ["en"])
         self.preprocess = self.config.get("preprocess_image", True)
+        self.preprocessor = OCRPreprocessor.from_config(self.config)
+        # Inference resolution (fixed scale, long-side cap or auto from text height)
+        self.scaler = ResolutionScaler.from_config(self.config)
         
         self.reader = None
+        # Tile-level result cache: only tiles whose pixels changed are re-recognized
+        self.tile_cache = None
+        if self.config.get("tile_cache", False):
+            self.tile_cache = OCRTileCache(
+                tile_size=self.config.get("tile_size", 640),
+                overlap=self.config.get("tile_overlap", 96),
+                max_bytes=int(self.config.get("tile_cache_mb", 32) * 1024 * 1024)
+            )
+        # Batched recognition: crops are padded up to a multiple of bucket_step so
+        # same-bucket crops share one readtext_batched call
+        self.batch_size = max(int(self.config.get("batch_size", 8)), 1)
+        self.bucket_step = max(int(self.config.get("batch_bucket_step", 64)), 8)
+        # Reuse the previous frame's text boxes: detect only in dirty areas,
+        # recognize only boxes whose pixels changed (EasyOCR only)
+        self.incremental = None
+        if self.config.get("incremental", False):
+            self.incremental = IncrementalOCR(
+                self._detect_boxes,
+                self._recognize_boxes,
+                margin=self.config.get("incremental_margin", 8),
+                max_dirty_fraction=self.config.get("incremental_max_dirty_fraction", 0.6)
+            )
+        # Tesseract engines are created lazily, only if Tesseract ends up being used
+        self._tesseract = None
+        # EasyOCR's reader is not safe to call from several threads at once
+        self._reader_lock = threading.Lock()
         
         if self.engine_type == "easyocr" and EASYOCR_AVAILABLE:
             logging.info(f"Initializing EasyOCR (GPU: {self.use_gpu})")
@@ -33,42 +67,235 @@ class OCREngine:
             logging.info("EasyOCR not found. Falling back to Tesseract.")
             self.engine_type = "tesseract"
 
-    def process_image(self, image_path: str, step_id: str) -> List[Dict[str, Any]]:
-        """Run OCR on an image and return structured results."""
+    def process_image(self, image, step_id: str) -> List[Dict[str, Any]]:
+        """
+        Run OCR on an image and return structured results.
+        `image` may be a capture Frame, a numpy array or a file path.
+        """
+        img, scale = self._prepare(image)
+        if self.engine_type == "easyocr" and self.reader:
+            if self.incremental is not None:
+                results = self._run_incremental(image, img, step_id, scale)
+            else:
+                results = self._run_easyocr(img, step_id, scale)
+        else:
+            results = self._run_tesseract(img, step_id, scale)
+        if self.scaler.auto:
+            self.scaler.observe(results)
+        return results
+
+    @staticmethod
+    def _quad_boxes(raw_results) -> list:
+        """EasyOCR results as (x, y, width, height, text, confidence) tuples."""
+        boxes = []
+        for bbox, text, conf in raw_results:
+            # bbox is a list of 4 points: [top-left, top-right, bottom-right, bottom-left]
+            tl, tr, br, bl = bbox
+            
+            # Convert coords to int
+            x = int(min(tl[0], bl[0]))
+            y = int(min(tl[1], tr[1]))
+            w = int(max(tr[0], br[0]) - x)
+            h = int(max(bl[1], br[1]) - y)
+            boxes.append((x, y, w, h, text, float(conf)))
+        return boxes
+
+    def _readtext(self, img) -> list:
+        """EasyOCR on one image as (x, y, width, height, text, confidence) tuples."""
+        # reader.readtext accepts file paths, PIL images, or numpy arrays
+        with self._reader_lock:
+            raw_results = self.reader.readtext(img)
+        return self._quad_boxes(raw_results)
+
+    def _pad_to(self, crop: np.ndarray, height: int, width: int) -> np.ndarray:
+        """Pad right/bottom with the crop's border median so padding adds no edges."""
+        h, w = crop.shape[:2]
+        if (h, w) == (height, width):
+            return crop
+        border = np.concatenate([crop[-1].reshape(-1, *crop.shape[2:]), crop[:, -1].reshape(-1, *crop.shape[2:])])
+        fill = np.median(border, axis=0)
+        fill = [float(v) for v in np.atleast_1d(fill)]
+        return cv2.copyMakeBorder(crop, 0, height - h, 0, width - w, cv2.BORDER_CONSTANT, value=fill)
+
+    def recognize_batch(self, crops: Sequence[np.ndarray]) -> List[list]:
+        """
+        OCR many images at once. Returns, per crop, its (x, y, width, height,
+        text, confidence) boxes in crop coordinates (unfiltered).
+
+        Crops are grouped into size buckets and each bucket goes through
+        EasyOCR's readtext_batched (batched detection, recognition in batches
+        of perception.ocr.batch_size). Tesseract handles crops one by one.
+        """
+        if not crops:
+            return []
+        if self.engine_type != "easyocr" or not self.reader:
+            return [self._tesseract_boxes(crop) for crop in crops]
+        
+        results: List[list] = [[] for _ in crops]
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, crop in enumerate(crops):
+            h, w = crop.shape[:2]
+            if h == 0 or w == 0:
+                continue
+            key = (-(-h // self.bucket_step) * self.bucket_step, -(-w // self.bucket_step) * self.bucket_step)
+            buckets.setdefault(key, []).append(i)
+        
+        for (bh, bw), indices in buckets.items():
+            if len(indices) == 1:
+                results[indices[0]] = self._readtext(crops[indices[0]])
+                continue
+            batch = [self._pad_to(crops[i], bh, bw) for i in indices]
+            with self._reader_lock:
+                raw = self.reader.readtext_batched(batch, batch_size=self.batch_size)
+            for i, raw_results in zip(indices, raw):
+                h, w = crops[i].shape[:2]
+                boxes = []
+                for (x, y, box_w, box_h, text, conf) in self._quad_boxes(raw_results):
+                    # Drop anything found in the padding, clip the rest to the crop
+                    if x >= w or y >= h:
+                        continue
+                    x1, y1 = max(x, 0), max(y, 0)
+                    boxes.append((x1, y1, min(x + box_w, w) - x1, min(y + box_h, h) - y1, text, conf))
+                results[i] = boxes
+        return results
+
+    def _downscale(self, image):
+        """Resize the input to the scaler's inference resolution; returns (image, factor)."""
+        if not self.scaler.active:
+            return image, 1.0
+        array = image.image if hasattr(image, "image") else image
+        if not isinstance(array, np.ndarray):
+            image = array = to_bgr(image)
+        factor = self.scaler.factor_for(array.shape[1], array.shape[0])
+        if factor == 1.0:
+            return image, 1.0
+        # Resize the single channel image when preprocessing starts with grayscale
+        gray_first = self.preprocess and self.preprocessor.stages[:1] == ["grayscale"]
+        source = to_gray(image) if gray_first else to_bgr(image)
+        return self.scaler.resize(source, factor), factor
+
+    def _prepare(self, image) -> Tuple[np.ndarray, float]:
+        """
+        The image EasyOCR sees (resized, preprocessed, or BGR when
+        preprocessing is off/fails) and its scale relative to the input.
+        """
+        image, factor = self._downscale(image)
         if self.preprocess:
             try:
-                # This requires cv2 saving to a temp file or passing numpy array directly
-                # EasyOCR handles numpy arrays
-                img = preprocess_image_for_ocr(image_path)
+                # EasyOCR handles numpy arrays directly, no temp file needed
+                img, timings = self.preprocessor.run(image)
+                logging.debug(f"OCR preprocessing timings (ms): {timings}")
+                return img, factor * self.preprocessor.scale
             except Exception as e:
                 logging.warning(f"Preprocessing failed ({e}), using raw image.")
-                img = image_path
-        else:
-             img = image_path
+        return to_bgr(image), factor
+
+    @staticmethod
+    def _unscale(box: tuple, scale: float) -> tuple:
+        """Map a box from the (resized) OCR image back to input coordinates."""
+        if scale == 1.0:
+            return box
+        x, y, w, h, text, conf = box
+        return (int(round(x / scale)), int(round(y / scale)), int(round(w / scale)), int(round(h / scale)), text, conf)
 
+    def process_regions(self, image, regions: Sequence[Tuple[int, int, int, int]], step_id: str) -> List[Dict[str, Any]]:
+        """
+        OCR several (x, y, width, height) regions of one image in batches.
+        Boxes are returned in image coordinates, tagged with the index of the
+        region they came from.
+        """
+        scale = 1.0
         if self.engine_type == "easyocr" and self.reader:
-            return self._run_easyocr(img, step_id)
+            img, scale = self._prepare(image)
         else:
-            return self._run_tesseract(image_path, step_id)
+            img = to_gray(image)
+        crops = [img[int(y * scale):int((y + h) * scale), int(x * scale):int((x + w) * scale)] for (x, y, w, h) in regions]
+        results = []
+        try:
+            per_crop = self.recognize_batch(crops)
+        except Exception as e:
+            logging.error(f"Batched OCR error: {e}")
+            return results
+        prefix = "ocr" if self.engine_type == "easyocr" and self.reader else "tess"
+        idx = 0
+        for region_index, ((rx, ry, _, _), boxes) in enumerate(zip(regions, per_crop)):
+            for box in boxes:
+                x, y, w, h, text, conf = self._unscale(box, scale)
+                if conf < self.confidence_threshold:
+                    continue
+                results.append({
+                    "id": f"{prefix}_{step_id}_{idx}",
+                    "text": text,
+                    "confidence": float(conf),
+                    "confidence_level": "reliable" if conf >= 0.8 else "uncertain",
+                    "bounding_box": {"x": rx + x, "y": ry + y, "width": w, "height": h},
+                    "region_index": region_index
+                })
+                idx += 1
+        return results
+
+    def _detect_boxes(self, img) -> list:
+        """EasyOCR text detection (CRAFT) only, as (x, y, width, height) boxes."""
+        with self._reader_lock:
+            horizontal, free = self.reader.detect(img)
+        boxes = [(int(x1), int(y1), int(x2 - x1), int(y2 - y1)) for x1, x2, y1, y2 in horizontal[0]]
+        for poly in free[0]:
+            xs, ys = [p[0] for p in poly], [p[1] for p in poly]
+            boxes.append((int(min(xs)), int(min(ys)), int(max(xs) - min(xs)), int(max(ys) - min(ys))))
+        return [b for b in boxes if b[2] > 0 and b[3] > 0]
 
-    def _run_easyocr(self, img, step_id: str) -> List[Dict[str, Any]]:
+    def _recognize_boxes(self, img, boxes: list) -> list:
+        """EasyOCR recognition of given boxes; one (text, confidence) per box, (None, 0) if dropped."""
+        gray = to_gray(img)
+        horizontal = [[max(x, 0), x + w, max(y, 0), y + h] for (x, y, w, h) in boxes]
+        with self._reader_lock:
+            raw_results = self.reader.recognize(gray, horizontal_list=horizontal, free_list=[], batch_size=self.batch_size)
+        # EasyOCR reorders results; match them back by their top-left corner
+        found = {}
+        for bbox, text, conf in raw_results:
+            found[(int(bbox[0][0]), int(bbox[0][1]))] = (text, float(conf))
+        return [found.get((h[0], h[2]), (None, 0.0)) for h in horizontal]
+
+    def _run_incremental(self, source, img, step_id: str, scale: float) -> List[Dict[str, Any]]:
         results = []
         try:
-            # reader.readtext accepts file paths, PIL images, or numpy arrays
-            raw_results = self.reader.readtext(img)
+            entries = self.incremental.process(
+                img, step_id,
+                key=getattr(source, "monitor_index", None),
+                token=getattr(source, "monotonic", None),
+                base_token=getattr(source, "dirty_base", None),
+                dirty_rects=getattr(source, "dirty_rects", None),
+                scale=scale
+            )
+            for entry in entries:
+                x, y, w, h, text, conf = self._unscale(entry["box"] + (entry["text"], entry["confidence"]), scale)
+                if conf < self.confidence_threshold:
+                    continue
+                results.append({
+                    "id": entry["id"],
+                    "text": text,
+                    "confidence": float(conf),
+                    "confidence_level": "reliable" if conf >= 0.8 else "uncertain",
+                    "bounding_box": {"x": x, "y": y, "width": w, "height": h}
+                })
+        except Exception as e:
+            logging.error(f"Incremental OCR error: {e}")
+            self.incremental.reset()
+        return results
+
+    def _run_easyocr(self, img, step_id: str, scale: float = 1.0) -> List[Dict[str, Any]]:
+        results = []
+        try:
+            if self.tile_cache is not None:
+                # Tiles that miss the cache are recognized in one batch
+                boxes = self.tile_cache.recognize(img, self.recognize_batch)
+            else:
+                boxes = self._readtext(img)
             
-            for idx, (bbox, text, conf) in enumerate(raw_results):
-                # bbox is a list of 4 points: [top-left, top-right, bottom-right, bottom-left]
+            for idx, box in enumerate(boxes):
+                x, y, w, h, text, conf = self._unscale(box, scale)
                 if conf < self.confidence_threshold:
                     continue
-                    
-                tl, tr, br, bl = bbox
-                
-                # Convert coords to int
-                x = int(min(tl[0], bl[0]))
-                y = int(min(tl[1], tr[1]))
-                w = int(max(tr[0], br[0]) - x)
-                h = int(max(bl[1], br[1]) - y)
                 
                 confidence_level = "reliable" if conf >= 0.8 else "uncertain"
                 
@@ -84,24 +311,30 @@ class OCREngine:
             
         return results
 
-    def _run_tesseract(self, image_path: str, step_id: str) -> List[Dict[str, Any]]:
+    @property
+    def tesseract(self) -> TesseractBackend:
+        if self._tesseract is None:
+            self._tesseract = TesseractBackend(
+                lang=self.config.get("tesseract_lang", "eng"),
+                psm=self.config.get("tesseract_psm", 3),
+                workers=self.config.get("tesseract_workers", 0),
+                band_height=self.config.get("tesseract_band_height", 360),
+                band_overlap=self.config.get("tesseract_band_overlap", 48)
+            )
+        return self._tesseract
+
+    def _tesseract_boxes(self, image) -> list:
+        """Tesseract word boxes as (x, y, width, height, text, confidence) tuples."""
+        return self.tesseract.recognize(to_gray(image))
+
+    def _run_tesseract(self, image, step_id: str, scale: float = 1.0) -> List[Dict[str, Any]]:
         """Fallback OCR using Tesseract"""
         results = []
         try:
-            img = Image.open(image_path)
-            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-            
-            for i in range(len(data['text'])):
-                text = data['text'][i].strip()
-                conf = int(data['conf'][i]) / 100.0  # Tesseract gives conf 0-100
-                
-                if not text or conf < self.confidence_threshold:
+            for i, box in enumerate(self._tesseract_boxes(image)):
+                x, y, w, h, text, conf = self._unscale(box, scale)
+                if conf < self.confidence_threshold:
                     continue
-                    
-                x = data['left'][i]
-                y = data['top'][i]
-                w = data['width'][i]
-                h = data['height'][i]
                 
                 confidence_level = "reliable" if conf >= 0.8 else "uncertain"
                 
@@ -116,3 +349,18 @@ class OCREngine:
             logging.error(f"Tesseract error: {e}. Is tesseract installed on the system?")
             
         return results
+
+    def warm_up(self):
+        """One dummy recognition so the first real frame does not pay for lazy initialization."""
+        dummy = np.full((64, 320, 3), 255, dtype=np.uint8)
+        cv2.putText(dummy, "Warm up", (8, 44), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        img, _ = self._prepare(dummy)
+        if self.engine_type == "easyocr" and self.reader:
+            self._readtext(img)
+        else:
+            self.tesseract.recognize(to_gray(img))
+
+    def close(self):
+        """Release OCR engine resources (Tesseract engine instances)."""
+        if self._tesseract is not None:
+            self._tesseract.close()
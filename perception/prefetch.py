@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# perceive_fn(cap_data, step_id) -> awaitable perception result
+PerceiveFn = Callable[[dict, str], Awaitable[Any]]
+# is_current_fn(frame, max_age_ms) -> True if the frame still matches the screen (blocking)
+IsCurrentFn = Callable[[Any, float], bool]
+
+
+def retag_elements(elements: List[Dict[str, Any]], old_step_id: str, new_step_id: str) -> List[Dict[str, Any]]:
+    """Copies of `elements` whose ids name `new_step_id` instead of `old_step_id` (e.g. "ocr_s1_post_3" -> "ocr_s2_3")."""
+    old, new = f"_{old_step_id}_", f"_{new_step_id}_"
+    retagged = []
+    for e in elements:
+        if isinstance(e, dict) and old in str(e.get("id", "")):
+            e = dict(e, id=e["id"].replace(old, new, 1))
+        retagged.append(e)
+    return retagged
+
+
+class PerceptionPrefetch:
+    """
+    Perceives a validated post-action frame in the background so the next
+    step can reuse both the frame and its perception.
+
+    Perception starts right after the post-capture; whether the frame is
+    still on screen is checked once, when the next step takes it
+    (`is_current_fn` compares against the continuous-capture mailbox frame
+    when there is one). Perception runs in worker threads that cancelling
+    the asyncio task does not stop; they would keep holding the OCR/model
+    locks and the scheduler slots. A stale prefetch is therefore never
+    cancelled but waited for (drained) before fresh perception starts.
+
+    `perceive_fn` returns a tuple; element lists in it are retagged with the
+    consuming step's id when taken.
+    """
+    def __init__(self, perceive_fn: PerceiveFn, is_current_fn: IsCurrentFn, max_age_ms: float):
+        self.perceive_fn = perceive_fn
+        self.is_current_fn = is_current_fn
+        self.max_age_ms = float(max_age_ms)
+        self._cap_data: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._step_id: Optional[str] = None
+
+    async def _is_current(self, cap_data: dict) -> bool:
+        return await asyncio.to_thread(self.is_current_fn, cap_data["frame"], self.max_age_ms)
+
+    async def start(self, cap_data: Optional[dict], step_id: str) -> bool:
+        """Start perceiving `cap_data` as `step_id` if prefetching is enabled."""
+        await self.drain()
+        if self.max_age_ms <= 0 or not cap_data or cap_data.get("frame") is None:
+            return False
+        self._cap_data = cap_data
+        self._step_id = step_id
+        self._task = asyncio.create_task(self.perceive_fn(cap_data, step_id))
+        return True
+
+    async def _retagged(self, task: asyncio.Task, old_step_id: str, new_step_id: str):
+        result = await task
+        return tuple(retag_elements(v, old_step_id, new_step_id) if isinstance(v, list) else v for v in result)
+
+    async def take(self, step_id: str) -> Tuple[Optional[dict], Optional[asyncio.Task]]:
+        """
+        (cap_data, perception task) of the prefetched frame if it is still
+        current, with element ids retagged for `step_id`; else (None, None)
+        once the unused perception has finished.
+        """
+        if self._task is None:
+            return None, None
+        if await self._is_current(self._cap_data):
+            cap_data, task = self._cap_data, asyncio.create_task(self._retagged(self._task, self._step_id, step_id))
+            self._cap_data = self._task = None
+            return cap_data, task
+        await self.drain()
+        return None, None
+
+    async def drain(self):
+        """Wait for a prefetch that will not be used so its worker threads release the models."""
+        task = self._task
+        self._cap_data = self._task = None
+        if task is None:
+            return
+        try:
+            await task
+        except Exception as e:
+            logging.debug(f"Unused perception prefetch failed: {e}")
@@ -0,0 +1,136 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# stage_fn(frame, step_id) -> list of elements
+StageFn = Callable[[Any, str], List[Dict[str, Any]]]
+
+# Stage outcomes, best to worst
+STATUS_OK = "ok"          # finished on this frame within its deadline
+STATUS_STALE = "stale"    # missed the deadline (or still busy); result of an earlier frame
+STATUS_TIMEOUT = "timeout"  # missed the deadline and nothing usable was cached
+STATUS_ERROR = "error"    # raised on this frame
+_SEVERITY = {STATUS_OK: 0, STATUS_STALE: 1, STATUS_TIMEOUT: 2, STATUS_ERROR: 3}
+
+
+def is_partial(status: Optional[Dict[str, str]]) -> bool:
+    return any(s != STATUS_OK for s in (status or {}).values())
+
+
+def merge_status(statuses: List[Optional[Dict[str, str]]]) -> Dict[str, str]:
+    """Worst outcome per stage across several runs (e.g. one per monitor)."""
+    merged: Dict[str, str] = {}
+    for status in statuses:
+        for stage, value in (status or {}).items():
+            if _SEVERITY.get(value, 0) >= _SEVERITY.get(merged.get(stage, STATUS_OK), 0):
+                merged[stage] = value
+    return merged
+
+
+class PerceptionScheduler:
+    """
+    Runs independent perception stages (OCR, YOLO, template matching) on the
+    same frame concurrently, each on its own bounded executor.
+
+    `run()` waits for each stage only until that stage's deadline. A stage
+    that misses it keeps running in the background and stores its result in
+    a per-stage cache when it finishes; until then the previous cached result
+    (if younger than `max_stale_ms`) is returned in its place and marked
+    stale. A stage that is still busy with an earlier frame is not queued
+    again, so a slow stage never builds up a backlog; `run()` waits for that
+    earlier run instead (up to the same deadline) and returns its result as
+    stale.
+    """
+    def __init__(self,
+                 stages: Dict[str, StageFn],
+                 deadlines_ms: Optional[Dict[str, float]] = None,
+                 default_deadline_ms: float = 2000,
+                 max_stale_ms: float = 5000,
+                 workers_per_stage: int = 1):
+        self.stages = dict(stages)
+        self.deadlines = {name: float((deadlines_ms or {}).get(name, default_deadline_ms)) / 1000.0
+                          for name in self.stages}
+        self.max_stale = float(max_stale_ms) / 1000.0
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=max(int(workers_per_stage), 1), thread_name_prefix=f"Perception-{name}")
+            for name in self.stages
+        }
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, Hashable], Any] = {}  # (stage, key) -> Future
+        self._cache: Dict[Tuple[str, Hashable], Tuple[float, list]] = {}  # (stage, key) -> (finished at, result)
+
+    def _finished(self, slot, future):
+        with self._lock:
+            if self._inflight.get(slot) is future:
+                del self._inflight[slot]
+        try:
+            result = future.result()
+        except Exception as e:
+            logging.error(f"Perception stage '{slot[0]}' failed: {e}")
+            return
+        with self._lock:
+            self._cache[slot] = (time.monotonic(), result)
+
+    def _cached(self, slot) -> Optional[list]:
+        with self._lock:
+            entry = self._cache.get(slot)
+        if entry is None or time.monotonic() - entry[0] > self.max_stale:
+            return None
+        return entry[1]
+
+    def run(self, frame, step_id: str, key: Hashable = None) -> Tuple[Dict[str, list], Dict[str, str]]:
+        """
+        Run every stage on `frame`. Returns ({stage: elements}, {stage: status}).
+        `key` separates caches of independent sources (e.g. monitors).
+        """
+        start = time.monotonic()
+        submitted = {}
+        earlier = {}  # stages still busy with an earlier frame -> that run's future
+        busy = []
+        with self._lock:
+            for name, fn in self.stages.items():
+                slot = (name, key)
+                if slot in self._inflight:
+                    earlier[name] = self._inflight[slot]
+                    continue
+                future = self._executors[name].submit(fn, frame, step_id)
+                self._inflight[slot] = future
+                submitted[name] = future
+        for name, future in submitted.items():
+            future.add_done_callback(lambda f, slot=(name, key): self._finished(slot, f))
+
+        results: Dict[str, list] = {}
+        status: Dict[str, str] = {}
+        for name, future in submitted.items():
+            remaining = self.deadlines[name] - (time.monotonic() - start)
+            try:
+                results[name] = future.result(timeout=max(remaining, 0.0))
+                status[name] = STATUS_OK
+            except FutureTimeout:
+                busy.append(name)
+            except Exception:
+                results[name] = []
+                status[name] = STATUS_ERROR
+
+        for name, future in earlier.items():
+            remaining = self.deadlines[name] - (time.monotonic() - start)
+            try:
+                results[name] = future.result(timeout=max(remaining, 0.0))
+                status[name] = STATUS_STALE
+            except Exception:  # still running, failed or cancelled
+                busy.append(name)
+
+        for name in busy:
+            cached = self._cached((name, key))
+            results[name] = cached if cached is not None else []
+            status[name] = STATUS_STALE if cached is not None else STATUS_TIMEOUT
+
+        if is_partial(status):
+            logging.info(f"Partial perception for {step_id}: {status}")
+        return results, status
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
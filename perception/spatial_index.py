@@ -0,0 +1,90 @@
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class GridIndex:
+    """
+    Uniform grid over 2D points. Points are bucketed by cell, so rectangle
+    and radius queries only look at the few cells they overlap and the cost
+    of matching N queries against M points stays close to O(N + M) for
+    screen-like (roughly uniform) layouts.
+    """
+    def __init__(self, points: Sequence[Tuple[float, float]], cell_size: float = 50.0):
+        self.cell_size = float(max(cell_size, 1.0))
+        self.points = list(points)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x, y) in enumerate(self.points):
+            self._cells.setdefault(self._cell(x, y), []).append(i)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _in_cells(self, x1: float, y1: float, x2: float, y2: float) -> Iterator[int]:
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            # Query larger than the populated grid: walk the occupied cells instead
+            for (cx, cy), indices in self._cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    yield from indices
+            return
+        for cy in range(cy1, cy2 + 1):
+            for cx in range(cx1, cx2 + 1):
+                yield from self._cells.get((cx, cy), ())
+
+    def query_rect(self, x1: float, y1: float, x2: float, y2: float) -> List[int]:
+        """Indices of points inside the closed rectangle, in insertion order."""
+        return sorted(i for i in self._in_cells(x1, y1, x2, y2)
+                      if x1 <= self.points[i][0] <= x2 and y1 <= self.points[i][1] <= y2)
+
+    def nearest(self, x: float, y: float, max_distance: float, candidates: Optional[List[int]] = None) -> Optional[int]:
+        """
+        Index of the point closest to (x, y) and strictly within
+        `max_distance` (ties go to the earlier point), or None. With
+        `candidates`, only those indices are considered.
+        """
+        if candidates is None:
+            candidates = self._in_cells(x - max_distance, y - max_distance, x + max_distance, y + max_distance)
+        best, best_d2 = None, max_distance * max_distance
+        for i in candidates:
+            px, py = self.points[i]
+            d2 = (px - x) ** 2 + (py - y) ** 2
+            if d2 < best_d2 or (d2 == best_d2 and best is not None and i < best):
+                best, best_d2 = i, d2
+        return best
+
+
+def _box_center(element: Dict[str, Any]) -> Tuple[float, float]:
+    bbox = element.get("bounding_box", {})
+    return (bbox.get("x", 0) + bbox.get("width", 0) // 2, bbox.get("y", 0) + bbox.get("height", 0) // 2)
+
+
+def assign_ocr_labels(vision_elements: List[Dict[str, Any]],
+                      ocr_elements: List[Dict[str, Any]],
+                      max_distance: float = 50.0) -> List[Dict[str, Any]]:
+    """
+    Label vision elements with OCR text. An OCR box whose center lies inside
+    the element's bounding box wins (the one closest to the element's
+    center); otherwise the nearest OCR center within `max_distance` of the
+    element's center is used. Labelled elements are returned as copies; the
+    inputs are not modified.
+    """
+    if not vision_elements or not ocr_elements:
+        return list(vision_elements)
+    index = GridIndex([_box_center(o) for o in ocr_elements], cell_size=max_distance)
+
+    labelled = []
+    for v in vision_elements:
+        center = v.get("center", {})
+        vx, vy = center.get("x", 0), center.get("y", 0)
+        bbox = v.get("bounding_box")
+        match = None
+        if bbox:
+            inside = index.query_rect(bbox.get("x", 0), bbox.get("y", 0),
+                                      bbox.get("x", 0) + bbox.get("width", 0), bbox.get("y", 0) + bbox.get("height", 0))
+            if inside:
+                match = index.nearest(vx, vy, math.inf, candidates=inside)
+        if match is None:
+            match = index.nearest(vx, vy, max_distance)
+        labelled.append(dict(v, label=ocr_elements[match]["text"]) if match is not None else v)
+    return labelled
@@ -1,5 +1,9 @@
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from perception.scheduler import is_partial
+from perception.spatial_index import assign_ocr_labels
+from perception.element_table import ElementTable, ScreenState, StringTable
 
 class StateBuilder:
     """Builds the unified ScreenState JSON object from OCR and Vision detections."""
@@ -13,34 +17,32 @@ class StateBuilder:
         screens_dims: tuple,
         screen_hash: str,
         ocr_elements: List[Dict[str, Any]],
-        vision_elements: List[Dict[str, Any]]
+        vision_elements: List[Dict[str, Any]],
+        monitors: Optional[List[Dict[str, Any]]] = None,
+        active_window: Optional[Dict[str, Any]] = None,
+        perception_status: Optional[Dict[str, str]] = None,
+        motion_regions: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         
-        # Determine if loading indicators or error dialogues are present
-        # This is a naive check; ideally the vision model distinguishes these classes specifically.
-        loading_detected = any(v.get("class") in ["spinner", "progress_bar"] for v in vision_elements)
+        # Loading indicators: spinner / progress bar classes from a UI-trained
+        # vision model, or small regions the MotionDetector saw animating
+        loading_regions = [
+            {"source": "vision", "class": v.get("class"), "bounding_box": dict(v.get("bounding_box") or {})}
+            for v in vision_elements if v.get("class") in ["spinner", "progress_bar"]
+        ]
+        loading_regions += [
+            {"source": "motion", "activity": m.get("activity"), "bounding_box": dict(m["bounding_box"])}
+            for m in motion_regions or []
+        ]
+        loading_detected = bool(loading_regions)
         error_detected = any("error" in o.get("text", "").lower() for o in ocr_elements)
         
-        # Enrich vision elements with nearby OCR text where applicable
-        # (Naive: if the centers are close, assign the OCR text as the label)
-        for v in vision_elements:
-             v_center = v.get("center", {})
-             vx, vy = v_center.get("x", 0), v_center.get("y", 0)
-             
-             for o in ocr_elements:
-                  o_bbox = o.get("bounding_box", {})
-                  ox = o_bbox.get("x", 0) + o_bbox.get("width", 0) // 2
-                  oy = o_bbox.get("y", 0) + o_bbox.get("height", 0) // 2
-                  
-                  # Distance check (naive heuristic: within 50 pixels)
-                  dist = ((vx - ox) ** 2 + (vy - oy) ** 2) ** 0.5
-                  
-                  if dist < 50:
-                       # Assign OCR text to the visual element label
-                       v["label"] = o["text"]
-                       break
+        # Enrich vision elements with the OCR text they contain (or the nearest within 50 px)
+        vision_elements = assign_ocr_labels(vision_elements, ocr_elements, max_distance=50)
 
-        state = {
+        # Columnar element storage; OCR text reused as vision labels is interned once
+        strings = StringTable()
+        state = ScreenState({
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "session_id": session_id,
             "step_id": step_id,
@@ -51,17 +53,25 @@ class StateBuilder:
                 "height": screens_dims[1]
             },
             "screen_hash": screen_hash,
-            "ocr_elements": ocr_elements,
-            "vision_elements": vision_elements,
-            # Active Window would require pywin32 or similar OS-level package, 
-            # omitted for pure vision approach or mocked for now.
+            "ocr_elements": ElementTable(ocr_elements, strings),
+            "vision_elements": ElementTable(vision_elements, strings),
             "active_window": {
+                "title": active_window.get("title", "Unknown"),
+                "process": active_window.get("process", "unknown"),
+                "bounding_box": dict(active_window["bounding_box"])
+            } if active_window else {
+                # No window information (ROI capture off or unsupported platform)
                 "title": "Unknown",
                 "process": "unknown",
                 "bounding_box": {"x": 0, "y": 0, "width": screens_dims[0], "height": screens_dims[1]}
             },
+            "monitors": monitors or [],
+            # Set when a perception stage missed its deadline and an older (or no) result was used
+            "perception_partial": is_partial(perception_status),
+            "perception_status": dict(perception_status or {}),
             "loading_indicators_detected": loading_detected,
+            "loading_regions": loading_regions,
             "error_dialogs_detected": error_detected
-        }
+        })
         
         return state
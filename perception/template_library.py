@@ -0,0 +1,163 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from perception.detection_backends import nms
+
+# (x, y, width, height, score, name)
+Match = Tuple[int, int, int, int, float, str]
+
+TEMPLATE_EXTENSIONS = ('.png', '.jpg')
+
+
+class _Template:
+    __slots__ = ("name", "scaled")
+
+    def __init__(self, name: str, scaled: List[Tuple[float, np.ndarray]]):
+        self.name = name
+        self.scaled = scaled  # (scale, grayscale template resized to that scale)
+
+
+class TemplateLibrary:
+    """
+    Template matching against a directory of UI element images.
+
+    Templates are read, converted to grayscale and resized to every match
+    scale once; the directory is re-read only when its contents change
+    (checked at most every `check_interval` seconds). Each (template, scale)
+    pair is matched on a thread pool (cv2.matchTemplate releases the GIL).
+    Instead of every pixel above the threshold, only local maxima of the
+    score map are kept and overlapping hits of one template across scales are
+    reduced with non-maximum suppression.
+    """
+    def __init__(self,
+                 template_dir: str,
+                 threshold: float = 0.5,
+                 scales: Sequence[float] = (1.0,),
+                 nms_threshold: float = 0.3,
+                 max_matches: int = 20,
+                 workers: int = 0,
+                 check_interval: float = 1.0):
+        self.template_dir = template_dir
+        self.threshold = float(threshold)
+        self.scales = sorted({float(s) for s in scales if float(s) > 0}) or [1.0]
+        self.nms_threshold = float(nms_threshold)
+        self.max_matches = max(int(max_matches), 1)
+        self.workers = int(workers) or min(os.cpu_count() or 1, 4)
+        self.check_interval = float(check_interval)
+
+        self._templates: List[_Template] = []
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    # -- loading ----------------------------------------------------------
+
+    def _dir_signature(self):
+        """Names, sizes and mtimes of the template files; changes when any file is added, removed or edited."""
+        try:
+            entries = [e for e in os.scandir(self.template_dir)
+                       if e.is_file() and e.name.lower().endswith(TEMPLATE_EXTENSIONS)]
+        except OSError:
+            return None
+        return tuple(sorted((e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries))
+
+    def _load(self, signature) -> List[_Template]:
+        templates = []
+        for file_name, _, _ in signature or ():
+            template = cv2.imread(os.path.join(self.template_dir, file_name), cv2.IMREAD_GRAYSCALE)
+            if template is None:
+                logging.warning(f"Could not read template {file_name}")
+                continue
+            scaled = []
+            for scale in self.scales:
+                if scale == 1.0:
+                    resized = template
+                else:
+                    size = (max(int(round(template.shape[1] * scale)), 1), max(int(round(template.shape[0] * scale)), 1))
+                    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+                    resized = cv2.resize(template, size, interpolation=interpolation)
+                scaled.append((scale, np.ascontiguousarray(resized)))
+            templates.append(_Template(os.path.splitext(file_name)[0], scaled))
+        logging.info(f"Template library: loaded {len(templates)} templates from {self.template_dir}")
+        return templates
+
+    def refresh(self, force: bool = False) -> List[_Template]:
+        """Reload the templates if the directory changed since the last check."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval:
+                return self._templates
+            self._checked_at = now
+            signature = self._dir_signature()
+            if force or signature != self._signature:
+                self._templates = self._load(signature)
+                self._signature = signature
+            return self._templates
+
+    def __len__(self) -> int:
+        return len(self.refresh())
+
+    # -- matching ---------------------------------------------------------
+
+    def _peaks(self, scores: np.ndarray, w: int, h: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Local maxima of a score map above the threshold, strongest first."""
+        kernel = np.ones((max(h // 2, 1) | 1, max(w // 2, 1) | 1), dtype=np.uint8)
+        local_max = cv2.dilate(scores, kernel)
+        ys, xs = np.nonzero((scores >= self.threshold) & (scores >= local_max))
+        values = scores[ys, xs]
+        order = np.argsort(-values)[:self.max_matches]
+        return xs[order], ys[order], values[order]
+
+    def _match_one(self, gray: np.ndarray, template: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+        h, w = template.shape[:2]
+        if h > gray.shape[0] or w > gray.shape[1]:
+            return []
+        scores = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+        # Flat templates/regions give NaN/inf scores
+        np.nan_to_num(scores, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        xs, ys, values = self._peaks(scores, w, h)
+        return [(int(x), int(y), w, h, float(v)) for x, y, v in zip(xs, ys, values)]
+
+    def match(self, gray: np.ndarray) -> List[Match]:
+        """Matches of every template in a grayscale image, ordered by score."""
+        templates = self.refresh()
+        if not templates:
+            return []
+        gray = np.ascontiguousarray(gray)
+        jobs = [(t.name, tmpl) for t in templates for _, tmpl in t.scaled]
+        if len(jobs) > 1 and self.workers > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="TemplateMatch")
+            hits = list(self._pool.map(lambda job: self._match_one(gray, job[1]), jobs))
+        else:
+            hits = [self._match_one(gray, tmpl) for _, tmpl in jobs]
+
+        by_name: Dict[str, list] = {}
+        for (name, _), found in zip(jobs, hits):
+            by_name.setdefault(name, []).extend(found)
+
+        matches: List[Match] = []
+        for name, found in by_name.items():
+            if not found:
+                continue
+            arr = np.asarray([f[:4] for f in found], dtype=np.float32)
+            boxes = np.column_stack([arr[:, 0], arr[:, 1], arr[:, 0] + arr[:, 2], arr[:, 1] + arr[:, 3]])
+            scores = np.asarray([f[4] for f in found], dtype=np.float32)
+            for i in nms(boxes, scores, self.nms_threshold)[:self.max_matches]:
+                x, y, w, h, score = found[i]
+                matches.append((x, y, w, h, score, name))
+        matches.sort(key=lambda m: -m[4])
+        return matches
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
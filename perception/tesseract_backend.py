@@ -0,0 +1,155 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+import pytesseract
+from PIL import Image
+
+# (x, y, width, height, text, confidence)
+Box = Tuple[int, int, int, int, str, float]
+
+
+class TesseractBackend:
+    """
+    Tesseract OCR on in-memory grayscale arrays.
+
+    With tesserocr installed each of the `workers` pool threads keeps its
+    own long-lived PyTessBaseAPI (the C API, no process spawn or temp files
+    per call, and the GIL is released while recognizing), and the screen is
+    split into overlapping horizontal bands recognized in parallel. All
+    recognition runs on the pool, so at most `workers` engines exist.
+
+    Without tesserocr, pytesseract starts a tesseract process per call, so
+    the whole image goes through a single call instead of one per band.
+    """
+    def __init__(self,
+                 lang: str = "eng",
+                 psm: int = 3,
+                 workers: int = 0,
+                 band_height: int = 360,
+                 band_overlap: int = 48):
+        self.lang = lang
+        self.psm = int(psm)
+        self.workers = int(workers) or min(os.cpu_count() or 1, 4)
+        self.band_height = max(int(band_height), 64)
+        self.band_overlap = min(max(int(band_overlap), 0), self.band_height // 2)
+        self.use_capi = TESSEROCR_AVAILABLE
+
+        self._local = threading.local()
+        self._apis = []
+        self._apis_lock = threading.Lock()
+        self._pool = None
+
+        if self.use_capi:
+            logging.info(f"Tesseract: using tesserocr C API with up to {self.workers} engine instances")
+        else:
+            logging.info("Tesseract: tesserocr not installed, using pytesseract (one process per call, no banding)")
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.lang, psm=self.psm)
+            self._local.api = api
+            with self._apis_lock:
+                self._apis.append(api)
+        return api
+
+    def bands(self, height: int) -> List[Tuple[int, int, int, int]]:
+        """
+        (start, end, core_start, core_end) rows per band. A word belongs to
+        the band whose core holds its vertical center, so words inside an
+        overlap are reported exactly once.
+        """
+        if height <= self.band_height or self.workers <= 1 or not self.use_capi:
+            return [(0, height, 0, height)]
+        stride = self.band_height - self.band_overlap
+        starts = list(range(0, height - self.band_height, stride)) + [height - self.band_height]
+        bands = []
+        for i, start in enumerate(starts):
+            end = start + self.band_height
+            core_start = 0 if i == 0 else bands[-1][3]
+            core_end = height if i == len(starts) - 1 else (starts[i + 1] + end) // 2
+            bands.append((start, end, core_start, core_end))
+        return bands
+
+    def _recognize_capi(self, gray: np.ndarray) -> List[Box]:
+        api = self._api()
+        gray = np.ascontiguousarray(gray)
+        h, w = gray.shape[:2]
+        api.SetImageBytes(gray.tobytes(), w, h, 1, w)
+        api.Recognize()
+        boxes = []
+        level = tesserocr.RIL.WORD
+        iterator = api.GetIterator()
+        if iterator is None:
+            return boxes
+        for word in tesserocr.iterate_level(iterator, level):
+            text = (word.GetUTF8Text(level) or "").strip()
+            if not text:
+                continue
+            box = word.BoundingBox(level)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            boxes.append((x1, y1, x2 - x1, y2 - y1, text, word.Confidence(level) / 100.0))
+        return boxes
+
+    def _recognize_pytesseract(self, gray: np.ndarray) -> List[Box]:
+        config = f"--psm {self.psm}"
+        data = pytesseract.image_to_data(Image.fromarray(gray), lang=self.lang, config=config,
+                                         output_type=pytesseract.Output.DICT)
+        boxes = []
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip()
+            if not text:
+                continue
+            conf = float(data['conf'][i]) / 100.0  # Tesseract gives conf 0-100
+            boxes.append((data['left'][i], data['top'][i], data['width'][i], data['height'][i], text, conf))
+        return boxes
+
+    def _recognize_band(self, gray: np.ndarray, band: Tuple[int, int, int, int]) -> List[Box]:
+        start, end, core_start, core_end = band
+        recognize = self._recognize_capi if self.use_capi else self._recognize_pytesseract
+        words = []
+        for (x, y, w, h, text, conf) in recognize(gray[start:end]):
+            center = start + y + h // 2
+            if core_start <= center < core_end:
+                words.append((x, start + y, w, h, text, conf))
+        return words
+
+    def recognize(self, gray: np.ndarray) -> List[Box]:
+        """Word boxes for a grayscale array, in array coordinates, top-to-bottom."""
+        bands = self.bands(gray.shape[0])
+        if not self.use_capi:
+            return self._recognize_band(gray, bands[0])
+        # Engines live in pool threads only, whichever thread called us
+        if self._pool is None:
+            with self._apis_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="TesseractWorker")
+        words = []
+        for band_words in self._pool.map(lambda band: self._recognize_band(gray, band), bands):
+            words.extend(band_words)
+        return words
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._apis_lock:
+            for api in self._apis:
+                try:
+                    api.End()
+                except Exception:
+                    pass
+            self._apis.clear()
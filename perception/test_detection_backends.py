@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from perception.detection_backends import letterbox, nms, postprocess, ensure_onnx, onnx_export_path
+
+class TestDetectionPostprocessing(unittest.TestCase):
+    def test_letterbox_keeps_aspect_ratio(self):
+        tensor, ratio, pad = letterbox(np.zeros((540, 960, 3), dtype=np.uint8), 640)
+        self.assertEqual(tensor.shape, (1, 3, 640, 640))
+        self.assertAlmostEqual(ratio, 640 / 960)
+        self.assertEqual(pad, (0, 140))
+
+    def test_nms_suppresses_overlaps_only(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60]], dtype=np.float32)
+        keep = nms(boxes, np.array([0.9, 0.8, 0.7]), 0.5)
+        self.assertEqual(keep.tolist(), [0, 2])
+
+    def test_postprocess_undoes_letterbox_and_is_class_aware(self):
+        # Three anchors, two classes: two overlapping boxes of different classes and one weak box
+        pred = np.zeros((1, 6, 3), dtype=np.float32)
+        pred[0, :4, 0] = [320, 320, 64, 32]
+        pred[0, :4, 1] = [322, 320, 64, 32]
+        pred[0, :4, 2] = [100, 100, 20, 20]
+        pred[0, 4, 0] = 0.9
+        pred[0, 5, 1] = 0.8
+        pred[0, 4, 2] = 0.1
+        dets = postprocess(pred, 0.5, 0.45, ratio=0.5, pad=(0, 80), image_shape=(960, 1280), names={0: "button", 1: "icon"})
+        self.assertEqual([d[5] for d in dets], ["button", "icon"])
+        x1, y1, x2, y2 = dets[0][:4]
+        self.assertEqual((x1, y1, x2, y2), (576.0, 448.0, 704.0, 512.0))
+
+    def test_onnx_cache_is_keyed_by_input_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            weights = os.path.join(tmp, "ui.pt")
+            open(weights, "wb").close()
+            cached = onnx_export_path(weights, 640)
+            open(cached, "wb").close()
+            self.assertEqual(ensure_onnx(weights, imgsz=640), cached)
+            self.assertNotEqual(onnx_export_path(weights, 960), cached)
+            self.assertNotEqual(onnx_export_path(weights, 640, int8=True), cached)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+from perception.element_table import ElementTable, ScreenState, StringTable
+
+OCR = [
+    {"id": "ocr_s1_0", "text": "Login", "confidence": 0.93, "confidence_level": "reliable",
+     "bounding_box": {"x": 100, "y": 200, "width": 50, "height": 20}, "region_index": 2},
+    {"id": "ocr_s1_1", "text": "Cancel", "confidence": 0.5, "bounding_box": {"x": 10, "y": 20, "width": 40, "height": 12}},
+]
+VISION = [
+    {"id": "vis_s1_0", "class": "button", "label": "Login", "confidence": 0.81,
+     "bounding_box": {"x": 90, "y": 190, "width": 70, "height": 40}, "center": {"x": 125, "y": 210}},
+]
+
+class TestElementTable(unittest.TestCase):
+    def test_rows_round_trip(self):
+        table = ElementTable(OCR)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[0], OCR[0])
+        self.assertEqual(table[-1], OCR[1])
+        self.assertEqual(table, OCR)
+        self.assertEqual(table.boxes.shape, (2, 4))
+
+    def test_strings_are_shared_between_tables(self):
+        strings = StringTable()
+        ElementTable(OCR, strings)
+        before = len(strings)
+        vision = ElementTable(VISION, strings)
+        # Only the id and class are new; the "Login" label is the OCR text
+        self.assertEqual(len(strings), before + 2)
+        self.assertEqual(vision[0]["label"], "Login")
+
+    def test_screen_state_json_is_cached_until_modified(self):
+        state = ScreenState({"step_id": "s1", "ocr_elements": ElementTable(OCR), "vision_elements": ElementTable(VISION)})
+        first = state.to_json()
+        self.assertIs(state.to_json(), first)
+        self.assertEqual(json.loads(first)["vision_elements"], VISION)
+        self.assertEqual(state.elements_json("ocr_elements"), json.dumps(OCR, indent=2))
+
+        state["context_buffer"] = {"clipboard": "x"}
+        self.assertIn("clipboard", state.to_json())
+        state["context_buffer"]["clipboard"] = "changed in place"
+        state.invalidate()
+        self.assertIn("changed in place", state.to_json())
+        # Plain json.dumps works too (tables are expanded through items())
+        self.assertEqual(json.loads(json.dumps(state))["ocr_elements"], OCR)
+
+    def test_values_are_stored_exactly(self):
+        element = {"id": "e", "confidence": 0.123456789,
+                   "bounding_box": {"x": 10.5, "y": 2, "width": 3, "height": 4}, "center": {"x": 2 ** 40, "y": 1}}
+        row = ElementTable([element])[0]
+        self.assertEqual(row, element)
+        self.assertEqual(row["confidence"], 0.123456789)
+
+if __name__ == '__main__':
+    unittest.main()
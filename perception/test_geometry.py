@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from perception.geometry import ResolutionScaler, offset_elements
+
+def text_boxes(height):
+    return [{"bounding_box": {"x": 0, "y": i * 40, "width": 80, "height": height}} for i in range(5)]
+
+class TestResolutionScaler(unittest.TestCase):
+    def test_presets_and_overrides(self):
+        self.assertFalse(ResolutionScaler.from_config({}).active)
+        fast = ResolutionScaler.from_config({"resolution_preset": "fast"})
+        self.assertAlmostEqual(fast.factor_for(3840, 2160), 1600 / 3840)
+        self.assertEqual(fast.factor_for(1280, 720), 1.0)
+        fixed = ResolutionScaler.from_config({"resolution_preset": "fast", "resolution_scale": 0.5, "max_long_side": 0})
+        self.assertEqual(fixed.factor_for(1280, 720), 0.5)
+        self.assertEqual(fixed.resize(np.zeros((720, 1280, 3), np.uint8), 0.5).shape, (360, 640, 3))
+
+    def test_auto_scale_follows_text_height(self):
+        scaler = ResolutionScaler(auto=True, target_text_height=14, min_scale=0.25)
+        self.assertEqual(scaler.factor_for(3840, 2160), 1.0)  # nothing observed yet
+        for _ in range(3):
+            scaler.observe(text_boxes(28))  # 200% UI scaling
+        self.assertEqual(scaler.factor_for(3840, 2160), 0.5)
+        scaler.observe([])  # frames without text keep the estimate
+        self.assertEqual(scaler.factor_for(3840, 2160), 0.5)
+        small = ResolutionScaler(auto=True, target_text_height=14)
+        small.observe(text_boxes(10))
+        self.assertEqual(small.factor_for(1920, 1080), 1.0)  # never upscales past max_scale
+
+    def test_offset_elements_copies(self):
+        elements = [{"bounding_box": {"x": 1, "y": 2, "width": 3, "height": 4}, "center": {"x": 2, "y": 4}}]
+        shifted = offset_elements(elements, 100, 10)
+        self.assertEqual(shifted[0]["bounding_box"], {"x": 101, "y": 12, "width": 3, "height": 4})
+        self.assertEqual(elements[0]["center"], {"x": 2, "y": 4})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import cv2
+import numpy as np
+from perception.image_preprocessor import OCRPreprocessor
+
+class TestOCRPreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.clean = np.full((120, 300, 4), 230, dtype=np.uint8)
+        cv2.putText(self.clean, "Settings", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0, 255), 2)
+        rng = np.random.default_rng(0)
+        gray = cv2.cvtColor(self.clean, cv2.COLOR_BGRA2GRAY).astype(np.float32)
+        self.noisy = np.clip(gray + rng.normal(0, 12, gray.shape), 0, 255).astype(np.uint8)
+
+    def test_noise_estimate_separates_clean_and_noisy_frames(self):
+        p = OCRPreprocessor()
+        self.assertLess(p.estimate_noise(cv2.cvtColor(self.clean, cv2.COLOR_BGRA2GRAY)), p.noise_threshold)
+        self.assertGreater(p.estimate_noise(self.noisy), p.noise_threshold)
+
+    def test_auto_mode_skips_denoise_on_clean_frames(self):
+        p = OCRPreprocessor(stages=["grayscale", "denoise"], denoise="auto", denoise_method="median")
+        out, timings = p.run(self.clean)
+        self.assertEqual(list(timings), ["grayscale", "denoise"])
+        np.testing.assert_array_equal(out, cv2.cvtColor(self.clean, cv2.COLOR_BGRA2GRAY))
+        out, _ = p.run(self.noisy)
+        self.assertFalse(np.array_equal(out, self.noisy))
+
+    def test_upscale_reports_scale(self):
+        p = OCRPreprocessor(stages=["grayscale", "upscale", "binarize"], upscale_factor=2.0)
+        out, _ = p.run(self.clean)
+        self.assertEqual(out.shape, (240, 600))
+        self.assertEqual(p.scale, 2.0)
+        self.assertTrue(set(np.unique(out)) <= {0, 255})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import cv2
+import numpy as np
+from capture.dirty_regions import DirtyRegionTracker
+from perception.incremental_ocr import IncrementalOCR
+
+def detect(img):
+    count, _, stats, _ = cv2.connectedComponentsWithStats((img < 128).astype(np.uint8))
+    return [(int(x), int(y), int(w), int(h)) for x, y, w, h, _ in stats[1:count]]
+
+class TestIncrementalOCR(unittest.TestCase):
+    def setUp(self):
+        self.recognized = []
+
+        def recognize(img, boxes):
+            self.recognized.extend(boxes)
+            return [(f"w{w}", 0.9) for (_, _, w, _) in boxes]
+
+        self.ocr = IncrementalOCR(detect, recognize, margin=4)
+        self.tracker = DirtyRegionTracker(tile_size=32)
+
+    def frame(self, widths):
+        img = np.full((256, 512), 255, dtype=np.uint8)
+        for i, w in enumerate(widths):
+            img[20 + 80 * i:36 + 80 * i, 40:40 + w] = 0
+        return img
+
+    def run_frame(self, img, token):
+        dirty = self.tracker.update(img, token)
+        return self.ocr.process(img, "s", token=token, base_token=self.tracker.base_token, dirty_rects=dirty)
+
+    def test_only_changed_boxes_are_recognized(self):
+        first = self.run_frame(self.frame([60, 90, 120]), 1)
+        self.assertEqual(len(self.recognized), 3)
+        self.recognized.clear()
+
+        second = self.run_frame(self.frame([60, 150, 120]), 2)
+        self.assertEqual(self.recognized, [(40, 100, 150, 16)])
+        self.assertEqual([e["text"] for e in second], ["w60", "w150", "w120"])
+        # Unchanged boxes keep their IDs
+        self.assertEqual(first[0]["id"], second[0]["id"])
+        self.assertEqual(first[2]["id"], second[2]["id"])
+        self.assertNotEqual(first[1]["id"], second[1]["id"])
+        self.assertTrue(self.ocr.last_stats["incremental"])
+
+    def test_unknown_base_frame_runs_full_pass(self):
+        self.run_frame(self.frame([60, 90]), 1)
+        self.recognized.clear()
+        entries = self.ocr.process(self.frame([60, 90]), "s", token=3, base_token=2, dirty_rects=[])
+        self.assertFalse(self.ocr.last_stats["incremental"])
+        # Identical pixels are still matched by hash, so nothing is recognized again
+        self.assertEqual(self.recognized, [])
+        self.assertEqual(len(entries), 2)
+
+if __name__ == '__main__':
+    unittest.main()
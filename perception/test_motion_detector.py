@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from capture.frame import Frame
+from perception.motion_detector import MotionDetector
+
+def burst(count, spinner=True, caret=False, video=False, left=0, top=0):
+    """Synthetic 640x360 screen: a spinner that changes every frame, a caret that blinks once, a video area."""
+    frames = []
+    for i in range(count):
+        image = np.full((360, 640, 4), 240, dtype=np.uint8)
+        if spinner:
+            image[200:216, 300:316] = 40 if i % 2 else 160
+        if caret and i >= count // 2:
+            image[50:66, 100:102] = 0
+        if video:
+            image[0:300, 400:640] = (i * 37) % 255
+        frames.append(Frame(image, left=left, top=top, monotonic=float(i)))
+    return frames
+
+class ScriptedScreen:
+    def __init__(self, bursts):
+        self.frames = [f for b in bursts for f in b]
+        self.calls = 0
+
+    def sample(self, since):
+        frame = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return frame
+
+class TestMotionDetector(unittest.TestCase):
+    def _detector(self, sample_fn=lambda since: None):
+        return MotionDetector(sample_fn, burst_frames=6, sample_interval_ms=0, thumb_width=160)
+
+    def test_finds_spinner_but_not_caret_or_video(self):
+        regions = self._detector().detect(burst(6, caret=True, video=True, left=1920, top=0))
+        self.assertEqual(len(regions), 1)
+        box = regions[0]["bounding_box"]
+        # Screen coordinates of the spinner at (300, 200) 16x16, within thumbnail resolution
+        self.assertLessEqual(abs(box["x"] - (1920 + 300)), 8)
+        self.assertLessEqual(abs(box["y"] - 200), 8)
+        self.assertLessEqual(box["width"], 32)
+        self.assertEqual(regions[0]["activity"], 1.0)
+
+    def test_static_screen_has_no_regions(self):
+        self.assertEqual(self._detector().detect(burst(6, spinner=False)), [])
+
+    def test_wait_until_idle(self):
+        screen = ScriptedScreen([burst(6), burst(6, spinner=False)])
+        result = self._detector(screen.sample).wait_until_idle(timeout=5.0)
+        self.assertTrue(result["idle"])
+        self.assertEqual(screen.calls, 12)
+
+        busy = ScriptedScreen([burst(600)])
+        result = self._detector(busy.sample).wait_until_idle(timeout=0.05)
+        self.assertFalse(result["idle"])
+        self.assertEqual(len(result["regions"]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+from capture.frame import Frame
+from perception.multi_monitor import MultiMonitorPerception
+
+def make_frame(index, left, dirty):
+    frame = Frame(np.zeros((100, 200, 4), dtype=np.uint8), left=left, top=0)
+    frame.monitor_index = index
+    frame.dirty_rects = dirty
+    return frame
+
+class TestMultiMonitorPerception(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def perceive(frame, step_id):
+            self.calls.append(frame.monitor_index)
+            ocr = [{"text": f"m{frame.monitor_index}", "bounding_box": {"x": 10, "y": 20, "width": 30, "height": 10}}]
+            vis = [{"class": "button", "center": {"x": 15, "y": 25}, "bounding_box": {"x": 5, "y": 15, "width": 20, "height": 20}}]
+            return ocr, vis
+
+        self.perception = MultiMonitorPerception(perceive, max_workers=2)
+
+    def tearDown(self):
+        self.perception.shutdown()
+
+    def test_results_are_merged_in_global_coordinates(self):
+        ocr, vis, monitors = self.perception.process([make_frame(1, 0, None), make_frame(2, 200, None)], "s1")
+        self.assertEqual(sorted(self.calls), [1, 2])
+        self.assertEqual([o["bounding_box"]["x"] for o in ocr], [10, 210])
+        self.assertEqual([v["center"]["x"] for v in vis], [15, 215])
+        self.assertEqual(monitors[1]["bounding_box"], {"x": 200, "y": 0, "width": 200, "height": 100})
+
+    def test_unchanged_monitor_reuses_previous_results(self):
+        self.perception.process([make_frame(1, 0, None), make_frame(2, 200, None)], "s1")
+        self.calls.clear()
+        ocr, _, monitors = self.perception.process([make_frame(1, 0, []), make_frame(2, 200, [(0, 0, 64, 64)])], "s2")
+        self.assertEqual(self.calls, [2])
+        self.assertEqual(len(ocr), 2)
+        self.assertTrue(monitors[0]["reused"])
+        self.assertFalse(monitors[1]["reused"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import cv2
+import numpy as np
+from perception.ocr_cache import OCRTileCache
+
+def fake_recognizer(calls):
+    """Reads every white blob as one 'word' whose text is its size."""
+    def read(tile):
+        count, _, stats, _ = cv2.connectedComponentsWithStats((tile > 0).astype(np.uint8))
+        return [(int(x), int(y), int(w), int(h), "word", 0.9) for x, y, w, h, _ in stats[1:count]]
+
+    def recognize(tiles):
+        calls.extend(tile.shape for tile in tiles)
+        return [read(tile) for tile in tiles]
+    return recognize
+
+class TestOCRTileCache(unittest.TestCase):
+    def setUp(self):
+        self.image = np.zeros((600, 1000), dtype=np.uint8)
+        for x, y in [(20, 20), (290, 250), (500, 480), (900, 100)]:
+            self.image[y:y + 20, x:x + 40] = 255
+        # A line of text longer than the tile overlap
+        self.image[400:420, 100:700] = 255
+
+    def test_matches_full_frame_run(self):
+        calls = []
+        full = fake_recognizer([])([self.image])[0]
+        tiled = OCRTileCache(tile_size=320, overlap=64).recognize(self.image, fake_recognizer(calls))
+        self.assertGreater(len(calls), 1)
+        self.assertEqual(sorted(b[:4] for b in tiled), sorted(b[:4] for b in full))
+
+    def test_only_changed_tiles_are_recognized(self):
+        cache = OCRTileCache(tile_size=320, overlap=64)
+        calls = []
+        cache.recognize(self.image, fake_recognizer(calls))
+        first = len(calls)
+        calls.clear()
+        cache.recognize(self.image, fake_recognizer(calls))
+        self.assertEqual(calls, [])
+        changed = self.image.copy()
+        changed[550:570, 20:60] = 255
+        cache.recognize(changed, fake_recognizer(calls))
+        self.assertGreater(len(calls), 0)
+        self.assertLess(len(calls), first)
+
+    def test_memory_cap_evicts_oldest(self):
+        cache = OCRTileCache(tile_size=320, overlap=64, max_bytes=1000)
+        cache.recognize(self.image, fake_recognizer([]))
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+
+if __name__ == '__main__':
+    unittest.main()
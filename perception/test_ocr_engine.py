@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from perception.ocr_engine import OCREngine
+
+class FakeReader:
+    """Finds one 'word' per image: the bounding box of its dark pixels."""
+    def __init__(self):
+        self.batches = []
+
+    def _read(self, img):
+        if img.ndim == 3:
+            img = img.min(axis=2)
+        ys, xs = np.nonzero(img < 128)
+        if len(xs) == 0:
+            return []
+        x1, y1, x2, y2 = xs.min(), ys.min(), xs.max() + 1, ys.max() + 1
+        return [([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], "word", 0.9)]
+
+    def readtext(self, img):
+        return self._read(img)
+
+    def readtext_batched(self, images, batch_size=1):
+        self.batches.append(len(images))
+        assert len({img.shape for img in images}) == 1, "readtext_batched needs equally sized images"
+        return [self._read(img) for img in images]
+
+class TestBatchedOCR(unittest.TestCase):
+    def setUp(self):
+        self.engine = OCREngine({"perception": {"ocr": {"engine": "tesseract", "preprocess_image": False}}})
+        self.engine.engine_type = "easyocr"
+        self.engine.reader = FakeReader()
+
+    def test_same_bucket_crops_share_one_batch(self):
+        crops = [np.full((30, 100), 255, np.uint8), np.full((40, 90), 255, np.uint8), np.full((200, 300), 255, np.uint8)]
+        crops[0][10:20, 5:50] = 0
+        crops[1][5:15, 60:90] = 0
+        results = self.engine.recognize_batch(crops)
+        self.assertEqual(self.engine.reader.batches, [2])
+        self.assertEqual(results[0][0][:4], (5, 10, 45, 10))
+        self.assertEqual(results[1][0][:4], (60, 5, 30, 10))
+        self.assertEqual(results[2], [])
+
+    def test_regions_map_back_to_image_coordinates(self):
+        image = np.full((400, 400, 3), 255, np.uint8)
+        image[110:120, 120:160] = 0
+        image[310:330, 20:60] = 0
+        out = self.engine.process_regions(image, [(100, 100, 100, 50), (0, 300, 100, 50)], "s1")
+        boxes = {o["region_index"]: o["bounding_box"] for o in out}
+        self.assertEqual(boxes[0], {"x": 120, "y": 110, "width": 40, "height": 10})
+        self.assertEqual(boxes[1], {"x": 20, "y": 310, "width": 40, "height": 20})
+
+    def test_downscaled_inference_maps_back_to_frame_coordinates(self):
+        engine = OCREngine({"perception": {"ocr": {"engine": "tesseract", "preprocess_image": False,
+                                                    "tile_cache": False, "resolution_scale": 0.5}}})
+        engine.engine_type = "easyocr"
+        engine.reader = FakeReader()
+        image = np.full((400, 600, 3), 255, np.uint8)
+        image[100:140, 200:360] = 0
+        out = engine.process_image(image, "s1")
+        self.assertEqual(out[0]["bounding_box"], {"x": 200, "y": 100, "width": 160, "height": 40})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import time
+import asyncio
+import threading
+import unittest
+from perception.prefetch import PerceptionPrefetch
+
+class TestPerceptionPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.current = True
+        self.checks = 0
+        self.calls = []
+        self.finished = threading.Event()
+
+        def work(cap_data, step_id):
+            time.sleep(0.05)
+            self.finished.set()
+            return [{"id": f"ocr_{step_id}_0"}, {"id": f"ocr_{step_id}_m1_1"}], {"ocr": "ok"}
+
+        def is_current(frame, max_age_ms):
+            self.checks += 1
+            return self.current
+
+        async def perceive(cap_data, step_id):
+            self.calls.append(step_id)
+            return await asyncio.to_thread(work, cap_data, step_id)
+
+        self.prefetch = PerceptionPrefetch(perceive, is_current, 1500)
+        self.cap = {"frame": object()}
+
+    def test_current_frame_is_reused_with_the_new_step_id(self):
+        async def run():
+            self.assertTrue(await self.prefetch.start(self.cap, "s1_post"))
+            cap_data, task = await self.prefetch.take("s2")
+            self.assertIs(cap_data, self.cap)
+            return await task
+        ocr, status = asyncio.run(run())
+        self.assertEqual(ocr, [{"id": "ocr_s2_0"}, {"id": "ocr_s2_m1_1"}])
+        self.assertEqual(status, {"ocr": "ok"})
+        self.assertEqual(self.checks, 1)  # currency is only checked when taken
+
+    def test_nothing_to_take_without_a_frame(self):
+        async def run():
+            started = await self.prefetch.start({"frame": None, "frames": []}, "s1_post")
+            return started, await self.prefetch.take("s2")
+        self.assertEqual(asyncio.run(run()), (False, (None, None)))
+        self.assertEqual(self.calls, [])
+
+    def test_unused_prefetch_is_drained_not_cancelled(self):
+        # The screen moves on after the prefetch started; take() must not
+        # return before the worker thread is done with the models.
+        async def run():
+            await self.prefetch.start(self.cap, "s1_post")
+            self.current = False
+            return await self.prefetch.take("s2")
+        self.assertEqual(asyncio.run(run()), (None, None))
+        self.assertTrue(self.finished.is_set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import time
+import threading
+import unittest
+from perception.scheduler import PerceptionScheduler, merge_status, is_partial
+
+class TestPerceptionScheduler(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.slow_calls = []
+
+        def fast(frame, step_id):
+            return [{"id": f"fast_{step_id}"}]
+
+        def slow(frame, step_id):
+            self.slow_calls.append(step_id)
+            self.release.wait(2.0)
+            return [{"id": f"slow_{step_id}"}]
+
+        self.scheduler = PerceptionScheduler({"fast": fast, "slow": slow},
+                                             deadlines_ms={"fast": 500, "slow": 50})
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown()
+
+    def test_late_stage_is_reported_without_blocking(self):
+        start = time.monotonic()
+        results, status = self.scheduler.run(None, "s1")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results["fast"], [{"id": "fast_s1"}])
+        self.assertEqual(status, {"fast": "ok", "slow": "timeout"})
+        self.assertEqual(results["slow"], [])
+
+    def test_busy_stage_is_not_queued_and_cache_fills_in(self):
+        self.scheduler.run(None, "s1")
+        _, status = self.scheduler.run(None, "s2")
+        self.assertEqual(self.slow_calls, ["s1"])
+        self.assertEqual(status["slow"], "timeout")
+
+        self.release.set()
+        time.sleep(0.1)  # the late s1 result lands in the cache
+        self.release.clear()
+        results, status = self.scheduler.run(None, "s3")
+        self.assertEqual(status["slow"], "stale")
+        self.assertEqual(results["slow"], [{"id": "slow_s1"}])
+
+    def test_busy_stage_waits_for_the_earlier_run(self):
+        self.scheduler.run(None, "s1")
+        threading.Timer(0.01, self.release.set).start()
+        results, status = self.scheduler.run(None, "s2")
+        self.assertEqual(self.slow_calls, ["s1"])
+        self.assertEqual(status["slow"], "stale")
+        self.assertEqual(results["slow"], [{"id": "slow_s1"}])
+
+    def test_merge_status_keeps_worst_outcome(self):
+        merged = merge_status([{"ocr": "ok", "yolo": "stale"}, {"ocr": "timeout", "yolo": "ok"}, None])
+        self.assertEqual(merged, {"ocr": "timeout", "yolo": "stale"})
+        self.assertTrue(is_partial(merged))
+        self.assertFalse(is_partial({"ocr": "ok"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from perception.spatial_index import GridIndex, assign_ocr_labels
+
+def ocr(text, x, y, w=20, h=10):
+    return {"text": text, "bounding_box": {"x": x, "y": y, "width": w, "height": h}}
+
+def vis(cx, cy, w=40, h=20):
+    return {"class": "button", "label": "button", "center": {"x": cx, "y": cy},
+            "bounding_box": {"x": cx - w // 2, "y": cy - h // 2, "width": w, "height": h}}
+
+class TestSpatialIndex(unittest.TestCase):
+    def test_nearest_not_first_within_radius(self):
+        # "far" is listed first and within 50 px, "near" is closer
+        labelled = assign_ocr_labels([vis(200, 200, 4, 4)], [ocr("far", 230, 195), ocr("near", 195, 205)])
+        self.assertEqual(labelled[0]["label"], "near")
+
+    def test_containment_wins_over_closer_outside_text(self):
+        element = vis(100, 100, 200, 40)  # wide button, its text sits near the left edge
+        labelled = assign_ocr_labels([element], [ocr("outside", 95, 125), ocr("inside", 20, 95)])
+        self.assertEqual(labelled[0]["label"], "inside")
+
+    def test_inputs_are_not_mutated(self):
+        elements = [vis(100, 100), vis(900, 900)]
+        labelled = assign_ocr_labels(elements, [ocr("OK", 90, 95)])
+        self.assertEqual(elements[0]["label"], "button")
+        self.assertEqual(labelled[0]["label"], "OK")
+        self.assertEqual(labelled[1]["label"], "button")
+
+    def test_grid_nearest_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        points = [tuple(p) for p in rng.integers(0, 2000, size=(500, 2)).tolist()]
+        index = GridIndex(points, cell_size=50)
+        for qx, qy in rng.integers(0, 2000, size=(200, 2)).tolist():
+            d2 = [(px - qx) ** 2 + (py - qy) ** 2 for px, py in points]
+            inside = [i for i, d in enumerate(d2) if d < 50 ** 2]
+            expected = min(inside, key=lambda i: (d2[i], i)) if inside else None
+            self.assertEqual(index.nearest(qx, qy, 50), expected)
+
+if __name__ == '__main__':
+    unittest.main()
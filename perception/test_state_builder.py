@@ -37,5 +37,14 @@ class TestStateBuilder(unittest.TestCase):
         button_element = next(v for v in state["vision_elements"] if v["class"] == "button")
         self.assertEqual(button_element.get("label"), "Login", "OCR text should be assigned to nearby vision box")
 
+    def test_motion_regions_flag_loading(self):
+        motion = [{"class": "animation", "activity": 1.0, "bounding_box": {"x": 10, "y": 20, "width": 16, "height": 16}}]
+        state = StateBuilder.build_screen_state("s", "step_1", 0, None, (800, 600), "h", [], [], motion_regions=motion)
+        self.assertTrue(state["loading_indicators_detected"])
+        self.assertEqual(state["loading_regions"], [{"source": "motion", "activity": 1.0,
+                                                     "bounding_box": {"x": 10, "y": 20, "width": 16, "height": 16}}])
+        idle = StateBuilder.build_screen_state("s", "step_1", 0, None, (800, 600), "h", [], [])
+        self.assertFalse(idle["loading_indicators_detected"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from perception.template_library import TemplateLibrary
+
+def make_icon(size=40):
+    icon = np.full((size, size), 200, dtype=np.uint8)
+    cv2.circle(icon, (size // 2, size // 2), size // 3, 40, -1)
+    cv2.rectangle(icon, (4, 4), (size // 2, size // 4), 90, -1)
+    return icon
+
+class TestTemplateLibrary(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        cv2.imwrite(os.path.join(self.dir, "record.png"), make_icon())
+        self.library = TemplateLibrary(self.dir, threshold=0.8, scales=[1.0, 1.5], check_interval=0.0)
+
+    def tearDown(self):
+        self.library.close()
+        shutil.rmtree(self.dir)
+
+    def test_one_match_per_instance(self):
+        screen = np.full((300, 400), 200, dtype=np.uint8)
+        screen[50:90, 60:100] = make_icon()
+        screen[200:240, 300:340] = make_icon()
+        matches = self.library.match(screen)
+        self.assertEqual(len(matches), 2)
+        self.assertEqual({(m[0], m[1]) for m in matches}, {(60, 50), (300, 200)})
+        self.assertTrue(all(m[5] == "record" for m in matches))
+
+    def test_matches_scaled_instance(self):
+        screen = np.full((300, 400), 200, dtype=np.uint8)
+        screen[100:160, 100:160] = make_icon(60)
+        matches = self.library.match(screen)
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0][2:4], (60, 60))
+
+    def test_reloads_when_directory_changes(self):
+        self.assertEqual(len(self.library), 1)
+        cv2.imwrite(os.path.join(self.dir, "stop.png"), np.full((20, 20), 10, dtype=np.uint8))
+        self.assertEqual(len(self.library), 2)
+
+if __name__ == '__main__':
+    unittest.main()
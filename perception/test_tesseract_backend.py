@@ -0,0 +1,55 @@
+import threading
+import unittest
+import cv2
+import numpy as np
+from perception.tesseract_backend import TesseractBackend
+
+def read_blobs(gray):
+    count, _, stats, _ = cv2.connectedComponentsWithStats((gray < 128).astype(np.uint8))
+    return [(int(x), int(y), int(w), int(h), "word", 0.9) for x, y, w, h, _ in stats[1:count]]
+
+class TestTesseractBands(unittest.TestCase):
+    def test_bands_report_every_word_once(self):
+        backend = TesseractBackend(workers=3, band_height=200, band_overlap=40)
+        backend.use_capi = True
+        backend._recognize_capi = read_blobs
+        gray = np.full((700, 400), 255, dtype=np.uint8)
+        # Rows chosen to land inside band overlaps as well as band cores
+        for i, y in enumerate([10, 165, 175, 300, 330, 500, 640]):
+            gray[y:y + 16, 20 + 40 * i:50 + 40 * i] = 0
+        self.assertGreater(len(backend.bands(700)), 1)
+        words = backend.recognize(gray)
+        backend.close()
+        self.assertEqual(sorted(w[:4] for w in words), sorted(b[:4] for b in read_blobs(gray)))
+
+    def test_pytesseract_makes_one_call_per_image(self):
+        backend = TesseractBackend(workers=3, band_height=200, band_overlap=40)
+        backend.use_capi = False
+        calls = []
+        backend._recognize_pytesseract = lambda gray: calls.append(gray.shape) or read_blobs(gray)
+        backend.recognize(np.full((700, 400), 255, dtype=np.uint8))
+        self.assertEqual(calls, [(700, 400)])
+
+    def test_engines_only_run_on_pool_threads(self):
+        backend = TesseractBackend(workers=2, band_height=200, band_overlap=40)
+        backend.use_capi = True
+        threads = set()
+        backend._recognize_capi = lambda gray: threads.add(threading.current_thread().name) or []
+        backend.recognize(np.full((100, 400), 255, dtype=np.uint8))  # a single band
+        backend.recognize(np.full((700, 400), 255, dtype=np.uint8))
+        backend.close()
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("TesseractWorker") for name in threads))
+        self.assertLessEqual(len(threads), 2)
+
+    def test_cores_tile_the_image(self):
+        backend = TesseractBackend(workers=2, band_height=256, band_overlap=64)
+        backend.use_capi = True
+        bands = backend.bands(1080)
+        self.assertEqual(bands[0][2], 0)
+        self.assertEqual(bands[-1][3], 1080)
+        for prev, cur in zip(bands, bands[1:]):
+            self.assertEqual(prev[3], cur[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import signal
+import time
+import unittest
+import numpy as np
+from capture.frame import Frame
+from perception.worker_service import SharedFrame, SharedFrameRing, WorkerClient, WorkerCrashed
+
+class FakePerceiver:
+    """Stands in for OCREngine in the worker process."""
+    has_model = True
+
+    def __init__(self, config):
+        self.config = config
+
+    def process_image(self, frame, step_id):
+        image = frame.image
+        return [{"id": f"ocr_{step_id}_0", "text": f"mean={int(image.mean())}", "confidence": 0.9,
+                 "bounding_box": {"x": frame.left, "y": frame.top, "width": frame.width, "height": frame.height}}]
+
+    def pid(self):
+        return os.getpid()
+
+class TestWorkerService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ring = SharedFrameRing(slots=2, slot_bytes=64 * 64 * 4)
+        cls.client = WorkerClient("test", "perception.test_worker_service:FakePerceiver", {}, cls.ring,
+                                  methods=("process_image", "pid"), start_timeout=30, call_timeout=10, health_interval=0.2)
+        cls.client.wait_ready()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.ring.close()
+
+    def test_frame_goes_through_shared_memory(self):
+        frame = Frame(np.full((32, 48, 4), 7, dtype=np.uint8), left=100, top=5)
+        for i in range(5):  # more calls than ring slots: slots are released and reused
+            result = self.client.process_image(frame, f"s{i}")
+        self.assertEqual(result, [{"id": "ocr_s4_0", "text": "mean=7", "confidence": 0.9,
+                                   "bounding_box": {"x": 100, "y": 5, "width": 48, "height": 32}}])
+        self.assertTrue(self.client.has_model)
+
+    def test_shared_frame_uses_one_slot_for_all_calls(self):
+        frame = Frame(np.full((32, 48, 4), 9, dtype=np.uint8))
+        free = self.ring._free.qsize()
+        with SharedFrame(self.ring, frame) as shared:
+            for i in range(3):
+                self.assertEqual(self.client.process_image(shared, f"s{i}")[0]["text"], "mean=9")
+            self.assertEqual(self.ring._free.qsize(), free - 1)
+        self.assertEqual(self.ring._free.qsize(), free)
+
+    def test_only_listed_methods_are_proxied(self):
+        with self.assertRaises(AttributeError):
+            self.client.close_all_files()
+
+    def test_restarts_after_crash(self):
+        pid = self.client.pid()
+        os.kill(pid, signal.SIGKILL)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if self.client.healthy() and self.client.pid() != pid:
+                    break
+            except WorkerCrashed:
+                pass
+            time.sleep(0.1)
+        self.assertNotEqual(self.client.pid(), pid)
+        self.assertGreaterEqual(self.client.restarts, 1)
+
+if __name__ == '__main__':
+    unittest.main()
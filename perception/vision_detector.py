@@ -1,14 +1,15 @@
 import logging
-import cv2
-import numpy as np
+import threading
 import os
+import numpy as np
 from typing import List, Dict, Any
 
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
+from perception.image_preprocessor import to_bgr, to_gray
+from perception.template_library import TemplateLibrary
+from perception.geometry import ResolutionScaler
+from perception.detection_backends import (
+    create_backend, YOLO_AVAILABLE, ONNXRUNTIME_AVAILABLE, OPENVINO_AVAILABLE
+)
 
 class VisionDetector:
     def __init__(self, config: dict):
@@ -20,23 +21,42 @@ class VisionDetector:
         self.nms_threshold = self.config.get("nms_threshold", 0.45)
         self.device = self.config.get("detection_device", "cuda")
         self.template_dir = self.config.get("template_library_path", "perception/templates/")
+        self.templates = TemplateLibrary(
+            self.template_dir,
+            # TM_CCOEFF_NORMED peak score; the default keeps the previous 0.5 bar
+            threshold=self.config.get("template_threshold", 0.5),
+            scales=self.config.get("template_scales", [0.8, 1.0, 1.25]),
+            nms_threshold=self.config.get("template_nms_threshold", 0.3),
+            max_matches=self.config.get("template_max_matches", 20),
+            workers=self.config.get("template_workers", 0)
+        )
         
+        # YOLO input resolution; template matching always runs at native size
+        # because the templates are captured at screen resolution
+        self.scaler = ResolutionScaler.from_config(self.config)
+
+        # ultralytics (PyTorch), onnxruntime, openvino or auto
+        self.backend_name = str(self.config.get("backend", "ultralytics")).lower()
         self.model = None
+        # A single model instance is shared when monitors are perceived concurrently
+        self._model_lock = threading.Lock()
         
-        if YOLO_AVAILABLE:
+        onnx_available = (self.backend_name in ("onnxruntime", "auto") and ONNXRUNTIME_AVAILABLE) or \
+                         (self.backend_name in ("openvino", "auto") and OPENVINO_AVAILABLE)
+        if YOLO_AVAILABLE or onnx_available:
             if os.path.exists(self.yolo_model_path):
                 try:
-                    logging.info(f"Loading YOLOv8 model from {self.yolo_model_path} on {self.device}")
-                    self.model = YOLO(self.yolo_model_path)
-                    # Force model to device if specified
-                    try:
-                        self.model.to(self.device)
-                    except Exception as e:
-                        logging.warning(
-                            "YOLO model loaded but moving to device '%s' failed (%s). Falling back to default device.",
-                            self.device,
-                            e,
-                        )
+                    logging.info(f"Loading YOLOv8 model from {self.yolo_model_path} on {self.device} (backend: {self.backend_name})")
+                    self.model = create_backend(
+                        self.yolo_model_path,
+                        backend=self.backend_name,
+                        device=self.device,
+                        conf=self.confidence_threshold,
+                        iou=self.nms_threshold,
+                        threads=self.config.get("inference_threads", 0),
+                        int8=self.config.get("int8", False),
+                        imgsz=self.config.get("input_size", 640)
+                    )
                 except Exception as e:
                     logging.error(
                         "Failed to load YOLOv8 model from '%s': %s. "
@@ -58,42 +78,40 @@ class VisionDetector:
                  "ultralytics is not installed; YOLO vision is unavailable. Fix: pip install ultralytics (and torch) if you want detections."
              )
 
-    def detect_elements(self, image_path: str, step_id: str) -> List[Dict[str, Any]]:
-        """Run object detection on the screen image."""
+    @property
+    def has_model(self) -> bool:
+        return self.model is not None
+
+    def detect_elements(self, image, step_id: str) -> List[Dict[str, Any]]:
+        """
+        Run object detection on the screen image.
+        `image` may be a capture Frame, a numpy array or a file path.
+        """
         if self.model:
             try:
-                results = self._detect_yolo(image_path, step_id)
+                results = self.detect_yolo(image, step_id)
                 if results:
                     return results
             except Exception:
                 logging.exception("YOLO detection crashed; continuing with template matching.")
         
         logging.info("Falling back to OpenCV template matching.")
-        return self._detect_templates(image_path, step_id)
+        return self.detect_templates(image, step_id)
 
-    def _detect_yolo(self, image_path: str, step_id: str) -> List[Dict[str, Any]]:
+    def detect_yolo(self, image, step_id: str) -> List[Dict[str, Any]]:
         """Run YOLO inference."""
         elements = []
         try:
-             # Run inference
-             # iou = nms threshold. conf = confidence threshold
-             results = self.model(
-                  image_path, 
-                  conf=self.confidence_threshold, 
-                  iou=self.nms_threshold, 
-                  verbose=False
-             )[0]
+             # Run inference (confidence and NMS thresholds are applied by the backend)
+             img = to_bgr(image)
+             factor = self.scaler.factor_for(img.shape[1], img.shape[0])
+             img = self.scaler.resize(img, factor)
+             with self._model_lock:
+                  detections = self.model.predict(img)
              
-             # Extract bounding boxes, classes, and confidence
-             boxes = results.boxes
-             names = self.model.names
-             
-             for idx, box in enumerate(boxes):
-                  x1, y1, x2, y2 = box.xyxy[0].tolist()
-                  conf = box.conf[0].item()
-                  cls_id = int(box.cls[0].item())
-                  class_name = names[cls_id]
-                  
+             for idx, (x1, y1, x2, y2, conf, class_name) in enumerate(detections):
+                  # Back from the inference resolution to frame coordinates
+                  x1, y1, x2, y2 = x1 / factor, y1 / factor, x2 / factor, y2 / factor
                   x = int(x1)
                   y = int(y1)
                   w = int(x2 - x1)
@@ -115,56 +133,36 @@ class VisionDetector:
              
         return elements
 
-    def _detect_templates(self, image_path: str, step_id: str) -> List[Dict[str, Any]]:
-        """Fallback: OpenCV template matching. Returns simple elements if templates exist."""
+    def detect_templates(self, image, step_id: str) -> List[Dict[str, Any]]:
+        """Fallback: OpenCV template matching against the preloaded template library."""
         elements = []
         if not os.path.exists(self.template_dir):
             return elements
             
         try:
-             img_rgb = cv2.imread(image_path)
-             if img_rgb is None:
-                  return elements
-                  
-             img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
+             img_gray = to_gray(image)
              
-             # Very basic hardcoded example. A real implementation would loop through 
-             # the template directory securely.
-             templates = [f for f in os.listdir(self.template_dir) if f.endswith(('.png', '.jpg'))]
-             idx = 0
-             
-             for template_file in templates:
-                  template_path = os.path.join(self.template_dir, template_file)
-                  template = cv2.imread(template_path, 0)
-                  
-                  if template is None:
-                       continue
-                       
-                  w, h = template.shape[::-1]
-                  class_name = os.path.splitext(template_file)[0] # e.g. "button", "checkbox"
-                  
-                  # Run matching
-                  res = cv2.matchTemplate(img_gray, template, cv2.TM_CCOEFF_NORMED)
-                  
-                  # Filter by threshold
-                  loc = np.where(res >= self.confidence_threshold)
-                  
-                  for pt in zip(*loc[::-1]):
-                       x, y = int(pt[0]), int(pt[1])
-                       center_x = x + w // 2
-                       center_y = y + h // 2
-                       
-                       elements.append({
-                            "id": f"tmp_{step_id}_{idx}",
-                            "class": class_name,
-                            "label": class_name,
-                            "confidence": round(float(res[pt[1]][pt[0]]), 2),
-                            "bounding_box": {"x": x, "y": y, "width": int(w), "height": int(h)},
-                            "center": {"x": center_x, "y": center_y}
-                       })
-                       idx += 1
+             for idx, (x, y, w, h, score, class_name) in enumerate(self.templates.match(img_gray)):
+                  elements.append({
+                       "id": f"tmp_{step_id}_{idx}",
+                       "class": class_name, # template file name, e.g. "button", "checkbox"
+                       "label": class_name,
+                       "confidence": round(score, 2),
+                       "bounding_box": {"x": x, "y": y, "width": w, "height": h},
+                       "center": {"x": x + w // 2, "y": y + h // 2}
+                  })
                        
         except Exception as e:
              logging.error(f"Template matching error: {e}")
              
         return elements
+
+    def warm_up(self):
+        """Load the template library and run one dummy inference."""
+        self.templates.refresh(force=True)
+        if self.model is not None:
+            with self._model_lock:
+                self.model.predict(np.zeros((640, 640, 3), dtype=np.uint8))
+
+    def close(self):
+        self.templates.close()
@@ -0,0 +1,413 @@
+"""
+Optional out-of-process perception.
+
+Each perception component (OCREngine, VisionDetector) runs in its own
+long-lived worker process that loads its models once. Frames are written
+into a ring of `multiprocessing.shared_memory` slots and only the slot
+number and frame metadata cross the process boundary; element lists come
+back as compact ElementTables. A SharedFrame lets several calls (e.g. the
+OCR, YOLO and template stages of one step) read the frame from one slot. A supervisor thread per worker dispatches
+responses, pings the worker while idle, and restarts it if it dies or
+hangs on a request.
+"""
+import os
+import time
+import queue
+import logging
+import importlib
+import itertools
+import threading
+import multiprocessing as mp
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from capture.frame import Frame
+from perception.element_table import ElementTable
+
+_PING = "__ping__"
+_READY = 0  # request id of the startup message
+
+# Component methods a client proxies to its worker
+OCR_METHODS = ("process_image", "process_regions", "warm_up")
+VISION_METHODS = ("detect_elements", "detect_yolo", "detect_templates", "warm_up")
+DEFAULT_SLOT_BYTES = 3840 * 2160 * 4  # one 4K BGRA frame
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class SharedFrameRing:
+    """Fixed ring of shared memory slots, each large enough for one frame."""
+    def __init__(self, slots: int = 4, slot_bytes: int = DEFAULT_SLOT_BYTES):
+        self.slot_bytes = int(slot_bytes)
+        self.blocks = [shared_memory.SharedMemory(create=True, size=self.slot_bytes) for _ in range(max(int(slots), 1))]
+        self._free = queue.Queue()
+        for i in range(len(self.blocks)):
+            self._free.put(i)
+
+    @property
+    def names(self) -> List[str]:
+        return [block.name for block in self.blocks]
+
+    def put(self, image: np.ndarray, timeout: Optional[float] = None) -> int:
+        """Copy `image` into a free slot and return the slot index (blocks while all slots are in use)."""
+        if image.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {image.nbytes} bytes does not fit a {self.slot_bytes} byte slot")
+        try:
+            slot = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No free shared memory slot") from None
+        view = np.ndarray(image.shape, dtype=image.dtype, buffer=self.blocks[slot].buf)
+        view[...] = image
+        del view
+        return slot
+
+    def release(self, slot: int):
+        self._free.put(slot)
+
+    def close(self):
+        for block in self.blocks:
+            try:
+                block.close()
+                block.unlink()
+            except Exception:
+                pass
+        self.blocks = []
+
+
+class SharedFrame:
+    """
+    A frame copied into a ring slot once and read by every worker call it is
+    passed to. Calls (and the owner, while inside `with`) hold a reference;
+    the slot is freed when the last one is released and filled again if a
+    later call still needs it.
+    """
+    def __init__(self, ring: SharedFrameRing, source):
+        self.ring = ring
+        self.source = source
+        self._lock = threading.Lock()
+        self._users = 0
+        self._slot: Optional[int] = None
+        self._meta: Optional[dict] = None
+
+    def acquire(self, timeout: Optional[float] = None) -> dict:
+        """Reference the frame's slot (copying the frame in if needed) and return its metadata."""
+        with self._lock:
+            if self._slot is None:
+                image = self.source.image if isinstance(self.source, Frame) else self.source
+                self._slot = self.ring.put(image, timeout=timeout)
+                self._meta = _frame_meta(self.source, self._slot)
+            self._users += 1
+            return self._meta
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            if self._users <= 0 and self._slot is not None:
+                self.ring.release(self._slot)
+                self._slot = self._meta = None
+
+    def __enter__(self) -> "SharedFrame":
+        # The owner's reference keeps the slot alive between calls; the copy
+        # happens on the first call, so a full ring surfaces as that call's error
+        with self._lock:
+            self._users += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _frame_meta(source, slot: int) -> dict:
+    image = source.image if isinstance(source, Frame) else source
+    meta = {"slot": slot, "shape": image.shape, "dtype": image.dtype.str}
+    if isinstance(source, Frame):
+        meta.update(left=source.left, top=source.top, timestamp=source.timestamp, monotonic=source.monotonic,
+                    monitor_index=source.monitor_index, hash=source.hash, phash=source.phash,
+                    dirty_rects=source.dirty_rects, dirty_fraction=source.dirty_fraction,
+                    dirty_base=source.dirty_base)
+    return meta
+
+
+def _load_frame(meta: dict, blocks: List[shared_memory.SharedMemory]):
+    image = np.ndarray(meta["shape"], dtype=np.dtype(meta["dtype"]), buffer=blocks[meta["slot"]].buf)
+    if "monotonic" not in meta:
+        return image
+    frame = Frame(image, left=meta["left"], top=meta["top"], timestamp=meta["timestamp"], monotonic=meta["monotonic"])
+    for key in ("monitor_index", "hash", "phash", "dirty_rects", "dirty_fraction", "dirty_base"):
+        setattr(frame, key, meta[key])
+    return frame
+
+
+def _encode(result):
+    """Element lists travel as ElementTables (numpy columns + one string table)."""
+    if isinstance(result, list) and result and all(isinstance(r, dict) for r in result):
+        return ElementTable(result)
+    return result
+
+
+def _decode(result):
+    return result.to_list() if isinstance(result, ElementTable) else result
+
+
+def _worker_main(factory: str, config: dict, shm_names: List[str], requests, responses):
+    """Worker process: build the component once, then serve requests until told to stop."""
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [worker {os.getpid()}] %(levelname)s %(message)s")
+    blocks = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    module_name, class_name = factory.split(":")
+    component = getattr(importlib.import_module(module_name), class_name)(config)
+    info = {"pid": os.getpid(), "has_model": getattr(component, "has_model", None)}
+    responses.put((_READY, True, info))
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            req_id, method, meta, args, kwargs = request
+            if method == _PING:
+                responses.put((req_id, True, None))
+                continue
+            try:
+                if meta is not None:
+                    args = (_load_frame(meta, blocks),) + tuple(args)
+                responses.put((req_id, True, _encode(getattr(component, method)(*args, **kwargs))))
+            except Exception as e:
+                responses.put((req_id, False, f"{type(e).__name__}: {e}"))
+            finally:
+                args = None  # drop the frame view before the slot is reused
+    finally:
+        if hasattr(component, "close"):
+            component.close()
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # a view is still referenced; the OS releases it at exit
+
+
+class WorkerClient:
+    """
+    Handle to one perception worker process. The component methods named
+    in `methods` are proxied, so `client.process_image(frame, step_id)`
+    runs `OCREngine.process_image` in the worker; a Frame, array or
+    SharedFrame passed as the first argument goes through the shared memory
+    ring.
+    """
+    def __init__(self,
+                 name: str,
+                 factory: str,
+                 config: dict,
+                 ring: SharedFrameRing,
+                 methods: Sequence[str] = (),
+                 start_timeout: float = 120.0,
+                 call_timeout: float = 30.0,
+                 hang_timeout: float = 60.0,
+                 health_interval: float = 2.0):
+        self.name = name
+        self.factory = factory
+        self.config = config
+        self.ring = ring
+        self.methods = frozenset(methods)
+        self.start_timeout = float(start_timeout)
+        self.call_timeout = float(call_timeout)
+        self.hang_timeout = float(hang_timeout)
+        self.health_interval = float(health_interval)
+
+        self._ctx = mp.get_context("spawn")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending: Dict[int, tuple] = {}  # req_id -> (future, SharedFrame or None, sent at)
+        self._ready = threading.Event()
+        self._stopping = False
+        self.info: Dict[str, Any] = {}
+        self.restarts = 0
+        self.process = None
+        self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, name=f"PerceptionSupervisor-{name}", daemon=True)
+        self._supervisor.start()
+
+    # -- process lifecycle --------------------------------------------------
+
+    def _spawn(self) -> Dict[int, tuple]:
+        """Start a worker process; returns the requests still pending on the previous one."""
+        requests = self._ctx.Queue()
+        responses = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.factory, self.config, self.ring.names, requests, responses),
+            name=f"perception-{self.name}",
+            daemon=True
+        )
+        self._started_at = time.monotonic()
+        self._last_seen = time.monotonic()
+        # Requests submitted from here on go to the new worker; ones
+        # registered before belong to the old one
+        with self._lock:
+            self._requests, self._responses = requests, responses
+            self.process = process
+            self._ready.clear()
+            pending, self._pending = self._pending, {}
+        process.start()
+        logging.info(f"Started perception worker '{self.name}' (pid {process.pid})")
+        return pending
+
+    def _fail_pending(self, reason: str, pending: Optional[Dict[int, tuple]] = None):
+        if pending is None:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+        for future, shared, _ in pending.values():
+            if shared is not None:
+                shared.release()
+            if not future.done():
+                future.set_exception(WorkerCrashed(reason))
+
+    def _restart(self, reason: str):
+        logging.error(f"Perception worker '{self.name}' {reason}; restarting")
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.restarts += 1
+        self._fail_pending(f"perception worker '{self.name}' {reason}", self._spawn())
+
+    def _supervise(self):
+        while not self._stopping:
+            try:
+                req_id, ok, payload = self._responses.get(timeout=min(self.health_interval, 0.5))
+            except queue.Empty:
+                self._check_health()
+                continue
+            except (EOFError, OSError):
+                if self._stopping:
+                    break
+                self._restart("lost its response queue")
+                continue
+            self._last_seen = time.monotonic()
+            if req_id == _READY:
+                self.info = payload
+                self._ready.set()
+                continue
+            with self._lock:
+                entry = self._pending.pop(req_id, None)
+            if entry is None:
+                continue
+            future, shared, _ = entry
+            if shared is not None:
+                shared.release()
+            if ok:
+                future.set_result(_decode(payload))
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _check_health(self):
+        if self._stopping:
+            return
+        now = time.monotonic()
+        if not self.process.is_alive():
+            self._restart(f"exited with code {self.process.exitcode}")
+            return
+        if not self._ready.is_set():
+            if now - self._started_at > self.start_timeout:
+                self._restart("did not finish loading in time")
+            return
+        with self._lock:
+            oldest = min((sent for _, _, sent in self._pending.values()), default=None)
+        if oldest is not None and now - oldest > self.hang_timeout:
+            self._restart("is not responding")
+        elif oldest is None and now - self._last_seen > self.health_interval:
+            self._last_seen = now
+            self._submit(_PING, None, (), {})
+
+    # -- calls ------------------------------------------------------------
+
+    def _submit(self, method: str, source, args, kwargs) -> Future:
+        future = Future()
+        shared = None
+        meta = None
+        if source is not None:
+            shared = source if isinstance(source, SharedFrame) else SharedFrame(self.ring, source)
+            if shared.ring is not self.ring:
+                raise ValueError("SharedFrame belongs to a different frame ring")
+            meta = shared.acquire(timeout=self.call_timeout)
+        req_id = next(self._ids)
+        # Registered and queued together so a restart cannot slip in between
+        with self._lock:
+            self._pending[req_id] = (future, shared, time.monotonic())
+            self._requests.put((req_id, method, meta, args, kwargs))
+        return future
+
+    def call(self, method: str, *args, timeout: Optional[float] = None, **kwargs):
+        source = None
+        if args and isinstance(args[0], (Frame, np.ndarray, SharedFrame)):
+            source, args = args[0], args[1:]
+        future = self._submit(method, source, args, kwargs)
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.call_timeout)
+        except FutureTimeout:
+            raise TimeoutError(f"perception worker '{self.name}' did not answer {method} in time") from None
+
+    def __getattr__(self, method: str):
+        if method not in self.__dict__.get("methods", ()):
+            raise AttributeError(f"perception worker does not proxy '{method}'")
+        return lambda *args, **kwargs: self.call(method, *args, **kwargs)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(self.start_timeout if timeout is None else timeout)
+
+    @property
+    def has_model(self) -> bool:
+        self.wait_ready()
+        return bool(self.info.get("has_model"))
+
+    def healthy(self) -> bool:
+        return self.process is not None and self.process.is_alive() and self._ready.is_set()
+
+    def close(self):
+        self._stopping = True
+        try:
+            self._requests.put(None)
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self._supervisor.join(timeout=2)
+        self._fail_pending(f"perception worker '{self.name}' was shut down")
+
+
+class PerceptionService:
+    """
+    OCR and vision workers sharing one frame ring. Slots are `slot_mb` large,
+    or with `slot_mb: 0` just large enough for `max_frame_bytes` (the largest
+    frame capture produces, see CaptureManager.max_frame_bytes).
+    """
+    def __init__(self, config: dict, max_frame_bytes: Optional[int] = None):
+        service_cfg = config.get("perception", {}).get("service", {})
+        slot_mb = float(service_cfg.get("slot_mb", 0))
+        slot_bytes = int(slot_mb * 1024 * 1024) if slot_mb > 0 else int(max_frame_bytes or DEFAULT_SLOT_BYTES)
+        self.ring = SharedFrameRing(slots=service_cfg.get("ring_slots", 4), slot_bytes=slot_bytes)
+        options = dict(
+            start_timeout=service_cfg.get("start_timeout_s", 120),
+            call_timeout=service_cfg.get("call_timeout_s", 30),
+            hang_timeout=service_cfg.get("hang_timeout_s", 60),
+            health_interval=service_cfg.get("health_interval_s", 2.0)
+        )
+        self.ocr = WorkerClient("ocr", "perception.ocr_engine:OCREngine", config, self.ring, OCR_METHODS, **options)
+        self.vision = WorkerClient("vision", "perception.vision_detector:VisionDetector", config, self.ring, VISION_METHODS, **options)
+
+    def share(self, frame) -> SharedFrame:
+        """Wrap `frame` so every stage called with it (in a `with` block) reads one ring slot."""
+        return SharedFrame(self.ring, frame)
+
+    def health(self) -> Dict[str, Any]:
+        return {client.name: {"alive": client.healthy(), "pid": client.process.pid, "restarts": client.restarts}
+                for client in (self.ocr, self.vision)}
+
+    def close(self):
+        self.ocr.close()
+        self.vision.close()
+        self.ring.close()
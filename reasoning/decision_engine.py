@@ -50,6 +50,23 @@ class DecisionEngine:
             "reasoning": action.get("reasoning", "")
         }
 
+    @staticmethod
+    def _elements_json(screen_state: dict, key: str) -> str:
+        # A ScreenState serializes its element tables once and caches the result
+        if hasattr(screen_state, "elements_json"):
+            return screen_state.elements_json(key, indent=2)
+        return json.dumps(screen_state.get(key, []), indent=2)
+
+    @staticmethod
+    def _perception_note(screen_state: dict) -> str:
+        """Tells the LLM when some perception stages missed their deadline on this frame."""
+        if not screen_state.get("perception_partial"):
+            return "complete"
+        late = ", ".join(f"{stage}: {status}" for stage, status in sorted(screen_state.get("perception_status", {}).items())
+                         if status != "ok")
+        return (f"PARTIAL ({late}). Stale results come from an earlier screenshot and timed-out stages are empty, "
+                "so the lists below may not match the screen. If the target is missing, prefer WAIT or SCREENSHOT.")
+
     def get_next_action(self, 
                         intent: dict,
                         current_step: dict, 
@@ -75,8 +92,9 @@ class DecisionEngine:
                                    .replace("{current_url}", screen_state.get("active_window", {}).get("title", "Unknown URL"))\
                                    .replace("{page_title}", screen_state.get("active_window", {}).get("title", "Desktop Screen"))\
                                    .replace("{timestamp}", screen_state.get("timestamp", ""))\
-                                   .replace("{detected_elements_json}", json.dumps(screen_state.get("vision_elements", []), indent=2))\
-                                   .replace("{page_text}", json.dumps(screen_state.get("ocr_elements", []), indent=2))\
+                                   .replace("{perception_note}", self._perception_note(screen_state))\
+                                   .replace("{detected_elements_json}", self._elements_json(screen_state, "vision_elements"))\
+                                   .replace("{page_text}", self._elements_json(screen_state, "ocr_elements"))\
                                    .replace("{context_history}", json.dumps(context_history, indent=2))
                                    
         reasks = 0
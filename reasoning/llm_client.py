@@ -3,9 +3,12 @@ import logging
 import json
 import time
 from typing import Optional
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from lazy_imports import lazy_module
+
+openai = lazy_module("openai")
+
 load_dotenv()
 
 class LLMClient:
@@ -16,7 +19,7 @@ class LLMClient:
             logging.warning("NVIDIA_API_KEY is not set in the environment logs. API calls will fail.")
             
         self.base_url = "https://integrate.api.nvidia.com/v1"
-        self.client = OpenAI(
+        self.client = openai.OpenAI(
             api_key=self.api_key,
             base_url=self.base_url
         )
@@ -0,0 +1,127 @@
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("ladas.startup")
+
+
+class StartupManager:
+    """
+    Splits startup into a timed critical path (`phase`) and components that
+    load concurrently in the background (`submit`). Each component may run a
+    warm-up (e.g. one dummy inference) after loading; callers wait only for
+    the components they use (`wait` / `require`).
+    """
+    def __init__(self, max_workers: int = 6, t0: Optional[float] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="Startup")
+        self._futures: Dict[str, Future] = {}
+        self._timings: List[dict] = []
+        self._lock = threading.Lock()
+        # perf_counter() at process/app start, so earlier steps can be recorded too
+        self._t0 = t0 if t0 is not None else time.perf_counter()
+
+    def record(self, name: str, start: float, kind: str = "critical", status: str = "ok"):
+        """Record a step that started at perf_counter() value `start` and just ended."""
+        with self._lock:
+            self._timings.append({
+                "name": name, "kind": kind, "status": status,
+                "start_ms": (start - self._t0) * 1000,
+                "duration_ms": (time.perf_counter() - start) * 1000
+            })
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a blocking step on the critical path."""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self.record(name, start, "critical", status)
+
+    def submit(self,
+               name: str,
+               load: Callable[[], object],
+               warmup: Optional[Callable[[], object]] = None,
+               deps: Sequence[str] = ()) -> Future:
+        """
+        Load `name` in the background once its `deps` are ready. The future
+        resolves after the warm-up; a failing warm-up is logged, not raised.
+        """
+        dep_futures = [self._futures[d] for d in deps]
+
+        def run():
+            for dep in dep_futures:
+                dep.result()
+            start = time.perf_counter()
+            try:
+                result = load()
+            except BaseException:
+                self.record(name, start, "load", "failed")
+                logger.exception(f"Startup: loading '{name}' failed")
+                raise
+            self.record(name, start, "load")
+            if warmup is not None:
+                start = time.perf_counter()
+                try:
+                    warmup()
+                    self.record(name, start, "warm-up")
+                except Exception as e:
+                    self.record(name, start, "warm-up", "failed")
+                    logger.warning(f"Startup: warm-up of '{name}' failed: {e}")
+            return result
+
+        future = self._pool.submit(run)
+        self._futures[name] = future
+        return future
+
+    def ready(self, name: str) -> bool:
+        future = self._futures.get(name)
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def wait(self, *names: str, timeout: Optional[float] = None):
+        """Block until the named components are loaded; re-raises a load failure."""
+        for name in names:
+            self._futures[name].result(timeout=timeout)
+
+    async def require(self, *names: str):
+        """Await the named components from the event loop."""
+        pending = [name for name in names if not self._futures[name].done()]
+        if pending:
+            logger.info(f"Waiting for startup of {pending}")
+        for name in names:
+            await asyncio.wrap_future(self._futures[name])
+
+    def wait_all(self, timeout: Optional[float] = None):
+        """Wait for every component, ignoring failures (used before shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in list(self._futures.values()):
+            try:
+                future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0.0))
+            except Exception:
+                pass
+
+    def timings(self) -> List[dict]:
+        with self._lock:
+            return sorted(self._timings, key=lambda t: t["start_ms"])
+
+    def report(self) -> str:
+        """Human readable table of critical-path phases and background loads."""
+        rows = self.timings()
+        lines = [f"{'component':<22} {'kind':<9} {'start ms':>9} {'took ms':>9}  status"]
+        for t in rows:
+            lines.append(f"{t['name']:<22} {t['kind']:<9} {t['start_ms']:>9.0f} {t['duration_ms']:>9.0f}  {t['status']}")
+        critical = sum(t["duration_ms"] for t in rows if t["kind"] == "critical")
+        total = max((t["start_ms"] + t["duration_ms"] for t in rows), default=0.0)
+        lines.append(f"critical path {critical:.0f} ms, everything ready after {total:.0f} ms")
+        return "\n".join(lines)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
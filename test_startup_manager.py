@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import unittest
+from startup_manager import StartupManager
+
+class TestStartupManager(unittest.TestCase):
+    def setUp(self):
+        self.startup = StartupManager()
+
+    def tearDown(self):
+        self.startup.shutdown()
+
+    def test_components_load_concurrently_and_warm_up(self):
+        started = []
+        barrier = threading.Barrier(2, timeout=2)
+        warmed = []
+
+        def load(name):
+            started.append(name)
+            barrier.wait()  # both loaders must be running at the same time
+            return name
+
+        self.startup.submit("ocr", lambda: load("ocr"), warmup=lambda: warmed.append("ocr"))
+        self.startup.submit("vision", lambda: load("vision"))
+        self.startup.wait("ocr", "vision", timeout=5)
+        self.assertEqual(sorted(started), ["ocr", "vision"])
+        self.assertEqual(warmed, ["ocr"])
+        kinds = {(t["name"], t["kind"]) for t in self.startup.timings()}
+        self.assertIn(("ocr", "warm-up"), kinds)
+        self.assertIn("everything ready", self.startup.report())
+
+    def test_require_waits_only_for_named_components(self):
+        release = threading.Event()
+        self.startup.submit("llm", lambda: "llm")
+        self.startup.submit("vision", lambda: release.wait(5))
+
+        async def task():
+            start = time.monotonic()
+            await self.startup.require("llm")
+            return time.monotonic() - start
+
+        self.assertLess(asyncio.run(task()), 1.0)
+        self.assertFalse(self.startup.ready("vision"))
+        release.set()
+
+    def test_failures_and_dependencies(self):
+        def broken():
+            raise RuntimeError("no weights")
+
+        self.startup.submit("vision", broken)
+        self.startup.submit("perception", lambda: "ok", deps=("vision",))
+        with self.assertRaises(RuntimeError):
+            self.startup.wait("perception", timeout=5)
+        self.assertFalse(self.startup.ready("vision"))
+        self.assertIn("failed", self.startup.report())
+
+    def test_shutdown_cancels_components_not_yet_started(self):
+        startup = StartupManager(max_workers=1)
+        release = threading.Event()
+        startup.submit("vision", lambda: release.wait(5))
+        startup.submit("ocr", lambda: "ocr")  # queued behind vision
+        startup.shutdown()
+        release.set()
+        startup.wait_all(timeout=5)
+        self.assertTrue(startup.ready("vision"))
+        self.assertFalse(startup.ready("ocr"))
+
+if __name__ == '__main__':
+    unittest.main()
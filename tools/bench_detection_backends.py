@@ -0,0 +1,134 @@
+"""
+Latency and accuracy benchmark for the VisionDetector backends.
+
+Runs the same weights through ultralytics (reference), ONNX Runtime and
+OpenVINO (FP32, and INT8 with --int8) on CPU. Reports median / p95 latency
+per image and, for each ONNX backend, recall and mean IoU of its boxes
+against the ultralytics boxes (matched per class at IoU >= 0.5).
+
+Usage: python tools/bench_detection_backends.py [--weights yolov8n.pt] [--images DIR] [--repeat R] [--threads T] [--int8]
+"""
+import os
+import sys
+import time
+import glob
+import argparse
+import statistics
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perception.detection_backends import (
+    create_backend, YOLO_AVAILABLE, ONNXRUNTIME_AVAILABLE, OPENVINO_AVAILABLE
+)
+
+def load_images(directory: str) -> list:
+    if directory:
+        paths = sorted(glob.glob(os.path.join(directory, "*.png")) + glob.glob(os.path.join(directory, "*.jpg")))
+        images = [cv2.imread(p) for p in paths]
+        return [img for img in images if img is not None]
+    # Synthetic UI-like screenshots when no directory is given
+    rng = np.random.default_rng(3)
+    images = []
+    for _ in range(8):
+        img = np.full((1080, 1920, 3), 240, dtype=np.uint8)
+        for _ in range(30):
+            x, y = int(rng.integers(0, 1800)), int(rng.integers(0, 1040))
+            w, h = int(rng.integers(40, 240)), int(rng.integers(20, 80))
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(img, (x, y), (x + w, y + h), color, -1)
+        images.append(img)
+    return images
+
+def iou(a, b) -> float:
+    ix = max(min(a[2], b[2]) - max(a[0], b[0]), 0)
+    iy = max(min(a[3], b[3]) - max(a[1], b[1]), 0)
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def compare(reference: list, candidate: list) -> tuple:
+    """(matched, total reference boxes, summed IoU of matches)."""
+    matched, total_iou = 0, 0.0
+    used = set()
+    for ref in reference:
+        best, best_j = 0.0, None
+        for j, det in enumerate(candidate):
+            if j in used or det[5] != ref[5]:
+                continue
+            score = iou(ref, det)
+            if score > best:
+                best, best_j = score, j
+        if best_j is not None and best >= 0.5:
+            used.add(best_j)
+            matched += 1
+            total_iou += best
+    return matched, len(reference), total_iou
+
+def run(backend, images: list, repeat: int) -> tuple:
+    backend.predict(images[0])  # warm-up
+    latencies, outputs = [], []
+    for _ in range(repeat):
+        outputs = []
+        for img in images:
+            start = time.perf_counter()
+            outputs.append(backend.predict(img))
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.95 * (len(latencies) - 1))], outputs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default="yolov8n.pt")
+    parser.add_argument("--images", default="", help="directory of .png/.jpg screenshots (synthetic if empty)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--int8", action="store_true", help="also benchmark the INT8-quantized export")
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("ultralytics is not installed; it is needed for the reference run and the ONNX export.")
+        return
+    if not os.path.exists(args.weights):
+        print(f"Weights not found: {args.weights}")
+        return
+
+    images = load_images(args.images)
+    if not images:
+        print("No images to benchmark.")
+        return
+
+    configs = [("ultralytics", False)]
+    for name, available in (("onnxruntime", ONNXRUNTIME_AVAILABLE), ("openvino", OPENVINO_AVAILABLE)):
+        if not available:
+            print(f"{name} is not installed; skipping.")
+            continue
+        configs.append((name, False))
+        if args.int8 and ONNXRUNTIME_AVAILABLE:
+            configs.append((name, True))
+
+    print(f"{len(images)} images x {args.repeat} runs, threads={args.threads or 'all'}")
+    print(f"{'backend':<22} {'median ms':>10} {'p95 ms':>10} {'recall':>8} {'mean IoU':>9}")
+    reference = None
+    for name, int8 in configs:
+        backend = create_backend(args.weights, backend=name, device="cpu", threads=args.threads,
+                                 int8=int8, imgsz=args.imgsz)
+        label = f"{backend.name}{' int8' if int8 else ''}"
+        median, p95, outputs = run(backend, images, args.repeat)
+        if reference is None:
+            reference = outputs
+            print(f"{label:<22} {median:>10.1f} {p95:>10.1f} {'-':>8} {'-':>9}")
+            continue
+        matched = total = 0
+        total_iou = 0.0
+        for ref, cand in zip(reference, outputs):
+            m, t, s = compare(ref, cand)
+            matched, total, total_iou = matched + m, total + t, total_iou + s
+        recall = matched / total if total else 1.0
+        mean_iou = total_iou / matched if matched else 0.0
+        print(f"{label:<22} {median:>10.1f} {p95:>10.1f} {recall:>8.3f} {mean_iou:>9.3f}")
+
+if __name__ == "__main__":
+    main()
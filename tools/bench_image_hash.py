@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: screen hashing cost per capture.
+
+Compares the previous capture path (PNG encode to disk, decode with PIL,
+imagehash.phash) against capture.image_hash computed on the in-memory BGRA
+buffer, at 1080p and 4K.
+
+Usage: python tools/bench_image_hash.py [--repeat N]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from capture import image_hash
+
+RESOLUTIONS = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+
+def synthetic_screen(width: int, height: int) -> np.ndarray:
+    """A BGRA frame that looks roughly like a desktop: panels, buttons and text."""
+    rng = np.random.default_rng(42)
+    img = np.full((height, width, 4), 240, dtype=np.uint8)
+    img[:, :, 3] = 255
+    for _ in range(60):
+        x, y = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 60))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3)) + (255,)
+        cv2.rectangle(img, (x, y), (x + int(rng.integers(40, 400)), y + int(rng.integers(20, 200))), color, -1)
+    for i in range(0, height, 28):
+        cv2.putText(img, f"Line {i} of synthetic UI text", (20, i + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0, 255), 1)
+    return img
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        import imagehash
+        import mss.tools
+        from PIL import Image
+    except ImportError as e:
+        imagehash = None
+        print(f"Legacy path unavailable ({e}); timing native hashes only.")
+
+    print(f"{'resolution':<10} {'path':<36} {'median ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, (w, h) in RESOLUTIONS.items():
+            frame = synthetic_screen(w, h)
+            rows = []
+
+            if imagehash is not None:
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB).tobytes()
+                path = os.path.join(tmp, f"bench_{label}.png")
+
+                def legacy():
+                    mss.tools.to_png(rgb, (w, h), output=path)
+                    return str(imagehash.phash(Image.open(path)))
+
+                def imagehash_in_memory():
+                    return str(imagehash.phash(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY))))
+
+                rows.append(("PNG encode + PIL decode + imagehash", timed(legacy, args.repeat)))
+                rows.append(("imagehash on in-memory buffer", timed(imagehash_in_memory, args.repeat)))
+
+            rows.append(("image_hash.phash (native)", timed(lambda: image_hash.phash(frame), args.repeat)))
+            rows.append(("image_hash.dhash (native)", timed(lambda: image_hash.dhash(frame), args.repeat)))
+            a, b = image_hash.phash(frame), image_hash.phash(frame[::-1])
+            rows.append(("hamming (XOR + popcount)", timed(lambda: image_hash.hamming(a, b), args.repeat)))
+
+            for name, ms in rows:
+                print(f"{label:<10} {name:<36} {ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark / regression check: interpreter import time of LADAS modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each module, sums the self-time of every import it triggered, and checks
+that heavy optional backends (torch, easyocr, ultralytics, openai, chromadb,
+pynput, pygetwindow, aiohttp) are not pulled in by merely importing the module.
+Times are compared against tools/import_time_baseline.json; the script exits
+non-zero when a module gets slower than baseline * (1 + tolerance) + slack,
+or when a forbidden module is imported.
+
+Usage: python tools/bench_import_time.py [--repeat N] [--tolerance 0.5] [--update]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "tools", "import_time_baseline.json")
+
+# Heavy dependencies each module must only load on first use
+HEAVY = ["torch", "easyocr", "ultralytics", "onnxruntime", "openvino", "openai", "chromadb",
+         "pynput", "pyautogui", "pygetwindow", "aiohttp"]
+MODULES = {
+    "perception.ocr_engine": HEAVY,
+    "perception.vision_detector": HEAVY,
+    "perception.state_builder": HEAVY,
+    "reasoning.llm_client": HEAVY,
+    "reasoning.decision_engine": HEAVY,
+    "execution.action_executor": HEAVY,
+    "execution.failsafe_monitor": HEAVY,
+    "memory.rag_memory": HEAVY,
+}
+
+def import_profile(module: str):
+    """Total import time (ms) and the set of top-level packages imported by `import module`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total_us = 0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        total_us += int(self_us)
+        imported.add(name.strip().split(".")[0])
+    return total_us / 1000.0, imported
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=20.0, help="allowed absolute slowdown")
+    parser.add_argument("--update", action="store_true", help="write the measured times as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    measured, failures = {}, []
+    print(f"{'module':<30} {'ms':>8} {'baseline':>9}")
+    for module, forbidden in MODULES.items():
+        runs = [import_profile(module) for _ in range(max(args.repeat, 1))]
+        ms = statistics.median(r[0] for r in runs)
+        measured[module] = round(ms, 1)
+        base = baseline.get(module)
+        print(f"{module:<30} {ms:>8.1f} {base if base is not None else '-':>9}")
+        leaked = sorted(set(forbidden) & runs[0][1])
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)} at import time")
+        if base is not None and ms > base * (1 + args.tolerance) + args.slack_ms:
+            failures.append(f"{module} import took {ms:.1f} ms (baseline {base:.1f} ms)")
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(measured, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Benchmark: OCR-to-vision label assignment in StateBuilder.
+
+Compares the previous nested loop (every vision element against every OCR
+box, first match within 50 px) with the grid-indexed assignment used by
+StateBuilder.build_screen_state, at 100 / 1,000 / 10,000 elements per side.
+
+Usage: python tools/bench_state_builder.py [--repeat N] [--sizes 100 1000 10000]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perception.spatial_index import assign_ocr_labels
+
+def synthetic_elements(count: int, width: int = 3840, height: int = 2160):
+    """OCR boxes and vision elements scattered over a 4K screen, vision boxes loosely around text."""
+    rng = np.random.default_rng(11)
+    ocr, vis = [], []
+    for i, (x, y) in enumerate(rng.integers(0, [width - 120, height - 30], size=(count, 2)).tolist()):
+        w, h = int(rng.integers(20, 120)), int(rng.integers(10, 30))
+        ocr.append({"text": f"t{i}", "bounding_box": {"x": x, "y": y, "width": w, "height": h}})
+        cx, cy = x + w // 2 + int(rng.integers(-40, 40)), y + h // 2 + int(rng.integers(-40, 40))
+        vis.append({"class": "button", "label": "button", "center": {"x": cx, "y": cy},
+                    "bounding_box": {"x": cx - 40, "y": cy - 15, "width": 80, "height": 30}})
+    return ocr, vis
+
+def nested_loop(vision_elements, ocr_elements):
+    """The previous assignment: first OCR box within 50 px, mutating copies here to keep inputs intact."""
+    out = []
+    for v in vision_elements:
+        v = dict(v)
+        vx, vy = v["center"]["x"], v["center"]["y"]
+        for o in ocr_elements:
+            b = o["bounding_box"]
+            ox, oy = b["x"] + b["width"] // 2, b["y"] + b["height"] // 2
+            if ((vx - ox) ** 2 + (vy - oy) ** 2) ** 0.5 < 50:
+                v["label"] = o["text"]
+                break
+        out.append(v)
+    return out
+
+def timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'elements':>10} {'nested loop ms':>16} {'grid index ms':>15} {'speed-up':>9}")
+    for size in args.sizes:
+        ocr, vis = synthetic_elements(size)
+        # The nested loop is quadratic; time a single run at the largest size
+        naive = timed(lambda: nested_loop(vis, ocr), 1 if size >= 10000 else args.repeat)
+        grid = timed(lambda: assign_ocr_labels(vis, ocr), args.repeat)
+        print(f"{size:>10} {naive:>16.1f} {grid:>15.1f} {naive / grid:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-import aiohttp
 import logging
 from typing import Dict, Any, Optional
 
+from lazy_imports import lazy_module, is_available
+
+# aiohttp is only needed once a search actually runs
+aiohttp = lazy_module("aiohttp")
+AIOHTTP_AVAILABLE = is_available("aiohttp")
+
 logger = logging.getLogger("ladas.tools.perplexity")
 
 class PerplexitySearchTool:
@@ -20,6 +25,9 @@ class PerplexitySearchTool:
         if not self.api_key:
             logger.error("Perplexity API key not configured. Cannot perform web search.")
             return None
+        if not AIOHTTP_AVAILABLE:
+            logger.error("aiohttp is not installed. Cannot perform web search.")
+            return None
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",